@@ -0,0 +1,226 @@
+"""Fake Unreal Engine root whose RunUAT script replays synthetic UBT output.
+
+`make_fake_engine(root, ...)` writes `Engine/Build/Build.version` and a
+`RunUAT.sh` / `RunUAT.bat` pair that hand over to `fake_uat.py`. The script
+reads its settings from `fake_uat.json` next to it, so one engine root can
+be reconfigured between runs without rewriting the scripts:
+
+    lines        output lines to emit
+    width        characters per line (lines are padded with "x")
+    rate         lines per second, 0 = as fast as the pipe takes them
+    exit_code    process exit code
+    stamp_every  append " t=<unix time>" to every Nth line (0 = never)
+    error_every  emit a compiler error after every Nth line (0 = never)
+    duration     extra seconds to sleep before exiting
+    compile_seconds  seconds per compiled file in UBT mode
+
+When `-package=` is passed, a small package (one binary per
+`-TargetPlatforms` entry) is written there on success.
+
+The UnrealBuildTool scripts (`Build.bat`, `Linux/Build.sh`, `Mac/Build.sh`)
+run the same script in UBT mode: it "compiles" only the sources under
+`-Plugin=`'s Source folder that changed since its last run in that plugin's
+Intermediate folder, then writes a binary to the plugin's Binaries folder.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+
+FAKE_UAT = r"""
+import json
+import os
+import sys
+import time
+
+config = json.loads(
+    open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_uat.json")).read()
+)
+args = sys.argv[1:]
+options = dict(arg[1:].split("=", 1) for arg in args if arg.startswith("-") and "=" in arg)
+out = sys.stdout.buffer
+lines = config["lines"]
+width = config["width"]
+rate = config["rate"]
+stamp_every = config["stamp_every"]
+error_every = config["error_every"]
+
+if args and args[0] != "BuildPlugin":
+    # UBT mode: Build.sh <Target> <Platform> <Configuration> -Plugin=...
+    target, platform, configuration = args[0], args[1], args[2]
+    plugin_dir = os.path.dirname(options["Plugin"])
+    stamp = os.path.join(
+        plugin_dir, "Intermediate", "fake-ubt-%s-%s-%s.stamp" % (target, platform, configuration)
+    )
+    built_at = os.path.getmtime(stamp) if os.path.exists(stamp) else 0
+    changed = []
+    for dirpath, _, filenames in os.walk(os.path.join(plugin_dir, "Source")):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if name.endswith((".cpp", ".h")) and os.path.getmtime(path) > built_at:
+                changed.append(name)
+    out.write(b"Building %s...\n" % target.encode())
+    for i, name in enumerate(sorted(changed), 1):
+        out.write(b"[%d/%d] Compile [x64] %s\n" % (i, len(changed), name.encode()))
+        out.flush()
+        time.sleep(config["compile_seconds"])
+    if not changed:
+        out.write(b"Target is up to date\n")
+    binaries = os.path.join(plugin_dir, "Binaries", platform)
+    os.makedirs(binaries, exist_ok=True)
+    with open(os.path.join(binaries, "%s-Bench.bin" % target), "wb") as binary:
+        binary.write(b"x" * 4096)
+    if not target.endswith("Editor"):
+        # Monolithic game targets link the plugin as a static library
+        libraries = os.path.join(
+            plugin_dir, "Intermediate", "Build", platform, target, configuration, "Bench"
+        )
+        os.makedirs(libraries, exist_ok=True)
+        with open(os.path.join(libraries, "libBench.a"), "wb") as library:
+            library.write(b"x" * 1024)
+    os.makedirs(os.path.dirname(stamp), exist_ok=True)
+    open(stamp, "w").close()
+    out.write(b"Total execution time: 0.10 seconds\n")
+    sys.exit(config["exit_code"])
+
+out.write(("BUILD COMMAND STARTED " + " ".join(args) + "\n").encode())
+out.write(b"Building plugin for host platforms\n")
+started = time.time()
+batch = []
+for i in range(1, lines + 1):
+    line = "[%d/%d] Compile [x64] Module.Bench.%d.cpp" % (i, lines, i)
+    if stamp_every and i % stamp_every == 0:
+        line += " t=%.6f" % time.time()
+    batch.append(line.ljust(width, "x"))
+    if error_every and i % error_every == 0:
+        batch.append("Bench.%d.cpp(1): error C2065: synthetic error" % i)
+    if rate and (len(batch) >= max(1, rate // 100) or i == lines):
+        out.write(("\n".join(batch) + "\n").encode())
+        out.flush()
+        batch = []
+        delay = started + i / rate - time.time()
+        if delay > 0:
+            time.sleep(delay)
+    elif len(batch) >= 1000:
+        out.write(("\n".join(batch) + "\n").encode())
+        batch = []
+if batch:
+    out.write(("\n".join(batch) + "\n").encode())
+
+time.sleep(config["duration"])
+exit_code = config["exit_code"]
+package = options.get("package")
+if package and exit_code == 0:
+    for platform in options.get("TargetPlatforms", "Host").split("+"):
+        binaries = os.path.join(package, "Binaries", platform)
+        os.makedirs(binaries, exist_ok=True)
+        with open(os.path.join(binaries, "Bench.bin"), "wb") as binary:
+            binary.write(platform.encode() * 1024)
+out.write(b"BUILD SUCCESSFUL\n" if exit_code == 0 else b"BUILD FAILED\n")
+out.write(b"AutomationTool exiting with ExitCode=%d\n" % exit_code)
+out.flush()
+sys.exit(exit_code)
+"""
+
+BUILD_VERSION = {
+    "MajorVersion": 5,
+    "MinorVersion": 4,
+    "PatchVersion": 0,
+    "Changelist": 0,
+    "BranchName": "++Bench+Fake-5.4",
+}
+
+DEFAULT_SETTINGS = {
+    "lines": 100_000,
+    "width": 120,
+    "rate": 0,
+    "exit_code": 0,
+    "stamp_every": 100,
+    "error_every": 0,
+    "duration": 0.0,
+    "compile_seconds": 0.0,
+}
+
+
+def configure_fake_engine(root, **settings):
+    """Update the output settings of an existing fake engine"""
+    config = dict(DEFAULT_SETTINGS, **settings)
+    batch_files = Path(root) / "Engine" / "Build" / "BatchFiles"
+    (batch_files / "fake_uat.json").write_text(json.dumps(config), encoding="utf-8")
+    return config
+
+
+def make_fake_engine(root, version=(5, 4), **settings):
+    """Create a fake engine root at `root` and return its path"""
+    root = Path(root)
+    build_dir = root / "Engine" / "Build"
+    batch_files = build_dir / "BatchFiles"
+    batch_files.mkdir(parents=True, exist_ok=True)
+    (root / "Engine" / "Plugins").mkdir(exist_ok=True)
+
+    build_version = dict(
+        BUILD_VERSION, MajorVersion=version[0], MinorVersion=version[1]
+    )
+    (build_dir / "Build.version").write_text(
+        json.dumps(build_version), encoding="utf-8"
+    )
+    (batch_files / "fake_uat.py").write_text(FAKE_UAT, encoding="utf-8")
+
+    shell_script = batch_files / "RunUAT.sh"
+    shell_script.write_text(
+        f'#!/bin/sh\nexec "{sys.executable}" "$(dirname "$0")/fake_uat.py" "$@"\n',
+        encoding="utf-8",
+    )
+    shell_script.chmod(shell_script.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP)
+    (batch_files / "RunUAT.bat").write_text(
+        f'@"{sys.executable}" "%~dp0fake_uat.py" %*\r\n', encoding="utf-8"
+    )
+    (batch_files / "Build.bat").write_text(
+        f'@"{sys.executable}" "%~dp0fake_uat.py" %*\r\n', encoding="utf-8"
+    )
+    for folder in ("Linux", "Mac"):
+        (batch_files / folder).mkdir(exist_ok=True)
+        build_script = batch_files / folder / "Build.sh"
+        build_script.write_text(
+            f'#!/bin/sh\nexec "{sys.executable}" "$(dirname "$0")/../fake_uat.py" "$@"\n',
+            encoding="utf-8",
+        )
+        build_script.chmod(build_script.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP)
+
+    configure_fake_engine(root, **settings)
+    return root
+
+
+def make_fake_plugin(folder, name="Bench"):
+    """Minimal plugin source tree; returns the .uplugin path"""
+    plugin_dir = Path(folder) / name
+    source_dir = plugin_dir / "Source" / name
+    source_dir.mkdir(parents=True, exist_ok=True)
+    (source_dir / f"{name}.Build.cs").write_text(
+        f"public class {name} : ModuleRules {{}}\n", encoding="utf-8"
+    )
+    (source_dir / f"{name}.cpp").write_text("// benchmark\n", encoding="utf-8")
+    uplugin = plugin_dir / f"{name}.uplugin"
+    uplugin.write_text(
+        json.dumps(
+            {
+                "FileVersion": 3,
+                "FriendlyName": name,
+                "Modules": [
+                    {"Name": name, "Type": "Runtime", "LoadingPhase": "Default"}
+                ],
+            },
+            indent=4,
+        ),
+        encoding="utf-8",
+    )
+    return uplugin
+
+
+if __name__ == "__main__":
+    target = make_fake_engine(sys.argv[1] if len(sys.argv) > 1 else "FakeEngine")
+    print(f"Fake engine created at {os.path.abspath(target)}")
@@ -0,0 +1,125 @@
+"""Subprocess output reader throughput: readline() versus chunked read_lines().
+
+Spawns a synthetic generator that floods stdout with UBT-like lines (plus a
+few very long ones) and times how fast each reader consumes it.
+
+    python benchmarks/reader_throughput.py --lines 500000 --long-line-kb 1024
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from plugin_migration.streams import read_lines  # noqa: E402
+
+GENERATOR = """
+import sys
+lines, width, long_kb, every = map(int, sys.argv[1:5])
+out = sys.stdout.buffer
+line = ("[{0}/%d] Compile [x64] Module.Bench.{0}.cpp " % lines).ljust(width, "x")
+long_line = b"Running: clang++ " + b"-I/very/long/include/path " * (long_kb * 40) + b"\\n"
+batch = []
+for i in range(1, lines + 1):
+    batch.append(line.format(i))
+    if every and i % every == 0:
+        out.write(("\\n".join(batch) + "\\n").encode())
+        out.write(long_line)
+        batch = []
+out.write(("\\n".join(batch) + "\\n").encode() if batch else b"")
+"""
+
+
+async def spawn(args):
+    return await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        GENERATOR,
+        str(args.lines),
+        str(args.width),
+        str(args.long_line_kb),
+        str(args.long_line_every),
+        stdout=asyncio.subprocess.PIPE,
+    )
+
+
+async def bench_readline(args):
+    process = await spawn(args)
+    count = 0
+    error = ""
+    try:
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                break
+            if line.decode("utf-8", errors="ignore").strip():
+                count += 1
+    except (ValueError, asyncio.LimitOverrunError) as ex:
+        error = type(ex).__name__
+        process.kill()
+    await process.wait()
+    return count, error
+
+
+async def bench_read_lines(args):
+    process = await spawn(args)
+    count = 0
+    async for lines in read_lines(process.stdout):
+        for line in lines:
+            if line:
+                count += 1
+    await process.wait()
+    return count, ""
+
+
+def run(name, bench, args):
+    started = time.perf_counter()
+    count, error = asyncio.run(bench(args))
+    elapsed = time.perf_counter() - started
+    return {
+        "reader": name,
+        "lines": count,
+        "seconds": round(elapsed, 3),
+        "lines_per_sec": round(count / elapsed),
+        "error": error,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=300_000)
+    parser.add_argument("--width", type=int, default=120, help="Characters per line")
+    parser.add_argument(
+        "--long-line-kb", type=int, default=1024, help="Size of the long lines"
+    )
+    parser.add_argument(
+        "--long-line-every",
+        type=int,
+        default=100_000,
+        help="Emit a long line after this many normal lines (0 = never)",
+    )
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = [
+        run("readline", bench_readline, args),
+        run("read_lines", bench_read_lines, args),
+    ]
+    for result in results:
+        note = f"  (aborted: {result['error']})" if result["error"] else ""
+        print(
+            f"{result['reader']:<12} {result['lines']:>9} lines "
+            f"{result['seconds']:>8.2f}s {result['lines_per_sec']:>10} lines/s{note}"
+        )
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Remote build workers on localhost against fake engines.
+
+Starts several build agents as separate processes (the real `agent`
+command), each offering fake engines (see `fake_engine.py`), then runs a
+queue of fake plugins through a `WorkerPool` the way `batch --worker` does.
+Engines are named by version only, so nothing builds on the client side.
+
+Reported: wall time, the serial time the same builds would take on one
+machine, how many jobs each agent ran and whether every package arrived.
+
+    python benchmarks/remote_workers.py --agents 3 --capacity 2 --plugins 12
+    python benchmarks/remote_workers.py --engines 5.3,5.4 --duration 1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_engine import make_fake_engine, make_fake_plugin  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, process, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Agent on port {port} exited with {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"Agent on port {port} did not start")
+
+
+async def run_queue(ports, plugins, versions, out):
+    from plugin_migration.batch import SUCCEEDED, MigrationQueue
+    from plugin_migration.remote import WorkerPool
+
+    pool = WorkerPool([("127.0.0.1", port) for port in ports], log=lambda _: None)
+    queue = MigrationQueue(
+        log=lambda _: None,
+        preflight=False,
+        api_scan=False,
+        workers=pool,
+    )
+    # A version without a local engine folder is sent to the workers by name
+    queue.add_matrix(plugins, versions, out)
+    started = time.monotonic()
+    await queue.run()
+    seconds = time.monotonic() - started
+    succeeded = [queued for queued in queue.jobs if queued.status == SUCCEEDED]
+    packages = sum(
+        1 for queued in succeeded if any(queued.job.package_dir.rglob("*.bin"))
+    )
+    return {
+        "jobs": len(queue.jobs),
+        "succeeded": len(succeeded),
+        "packages": packages,
+        "seconds": round(seconds, 2),
+        "serial_seconds": round(sum(queued.duration for queued in queue.jobs), 2),
+        "jobs_per_agent": pool.jobs_per_worker,
+        "failures": [
+            f"{queued.label}: {queued.message}"
+            for queued in queue.jobs
+            if queued.status != SUCCEEDED
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=3)
+    parser.add_argument("--capacity", type=int, default=2, help="Builds per agent")
+    parser.add_argument("--plugins", type=int, default=6)
+    parser.add_argument(
+        "--engines", default="5.4", help="Comma separated engine versions"
+    )
+    parser.add_argument("--lines", type=int, default=2000, help="Output per build")
+    parser.add_argument(
+        "--duration", type=float, default=0.5, help="Extra seconds per build"
+    )
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    versions = args.engines.split(",")
+    with tempfile.TemporaryDirectory(prefix="remote-bench-") as scratch:
+        scratch = Path(scratch)
+        # Keep build logs and the history out of the user's cache folder
+        os.environ["XDG_CACHE_HOME"] = os.environ["LOCALAPPDATA"] = str(
+            scratch / "cache"
+        )
+        engines = [
+            make_fake_engine(
+                scratch / f"UE_{version}",
+                version=tuple(int(part) for part in version.split(".")),
+                lines=args.lines,
+                duration=args.duration,
+                stamp_every=0,
+            )
+            for version in versions
+        ]
+        plugins = [
+            make_fake_plugin(scratch / "plugins", f"Bench{index}")
+            for index in range(args.plugins)
+        ]
+
+        agents = []
+        try:
+            for index in range(args.agents):
+                port = free_port()
+                command = [
+                    sys.executable,
+                    str(ROOT / "UnrealPluginMigrationTool.py"),
+                    "agent",
+                    "--port",
+                    str(port),
+                    "--capacity",
+                    str(args.capacity),
+                    "--work-dir",
+                    str(scratch / f"agent{index}"),
+                ]
+                for engine in engines:
+                    command += ["--engine", str(engine)]
+                process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+                agents.append((port, process))
+            for port, process in agents:
+                wait_for_port(port, process)
+
+            result = asyncio.run(
+                run_queue(
+                    [port for port, _ in agents],
+                    [str(plugin) for plugin in plugins],
+                    versions,
+                    str(scratch / "out"),
+                )
+            )
+        finally:
+            for _, process in agents:
+                process.terminate()
+                process.wait()
+
+    print(
+        f"{result['succeeded']}/{result['jobs']} jobs succeeded, "
+        f"{result['packages']} packages received, in {result['seconds']}s "
+        f"(serial {result['serial_seconds']}s) on {args.agents} agent(s) "
+        f"x {args.capacity} slot(s)"
+    )
+    for address, jobs in sorted(result["jobs_per_agent"].items()):
+        print(f"  {address}: {jobs} job(s)")
+    for failure in result["failures"]:
+        print(f"  FAILED {failure}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2), encoding="utf-8")
+    return 0 if result["succeeded"] == result["jobs"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
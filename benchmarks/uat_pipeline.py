@@ -0,0 +1,328 @@
+"""End-to-end UAT output pipeline benchmark against a fake engine.
+
+Creates a fake engine root (see `fake_engine.py`) whose RunUAT script emits
+a configurable amount of UBT-like output, then measures each consumer in a
+fresh process so peak RSS figures do not leak between modes:
+
+    raw   drain the subprocess pipe without looking at the lines (baseline)
+    core  `run_migration()` with parser and build log, no UI
+    gui   `UnrealPluginMigrationApp.start_migration()` on a headless page
+
+Reported per mode: lines/sec, wall and CPU seconds, peak RSS, overhead
+versus the raw subprocess, UI updates and the latency from a line being
+printed by UAT to it reaching the log callback (core) or the console (gui).
+
+    python benchmarks/uat_pipeline.py --lines 200000 --json pipeline.json
+    python benchmarks/uat_pipeline.py --lines 20000 --rate 5000 --modes core,gui
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_engine import make_fake_engine, make_fake_plugin  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MODES = ("raw", "core", "gui")
+STAMP_RE = re.compile(r" t=(\d+\.\d+)")
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def cpu_seconds():
+    times = os.times()
+    return times.user + times.system
+
+
+def percentiles(samples):
+    if not samples:
+        return None
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return {
+        "p50": round(pick(0.50) * 1000, 2),
+        "p95": round(pick(0.95) * 1000, 2),
+        "max": round(samples[-1] * 1000, 2),
+    }
+
+
+def stamp_latency(lines, now, samples):
+    """Record the delay of the oldest stamped line in a batch"""
+    for line in lines:
+        match = STAMP_RE.search(line)
+        if match:
+            samples.append(now - float(match.group(1)))
+            return
+
+
+class HeadlessPage:
+    """Just enough of `ft.Page` to drive the app without a Flet client"""
+
+    def __init__(self):
+        self.updates = 0
+        self.tasks = []
+        self.controls = []
+        self.window = type("Window", (), {})()
+
+    def add(self, *controls):
+        self.controls.extend(controls)
+
+    def update(self):
+        self.updates += 1
+
+    def run_task(self, handler, *args):
+        task = asyncio.get_running_loop().create_task(handler(*args))
+        self.tasks.append(task)
+        return task
+
+    def show_dialog(self, dialog):
+        self.dialog = dialog
+
+    def pop_dialog(self):
+        pass
+
+
+async def run_raw(job, samples):
+    process = await asyncio.create_subprocess_exec(
+        *job.command(), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+    )
+    count = 0
+    while True:
+        chunk = await process.stdout.read(1024 * 1024)
+        if not chunk:
+            break
+        count += chunk.count(b"\n")
+    await process.wait()
+    return {"lines": count, "success": process.returncode == 0}
+
+
+async def run_core(job, samples):
+    from plugin_migration.build_log import BuildLog
+    from plugin_migration.core import run_migration
+    from plugin_migration.uat_output import UatOutputParser
+
+    count = 0
+
+    def log(message):
+        nonlocal count
+        count += 1
+        if " t=" in message:
+            stamp_latency((message,), time.time(), samples)
+
+    parser = UatOutputParser()
+    build_log = BuildLog.create(job)
+    success, _ = await run_migration(
+        job, log=log, parser=parser, build_log=build_log, preflight=False
+    )
+    build_log.close()
+    return {
+        "lines": len(build_log),
+        "success": success,
+        "log_calls": count,
+        "errors": parser.errors,
+    }
+
+
+async def run_gui(job, samples):
+    from plugin_migration import gui
+
+    page = HeadlessPage()
+    app = gui.UnrealPluginMigrationApp(page)
+    app.uplugin_path = job.uplugin_path
+    app.destination_path = job.destination_path
+    app.ue_root_path = job.ue_root_path
+    app.cache_checkbox.value = False
+    app.preflight_checkbox.value = False
+
+    render = app.console.on_flush
+
+    def timed_render(lines):
+        stamp_latency(lines, time.time(), samples)
+        render(lines)
+
+    app.console.on_flush = timed_render
+    # With the console echo enabled every line is also printed; keep any
+    # such output off the terminal while measuring
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        await app.start_migration(None)
+        app.console.flush()
+    for task in page.tasks:
+        task.cancel()
+    return {
+        "lines": len(app.build_log),
+        "success": app.status_text.value.startswith("✓"),
+        "ui_updates": page.updates,
+        "console_lines": len(app.console.lines),
+        "console_blocks": len(app.console_output.controls),
+    }
+
+
+RUNNERS = {"raw": run_raw, "core": run_core, "gui": run_gui}
+
+
+def run_mode(args):
+    """Child process entry: run one mode and print its result as JSON"""
+    from plugin_migration.core import MigrationJob
+
+    job = MigrationJob(
+        uplugin_path=args.plugin,
+        destination_path=args.out,
+        ue_root_path=args.engine,
+    )
+    samples = []
+    cpu_started = cpu_seconds()
+    started = time.perf_counter()
+    try:
+        result = asyncio.run(RUNNERS[args.run_mode](job, samples))
+    except ImportError as ex:
+        result = {"skipped": f"{ex.name} is not installed"}
+    elapsed = time.perf_counter() - started
+    result.update(
+        mode=args.run_mode,
+        seconds=round(elapsed, 3),
+        cpu_seconds=round(cpu_seconds() - cpu_started, 3),
+        lines_per_sec=round(result.get("lines", 0) / elapsed),
+        peak_rss_kb=peak_rss_kb(),
+        latency_ms=percentiles(samples),
+    )
+    print(json.dumps(result))
+
+
+def spawn_mode(mode, args, engine, plugin, out, env):
+    command = [
+        sys.executable,
+        __file__,
+        "--run-mode",
+        mode,
+        "--engine",
+        str(engine),
+        "--plugin",
+        str(plugin),
+        "--out",
+        str(out),
+    ]
+    completed = subprocess.run(
+        command, env=env, capture_output=True, text=True, encoding="utf-8"
+    )
+    if completed.returncode != 0:
+        return {"mode": mode, "error": completed.stderr.strip().splitlines()[-1:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--width", type=int, default=120, help="Characters per line")
+    parser.add_argument(
+        "--rate", type=int, default=0, help="Lines per second (0 = unthrottled)"
+    )
+    parser.add_argument("--exit-code", type=int, default=0)
+    parser.add_argument(
+        "--error-every", type=int, default=0, help="Emit an error every N lines"
+    )
+    parser.add_argument(
+        "--stamp-every",
+        type=int,
+        default=100,
+        help="Timestamp every Nth line for latency measurement",
+    )
+    parser.add_argument(
+        "--modes", default=",".join(MODES), help=f"Comma separated: {', '.join(MODES)}"
+    )
+    parser.add_argument("--json", help="Also write the results to this file")
+    # Internal: run a single mode in this process
+    parser.add_argument("--run-mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--engine", help=argparse.SUPPRESS)
+    parser.add_argument("--plugin", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        run_mode(args)
+        return
+
+    settings = {
+        "lines": args.lines,
+        "width": args.width,
+        "rate": args.rate,
+        "exit_code": args.exit_code,
+        "error_every": args.error_every,
+        "stamp_every": args.stamp_every,
+    }
+    with tempfile.TemporaryDirectory(prefix="uat-bench-") as scratch:
+        scratch = Path(scratch)
+        engine = make_fake_engine(scratch / "UE_5.4", **settings)
+        plugin = make_fake_plugin(scratch / "plugins")
+        # Keep build logs out of the user's cache folder
+        env = dict(
+            os.environ,
+            XDG_CACHE_HOME=str(scratch / "cache"),
+            LOCALAPPDATA=str(scratch / "cache"),
+        )
+        results = [
+            spawn_mode(mode, args, engine, plugin, scratch / f"out-{mode}", env)
+            for mode in args.modes.split(",")
+        ]
+
+    baseline = next(
+        (r for r in results if r.get("mode") == "raw" and "seconds" in r), None
+    )
+    for result in results:
+        if baseline and "seconds" in result:
+            result["overhead_pct"] = round(
+                (result["seconds"] / baseline["seconds"] - 1) * 100, 1
+            )
+            result["cpu_overhead_seconds"] = round(
+                result["cpu_seconds"] - baseline["cpu_seconds"], 3
+            )
+
+    for result in results:
+        if "seconds" not in result or "skipped" in result:
+            print(f"{result['mode']:<5} skipped: {result.get('skipped') or result}")
+            continue
+        latency = result["latency_ms"] or {}
+        rss = result["peak_rss_kb"]
+        print(
+            f"{result['mode']:<5} {result['lines']:>9} lines {result['seconds']:>8.2f}s "
+            f"{result['lines_per_sec']:>9} lines/s  cpu {result['cpu_seconds']:>6.2f}s  "
+            f"rss {rss / 1024 if rss else 0:>6.1f} MB  "
+            f"overhead {result.get('overhead_pct', 0):>6.1f}%  "
+            f"latency p95 {latency.get('p95', '-')} ms"
+        )
+
+    if args.json:
+        report = {
+            "settings": settings,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Unreal Plugin Migration Tool.
+
+`core` and `cli` are UI-free and never import Flet; `gui` holds the Flet
+application and is only imported when the window is requested.
+"""
@@ -0,0 +1,317 @@
+"""Pre-compile scan of plugin sources for deprecated and removed engine APIs.
+
+Most failed migrations are API changes that UBT only reports after a long
+compile. `scan_plugin()` checks the plugin's Source folder against `RULES`
+for the target engine version before UAT starts:
+
+- All rules are combined into one regex, matched once over each file's
+  memory-mapped bytes. Matches inside comments and string literals are
+  dropped, except for rules that match a literal itself (e.g. "PhysX").
+- Files are spread over a process pool when there are enough of them.
+- Results are cached per file, keyed by size/mtime and content hash, so a
+  re-scan only reads files that changed.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from .core import read_engine_version, user_cache_dir, write_json_atomic
+
+SCAN_CACHE_FORMAT = 3
+SOURCE_SUFFIXES = (".h", ".hpp", ".cpp", ".inl", ".c", ".cc", ".cs")
+# Comments and string/character literals of C++ and C# sources. A quote
+# right after a letter, digit or underscore does not start a character
+# literal, so C++14 digit separators (1'000'000) don't hide the rest of a line.
+COMMENTS_AND_LITERALS = re.compile(
+    rb"//[^\n]*|/\*.*?(?:\*/|\Z)|\"(?:\\.|[^\"\\\n])*\""
+    rb"|(?<![0-9A-Za-z_])'(?:\\.|[^'\\\n])*'",
+    re.S,
+)
+# Below this many changed files the pool costs more than it saves
+PROCESS_POOL_MIN_FILES = 64
+
+DEPRECATED = "warning"
+REMOVED = "error"
+
+
+class ApiRule(NamedTuple):
+    # Engine version from which the rule applies, e.g. (5, 1)
+    since: tuple
+    severity: str
+    pattern: str
+    message: str
+
+
+# fmt: off
+RULES = (
+    ApiRule((5, 0), REMOVED, r"\bUProperty\b|\bUStructProperty\b|\bUObjectProperty\b",
+            "UProperty classes were replaced by FProperty (FStructProperty, FObjectProperty, ...)"),
+    ApiRule((5, 0), REMOVED, r"\bFStringAssetReference\b|\bFStringClassReference\b",
+            "removed; use FSoftObjectPath / FSoftClassPath"),
+    ApiRule((5, 0), REMOVED, r"\bFPaths::Game(?:Dir|ContentDir|SavedDir|ConfigDir|LogDir)\b",
+            "removed; use the FPaths::Project* equivalents"),
+    ApiRule((5, 0), REMOVED, r"\bARRAY_COUNT\s*\(",
+            "removed; use UE_ARRAY_COUNT"),
+    ApiRule((5, 0), REMOVED, r"\bUNavigationSystem\b(?!V1|Base)",
+            "removed; use UNavigationSystemV1"),
+    ApiRule((5, 0), REMOVED, r"#\s*include\s*[<\"](?:PhysXPublic|PhysXIncludes|PxPhysicsAPI)\.h",
+            "PhysX was removed in UE5 (Chaos physics)"),
+    ApiRule((5, 0), REMOVED, r"\bGetPxRigid(?:Dynamic|Actor)\w*\s*\(",
+            "PhysX was removed in UE5 (Chaos physics)"),
+    ApiRule((5, 0), REMOVED, r"\"(?:PhysX|APEX)\"",
+            "the PhysX/APEX modules were removed in UE5"),
+    ApiRule((5, 0), DEPRECATED, r"\bUEditorLevelLibrary\b",
+            "deprecated; use UEditorActorSubsystem / ULevelEditorSubsystem"),
+    ApiRule((5, 0), DEPRECATED, r"->PlatformData\b",
+            "direct access is deprecated; use GetPlatformData()"),
+    ApiRule((5, 0), DEPRECATED, r"->RenderData\b",
+            "direct access is deprecated; use GetRenderData()"),
+    ApiRule((5, 1), DEPRECATED, r"\bFEditorStyle\b",
+            "deprecated; use FAppStyle"),
+    ApiRule((5, 1), DEPRECATED, r"#\s*include\s*\"EditorStyleSet\.h\"",
+            "deprecated header; include \"Styling/AppStyle.h\""),
+    ApiRule((5, 1), DEPRECATED, r"\bANY_PACKAGE\b",
+            "deprecated; use FindFirstObject or a full object path"),
+    ApiRule((5, 1), DEPRECATED, r"#\s*include\s*\"AssetRegistryModule\.h\"",
+            "moved; include \"AssetRegistry/AssetRegistryModule.h\""),
+    ApiRule((5, 1), DEPRECATED, r"\.ObjectPath\b",
+            "FAssetData::ObjectPath is deprecated; use GetSoftObjectPath()"),
+    ApiRule((5, 1), DEPRECATED, r"\.AssetClass\b(?!Path)",
+            "FAssetData::AssetClass is deprecated; use AssetClassPath"),
+    ApiRule((5, 4), DEPRECATED, r"\.(?:Pop|Shrink)\s*\(\s*(?:true|false)\s*\)",
+            "bool bAllowShrinking is deprecated; pass EAllowShrinking"),
+    ApiRule((5, 4), DEPRECATED, r"\.(?:RemoveAt|RemoveAtSwap|SetNum)\s*\([^;()]*,\s*(?:true|false)\s*\)",
+            "bool bAllowShrinking is deprecated; pass EAllowShrinking"),
+)
+# fmt: on
+RULES_VERSION = hashlib.blake2b(repr(RULES).encode(), digest_size=8).hexdigest()
+
+
+class ApiFinding(NamedTuple):
+    path: str
+    line: int
+    severity: str
+    text: str
+    message: str
+
+    def __str__(self):
+        return f"{self.path}:{self.line}: {self.severity}: {self.text} - {self.message}"
+
+
+def version_key(engine_version):
+    try:
+        return tuple(int(part) for part in engine_version.split(".")[:2])
+    except ValueError:
+        return (0, 0)
+
+
+_compiled = {}
+
+
+def rules_regex(version):
+    """One alternation of every rule that applies to `version`, cached per process"""
+    if version not in _compiled:
+        pattern = "|".join(
+            f"(?P<r{index}>{rule.pattern})"
+            for index, rule in enumerate(RULES)
+            if version >= rule.since
+        )
+        _compiled[version] = re.compile(pattern.encode()) if pattern else None
+    return _compiled[version]
+
+
+def comments_and_literals(data):
+    """Sorted `(start, end, is_comment)` spans of comments and literals"""
+    return [
+        (match.start(), match.end(), match.group().startswith(b"/"))
+        for match in COMMENTS_AND_LITERALS.finditer(data)
+    ]
+
+
+def in_comment_or_literal(spans, starts, position):
+    """Whether `position` lies in a comment or inside (not at) a literal.
+
+    A match that starts at a literal's opening quote is about the literal
+    itself, e.g. the "PhysX" module name in a Build.cs.
+    """
+    index = bisect.bisect_right(starts, position) - 1
+    if index < 0:
+        return False
+    start, end, is_comment = spans[index]
+    if position >= end:
+        return False
+    return is_comment or position > start
+
+
+def scan_file(path, version):
+    """Digest and `(line, rule index, text)` findings of one file.
+
+    Runs in pool workers, so it takes and returns plain data only.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    findings = []
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return digest.hexdigest(), findings
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            digest.update(data)
+            regex = rules_regex(version)
+            matches = list(regex.finditer(data)) if regex is not None else []
+            if matches:
+                spans = comments_and_literals(data)
+                starts = [span[0] for span in spans]
+                matches = [
+                    match
+                    for match in matches
+                    if not in_comment_or_literal(spans, starts, match.start())
+                ]
+            if matches:
+                newlines = [match.start() for match in re.finditer(b"\n", data)]
+                for match in matches:
+                    line = bisect.bisect_left(newlines, match.start()) + 1
+                    text = match.group().decode("utf-8", errors="replace")
+                    findings.append((line, int(match.lastgroup[1:]), text))
+    return digest.hexdigest(), findings
+
+
+def _scan_file_task(args):
+    return scan_file(*args)
+
+
+def default_scan_cache_dir():
+    return user_cache_dir() / "api-scan"
+
+
+# Guards loading and saving each cache file, not the scans in between
+_cache_locks = {}
+
+
+def load_scan_cache(cache_file):
+    try:
+        cache = json.loads(cache_file.read_text(encoding="utf-8"))
+        if (
+            cache.get("format") != SCAN_CACHE_FORMAT
+            or cache.get("rules") != RULES_VERSION
+        ):
+            raise ValueError("stale scan cache")
+    except (OSError, ValueError):
+        cache = {"format": SCAN_CACHE_FORMAT, "rules": RULES_VERSION}
+    cache.setdefault("files", {})
+    cache.setdefault("digests", {})
+    return cache
+
+
+class ApiScanReport(NamedTuple):
+    findings: list
+    files: int
+    scanned: int
+    seconds: float
+
+    @property
+    def errors(self):
+        return [finding for finding in self.findings if finding.severity == REMOVED]
+
+    @property
+    def warnings(self):
+        return [finding for finding in self.findings if finding.severity == DEPRECATED]
+
+    def summary(self):
+        return (
+            f"API scan: {len(self.errors)} removed, {len(self.warnings)} deprecated "
+            f"in {self.files} file(s) ({self.scanned} rescanned, "
+            f"{self.seconds * 1000:.0f} ms)"
+        )
+
+
+def scan_plugin(job, cache_dir=None, workers=None):
+    """Scan job's Source folder for the target engine; returns an ApiScanReport"""
+    started = time.monotonic()
+    engine_version = read_engine_version(job.ue_root_path)
+    version = version_key(engine_version)
+    source_dir = job.plugin_dir / "Source"
+
+    files = []
+    for dirpath, _, filenames in os.walk(source_dir):
+        for name in filenames:
+            if name.endswith(SOURCE_SUFFIXES):
+                path = Path(dirpath) / name
+                stat = path.stat()
+                files.append((path, [stat.st_size, stat.st_mtime_ns]))
+
+    cache_dir = Path(cache_dir) if cache_dir else default_scan_cache_dir()
+    cache_file = cache_dir / f"{engine_version}.json"
+    lock = _cache_locks.setdefault(cache_file, threading.Lock())
+    with lock:
+        cache = load_scan_cache(cache_file)
+    stats = cache["files"]
+    results = cache["digests"]
+
+    changed = [
+        (path, signature)
+        for path, signature in files
+        if stats.get(str(path), [None])[:2] != signature
+        or stats[str(path)][2] not in results
+    ]
+    tasks = [(str(path), version) for path, _ in changed]
+    if len(tasks) >= PROCESS_POOL_MIN_FILES:
+        # Forking a process with running threads (asyncio, Flet) can
+        # deadlock the children, so workers always start fresh
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context) as pool:
+            scanned = list(pool.map(_scan_file_task, tasks, chunksize=16))
+    else:
+        scanned = [scan_file(*task) for task in tasks]
+    for (path, signature), (digest, findings) in zip(changed, scanned):
+        stats[str(path)] = [*signature, digest]
+        results[digest] = findings
+
+    live = {str(path) for path, _ in files}
+    prefix = str(source_dir) + os.sep
+    stale = [key for key in stats if key.startswith(prefix) and key not in live]
+    if changed or stale:
+        with lock:
+            # Merge into the latest cache: other jobs may have saved theirs
+            # while this one was scanning
+            latest = load_scan_cache(cache_file)
+            for path, _ in changed:
+                entry = stats[str(path)]
+                latest["files"][str(path)] = entry
+                latest["digests"][entry[2]] = results[entry[2]]
+            # Forget files that no longer exist and findings nothing refers to
+            for key in stale:
+                latest["files"].pop(key, None)
+            used = {entry[2] for entry in latest["files"].values()}
+            latest["digests"] = {
+                digest: found
+                for digest, found in latest["digests"].items()
+                if digest in used
+            }
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                write_json_atomic(cache_file, latest)
+            except OSError:
+                pass
+
+    findings = []
+    for path, _ in files:
+        relative = path.relative_to(job.plugin_dir).as_posix()
+        for line, rule_index, text in results[stats[str(path)][2]]:
+            rule = RULES[rule_index]
+            findings.append(
+                ApiFinding(relative, line, rule.severity, text, rule.message)
+            )
+
+    findings.sort(key=lambda finding: (finding.path, finding.line))
+    return ApiScanReport(findings, len(files), len(changed), time.monotonic() - started)
@@ -0,0 +1,245 @@
+"""Migration queue: a matrix of plugins x engine roots run with bounded parallelism.
+
+Every job packages into `<destination>/Migrated/<Plugin>/<EngineVersion>` so
+concurrent runs never write to the same folder.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from functools import partial
+
+from .build_log import BuildLog
+from .core import MigrationJob, read_engine_version, run_migration
+from .resources import ResourceMonitor, resources_path, sampling_available
+from .uat_output import UatOutputParser
+
+DEFAULT_CONCURRENCY = 2
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+@dataclass
+class QueuedJob:
+    job: MigrationJob
+    engine_version: str
+    status: str = QUEUED
+    message: str = ""
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    parser: UatOutputParser = field(default_factory=UatOutputParser)
+    build_log: BuildLog | None = None
+    monitor: ResourceMonitor | None = None
+
+    @property
+    def label(self):
+        return f"{self.job.plugin_name} @ UE {self.engine_version}"
+
+    @property
+    def duration(self):
+        if not self.started_at:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+
+class MigrationQueue:
+    """Runs queued jobs with at most `concurrency` UAT processes at once.
+
+    `log(message)` receives every output line prefixed with the job label and
+    `on_change(queued_job)` is called whenever a job changes status. Jobs go
+    through `cache` (a `BuildCache`) when one is given, and `drain()` is
+    awaited between output chunks so the log consumer can apply backpressure.
+    With `preflight` every job is checked before it builds; jobs for the same
+    engine share one plugin catalog. With `api_scan` sources are scanned for
+    deprecated engine APIs first (see `run_migration`). Finished jobs are
+    recorded in `history`. With `workers` (a `WorkerPool`) builds run on
+    remote agents and up to their combined capacity run at once. With
+    `sample_resources` each job's processes are sampled next to its build
+    log and every sample is passed to `on_sample(queued_job, sample)`. With
+    `budget` (a `CoreBudget`) every BuildPlugin run waits for its share of
+    cores and memory and is confined to those cores. With `fail_fast` each
+    job is stopped at its first error, freeing its share for the next job.
+    `cancel()` stops running jobs and drops the pending ones.
+    """
+
+    def __init__(
+        self,
+        concurrency=DEFAULT_CONCURRENCY,
+        log=print,
+        on_change=None,
+        cache=None,
+        drain=None,
+        preflight=True,
+        split_platforms=None,
+        history=None,
+        incremental=False,
+        stage_source=False,
+        stage_root="",
+        api_scan=True,
+        abort_on_api_errors=False,
+        workers=None,
+        sample_resources=True,
+        on_sample=None,
+        budget=None,
+        fail_fast=False,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.log = log
+        self.on_change = on_change
+        self.cache = cache
+        self.drain = drain
+        self.preflight = preflight
+        # Applied to jobs as they are added, see MigrationJob.split_platforms
+        self.split_platforms = split_platforms or []
+        self.history = history
+        self.incremental = incremental
+        self.stage_source = stage_source
+        self.stage_root = stage_root
+        self.api_scan = api_scan
+        self.abort_on_api_errors = abort_on_api_errors
+        self.workers = workers
+        self.sample_resources = sample_resources
+        self.on_sample = on_sample
+        self.budget = budget
+        self.fail_fast = fail_fast
+        self.jobs = []
+        self.tasks = []
+
+    def add(self, uplugin_path, ue_root_path, destination_path):
+        """Queue one plugin/engine pair; duplicates are ignored"""
+        engine_version = read_engine_version(ue_root_path)
+        job = MigrationJob(
+            uplugin_path=uplugin_path,
+            destination_path=destination_path,
+            ue_root_path=ue_root_path,
+            split_platforms=list(self.split_platforms),
+            incremental=self.incremental,
+            stage_source=self.stage_source,
+            stage_root=self.stage_root,
+        )
+        job.package_subdir = f"{job.plugin_name}/{engine_version}"
+        for queued in self.jobs:
+            if queued.job.package_dir == job.package_dir:
+                return queued
+        queued = QueuedJob(job=job, engine_version=engine_version)
+        self.jobs.append(queued)
+        return queued
+
+    def add_matrix(self, uplugin_paths, ue_root_paths, destination_path):
+        for uplugin_path in uplugin_paths:
+            for ue_root_path in ue_root_paths:
+                self.add(uplugin_path, ue_root_path, destination_path)
+
+    def set_status(self, queued, status, message=""):
+        queued.status = status
+        queued.message = message
+        if self.on_change:
+            self.on_change(queued)
+
+    async def run_job(self, queued, semaphore):
+        try:
+            async with semaphore:
+                queued.started_at = time.monotonic()
+                self.set_status(queued, RUNNING)
+                success, message = await self.migrate(queued)
+        except asyncio.CancelledError:
+            success, message = None, "Cancelled"
+        except Exception as ex:
+            # E.g. the build log could not be created; fail this job only
+            success, message = False, f"Exception occurred: {ex}"
+            self.log(f"[{queued.label}] ✗ {message}")
+        finally:
+            if queued.build_log is not None:
+                queued.build_log.close()
+            if queued.monitor is not None:
+                queued.monitor.close()
+        queued.finished_at = time.monotonic()
+        status = CANCELLED if success is None else SUCCEEDED if success else FAILED
+        self.set_status(queued, status, message)
+
+    async def migrate(self, queued):
+        prefix = f"[{queued.label}] "
+
+        def log(message):
+            self.log("\n".join(prefix + line for line in message.split("\n")))
+
+        if self.workers is None and not queued.job.uat_path.exists():
+            message = f"{queued.job.uat_path} not found"
+            log(message)
+            return False, message
+        queued.build_log = BuildLog.create(queued.job)
+        if self.sample_resources and sampling_available():
+            queued.monitor = ResourceMonitor(
+                resources_path(queued.build_log.path),
+                on_sample=self.on_sample and partial(self.on_sample, queued),
+            )
+        return await run_migration(
+            queued.job,
+            log=log,
+            cache=self.cache,
+            parser=queued.parser,
+            build_log=queued.build_log,
+            drain=self.drain,
+            preflight=self.preflight,
+            history=self.history,
+            api_scan=self.api_scan,
+            abort_on_api_errors=self.abort_on_api_errors,
+            workers=self.workers,
+            monitor=queued.monitor,
+            budget=self.budget,
+            fail_fast=self.fail_fast,
+        )
+
+    async def run(self):
+        """Run every queued job and return them once all have finished"""
+        concurrency = self.concurrency
+        if self.workers is not None:
+            await self.workers.connect()
+            concurrency = max(concurrency, self.workers.capacity)
+        semaphore = asyncio.Semaphore(concurrency)
+        pending = [queued for queued in self.jobs if queued.status == QUEUED]
+        self.tasks = [
+            asyncio.ensure_future(self.run_job(queued, semaphore)) for queued in pending
+        ]
+        try:
+            await asyncio.gather(*self.tasks)
+        finally:
+            self.tasks = []
+        return self.jobs
+
+    def cancel(self):
+        """Stop the running jobs and mark the pending ones cancelled"""
+        for task in self.tasks:
+            task.cancel()
+
+    def summary(self):
+        """One-line aggregate, e.g. "3 succeeded, 1 failed, 0 pending" """
+        counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0, CANCELLED: 0}
+        for queued in self.jobs:
+            counts[queued.status] += 1
+        cancelled = f"{counts[CANCELLED]} cancelled, " if counts[CANCELLED] else ""
+        return (
+            f"{counts[SUCCEEDED]} succeeded, {counts[FAILED]} failed, {cancelled}"
+            f"{counts[QUEUED] + counts[RUNNING]} pending"
+        )
+
+    def report(self):
+        """Per-job status lines followed by the aggregate summary"""
+        lines = [
+            f"{queued.status.upper():<10} {queued.label:<40} {queued.duration:7.1f}s"
+            f"  {queued.parser.summary()}"
+            for queued in self.jobs
+        ]
+        for queued in self.jobs:
+            if queued.status == FAILED and queued.build_log is not None:
+                lines.append(f"Log for {queued.label}: {queued.build_log.path}")
+        lines.append(self.summary())
+        if self.cache is not None:
+            lines.append(self.cache.stats())
+        return "\n".join(lines)
@@ -0,0 +1,159 @@
+"""Core and memory budget shared by concurrent builds.
+
+Every UnrealBuildTool run sizes its parallelism to the whole machine, so a
+few concurrent BuildPlugin runs oversubscribe the CPU and memory many times
+over. A `CoreBudget` hands each build process an allotment of specific
+cores and memory and only admits a build when its allotment is free:
+
+- UBT sizes its executor from the machine's physical and logical core
+  counts, not from the affinity, so each UE5 build is told its share with
+  `-MaxParallelActions` (through `-ubtargs` for BuildPlugin).
+- The build's process tree is also pinned to its cores (CPU affinity on
+  Linux and Windows), so the compilers cannot spill onto other builds'
+  cores.
+- Memory is reserved per core (about what one compile action needs), so
+  jobs wait instead of pushing the machine into swap.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import NamedTuple
+
+from .core import IS_WINDOWS, format_size
+from .resources import total_memory
+
+# Typical peak memory of one compile action, as UBT assumes for its defaults
+DEFAULT_MEMORY_PER_CORE = 1.5 * 1024**3
+
+
+def available_cores():
+    """Ids of the cores this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def affinity_supported():
+    return hasattr(os, "sched_setaffinity") or IS_WINDOWS
+
+
+def pin_process(pid, cores):
+    """Restrict process `pid` (and the children it starts) to `cores`.
+
+    Returns False when that failed or affinity is not supported (macOS).
+    Windows affinity masks only reach the first 64 cores.
+    """
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(pid, cores)
+            return True
+        if IS_WINDOWS:
+            import ctypes
+
+            kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+            # PROCESS_SET_INFORMATION | PROCESS_QUERY_INFORMATION
+            handle = kernel32.OpenProcess(0x0200 | 0x0400, False, pid)
+            if not handle:
+                return False
+            try:
+                mask = sum(1 << core for core in cores if core < 64)
+                if not mask:
+                    return False
+                return bool(
+                    kernel32.SetProcessAffinityMask(handle, ctypes.c_size_t(mask))
+                )
+            finally:
+                kernel32.CloseHandle(handle)
+    except OSError:
+        # The process may already have exited
+        pass
+    return False
+
+
+class Allotment(NamedTuple):
+    cores: list
+    memory_bytes: int
+
+
+class CoreBudget:
+    """Cores and memory handed out to build processes.
+
+    Each build gets `cores_per_build` cores (default: all of them) and
+    `memory_per_core` bytes per core. Requests wait until enough of both are
+    free; a request larger than the whole budget is reduced to fit. Budgets
+    only pay off with concurrent builds; front ends create one for queues,
+    batches and split builds.
+    """
+
+    def __init__(
+        self,
+        cores=None,
+        memory_bytes=None,
+        cores_per_build=None,
+        memory_per_core=DEFAULT_MEMORY_PER_CORE,
+    ):
+        usable = available_cores()
+        self.cores = usable[:cores] if cores else usable
+        self.memory_bytes = memory_bytes or total_memory()
+        self.cores_per_build = max(
+            1, min(cores_per_build or len(self.cores), len(self.cores))
+        )
+        self.memory_per_core = memory_per_core
+        self.free_cores = list(self.cores)
+        self.free_memory = self.memory_bytes
+        self.changed = asyncio.Condition()
+
+    @classmethod
+    def shared(cls, builds, **options):
+        """Budget splitting the machine evenly between `builds` concurrent builds"""
+        budget = cls(**options)
+        if not options.get("cores_per_build"):
+            budget.cores_per_build = max(1, len(budget.cores) // max(1, builds))
+        return budget
+
+    def request(self):
+        """Cores and memory one build asks for"""
+        cores = self.cores_per_build
+        memory = int(cores * self.memory_per_core)
+        if self.memory_bytes is not None:
+            memory = min(memory, self.memory_bytes)
+        return cores, memory
+
+    def fits(self, cores, memory):
+        if len(self.free_cores) < cores:
+            return False
+        return self.memory_bytes is None or self.free_memory >= memory
+
+    @asynccontextmanager
+    async def allot(self, log=print):
+        """Wait for and hold one build's allotment"""
+        cores, memory = self.request()
+        async with self.changed:
+            if not self.fits(cores, memory):
+                log(
+                    f"Waiting for {cores} free core(s) and {format_size(memory)} "
+                    f"of memory..."
+                )
+                await self.changed.wait_for(lambda: self.fits(cores, memory))
+            allotment = Allotment(self.free_cores[:cores], memory)
+            del self.free_cores[:cores]
+            if self.memory_bytes is not None:
+                self.free_memory -= memory
+        try:
+            yield allotment
+        finally:
+            async with self.changed:
+                self.free_cores = sorted(self.free_cores + allotment.cores)
+                if self.memory_bytes is not None:
+                    self.free_memory += memory
+                self.changed.notify_all()
+
+    def describe(self):
+        memory = format_size(self.memory_bytes) if self.memory_bytes else "unlimited"
+        return (
+            f"Core budget: {len(self.cores)} core(s), {memory} memory, "
+            f"{self.cores_per_build} core(s) per build"
+        )
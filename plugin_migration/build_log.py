@@ -0,0 +1,155 @@
+"""Disk-spooled build logs with a line-offset index.
+
+Every run's output is appended to a log file instead of being kept in
+memory. The byte offset of each line is recorded in a compact array, so any
+range of lines can be read back with a single seek, searches scan the file
+in large chunks, and the first error is found from the recorded error line
+numbers without touching the text at all.
+"""
+
+from __future__ import annotations
+
+import bisect
+import time
+from array import array
+from pathlib import Path
+
+from .core import user_cache_dir
+from .resources import resources_path
+
+# Number of old logs kept in the logs folder
+MAX_KEPT_LOGS = 50
+SEARCH_CHUNK_SIZE = 1 << 20
+
+
+def default_logs_dir():
+    return user_cache_dir() / "logs"
+
+
+def prune_logs(logs_dir, keep=MAX_KEPT_LOGS):
+    logs = sorted(Path(logs_dir).glob("*.log"), key=lambda path: path.stat().st_mtime)
+    for path in logs[:-keep] if keep else logs:
+        try:
+            path.unlink()
+            resources_path(path).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+class BuildLog:
+    """Append-only log file with random access by line number"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.writer = open(self.path, "wb")
+        self.reader = None
+        # offsets[i] is where line i starts; the last entry is the end of file
+        self.offsets = array("Q", [0])
+        self.error_lines = array("L")
+        self.dirty = False
+
+    @classmethod
+    def create(cls, job, logs_dir=None):
+        """New log for `job` in the logs folder, pruning the oldest ones"""
+        logs_dir = Path(logs_dir) if logs_dir else default_logs_dir()
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        name = job.plugin_name or "migration"
+        if job.package_subdir:
+            name += "-" + job.package_subdir.replace("/", "-")
+        logs_dir.mkdir(parents=True, exist_ok=True)
+        prune_logs(logs_dir, MAX_KEPT_LOGS - 1)
+        path = logs_dir / f"{name}-{stamp}.log"
+        counter = 1
+        while path.exists():
+            counter += 1
+            path = logs_dir / f"{name}-{stamp}-{counter}.log"
+        return cls(path)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def write(self, message, is_error=False):
+        """Append a message; one with newlines is indexed as several lines.
+
+        An error message is marked as an error at its first line.
+        """
+        data = message.encode("utf-8", errors="replace") + b"\n"
+        self.writer.write(data)
+        if is_error:
+            self.error_lines.append(len(self))
+        if b"\n" in data[:-1]:
+            offset = self.offsets[-1]
+            for line in data[:-1].split(b"\n"):
+                offset += len(line) + 1
+                self.offsets.append(offset)
+        else:
+            self.offsets.append(self.offsets[-1] + len(data))
+        self.dirty = True
+
+    def read_bytes(self, start, end):
+        if self.dirty:
+            self.writer.flush()
+            self.dirty = False
+        if self.reader is None:
+            self.reader = open(self.path, "rb")
+        self.reader.seek(start)
+        return self.reader.read(end - start)
+
+    def lines(self, start, count):
+        """Up to `count` lines starting at line number `start`"""
+        start = max(0, min(start, len(self)))
+        stop = min(len(self), start + count)
+        if start >= stop:
+            return []
+        data = self.read_bytes(self.offsets[start], self.offsets[stop])
+        return data.decode("utf-8", errors="replace").split("\n")[: stop - start]
+
+    def line(self, number):
+        lines = self.lines(number, 1)
+        return lines[0] if lines else ""
+
+    def first_error(self):
+        """Line number of the first error, or None"""
+        return self.error_lines[0] if self.error_lines else None
+
+    def next_error(self, after):
+        index = bisect.bisect_right(self.error_lines, after)
+        return self.error_lines[index] if index < len(self.error_lines) else None
+
+    def search(self, text, start=0):
+        """Line number of the next line at or after `start` containing text.
+
+        The match is case-insensitive and wraps around to the beginning.
+        """
+        needle = text.lower().encode("utf-8")
+        if not needle or not len(self):
+            return None
+        start = max(0, min(start, len(self) - 1))
+        match = self.search_range(needle, self.offsets[start], self.offsets[-1])
+        if match is None and start:
+            match = self.search_range(needle, 0, self.offsets[start])
+        if match is None:
+            return None
+        return bisect.bisect_right(self.offsets, match) - 1
+
+    def search_range(self, needle, begin, end):
+        """Byte offset of needle between begin and end, scanning in chunks"""
+        overlap = len(needle) - 1
+        position = begin
+        while position < end:
+            chunk_end = min(end, position + SEARCH_CHUNK_SIZE + overlap)
+            chunk = self.read_bytes(position, chunk_end).lower()
+            found = chunk.find(needle)
+            if found != -1:
+                return position + found
+            position += SEARCH_CHUNK_SIZE
+        return None
+
+    def close(self):
+        """Stop writing; the log can still be read afterwards"""
+        self.writer.close()
+        self.dirty = False
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
@@ -0,0 +1,294 @@
+"""Content-addressed cache of BuildPlugin packages.
+
+The key hashes the plugin sources, the engine's Build.version and the
+BuildPlugin arguments, so re-running an unchanged migration restores the
+previously packaged output instead of launching UAT.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import shutil
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from .core import format_size, user_cache_dir, write_json_atomic
+
+# Bump when the key or entry layout changes so old entries are never reused
+CACHE_FORMAT = 1
+DEFAULT_CACHE_LIMIT_GB = 20
+HASH_CHUNK_SIZE = 1 << 20
+
+# Plugin folders whose contents end up in the package. Content and Shaders
+# are packaged by BuildPlugin as well, so they have to be part of the key.
+HASHED_PLUGIN_DIRS = ("Source", "Resources", "Config", "Shaders", "Content")
+
+
+def default_cache_dir():
+    return user_cache_dir() / "build-cache"
+
+
+def hash_file(path):
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_files(root):
+    """Every file below root, in a stable order"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            yield Path(dirpath) / filename
+
+
+class FileHashIndex:
+    """Remembers file digests by size and mtime so unchanged files are not re-read"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.dirty = False
+        try:
+            self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def digest(self, file_path):
+        stat = os.stat(file_path)
+        key = str(file_path)
+        entry = self.entries.get(key)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        digest = hash_file(file_path)
+        self.entries[key] = [stat.st_size, stat.st_mtime_ns, digest]
+        self.dirty = True
+        return digest
+
+    def prune(self):
+        """Forget files that no longer exist"""
+        with self.lock:
+            missing = [key for key in list(self.entries) if not os.path.exists(key)]
+            for key in missing:
+                del self.entries[key]
+            if missing:
+                self.dirty = True
+            return len(missing)
+
+    def save(self):
+        self.prune()
+        with self.lock:
+            if not self.dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.path, dict(self.entries))
+            self.dirty = False
+
+
+class BuildCache:
+    """Local package cache with a size limit and least-recently-used eviction.
+
+    Entries live in `<cache_dir>/entries/<key>/` as a copy of the package plus
+    an `entry.json` holding its size and last use time. With `link=True` hits
+    are restored as hard links, which is instant but means the restored files
+    share storage with the cache and must not be edited in place.
+    """
+
+    def __init__(self, cache_dir=None, limit_gb=DEFAULT_CACHE_LIMIT_GB, link=False):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.entries_dir = self.cache_dir / "entries"
+        self.limit_bytes = int(limit_gb * 1024**3)
+        self.link = link
+        self.lock = threading.Lock()
+        # Keys of entries being restored, which evict() must leave alone
+        self.pinned = Counter()
+        self.hash_index = FileHashIndex(self.cache_dir / "file-hashes.json")
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, job):
+        """Hash of everything that determines the BuildPlugin output"""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"format={CACHE_FORMAT}\nhost={platform.system()}\n".encode())
+
+        build_version = Path(job.ue_root_path) / "Engine" / "Build" / "Build.version"
+        try:
+            digest.update(b"engine=" + build_version.read_bytes() + b"\n")
+        except OSError:
+            digest.update(f"engine={Path(job.ue_root_path).resolve()}\n".encode())
+
+        args = [
+            arg
+            for arg in job.command()[1:]
+            if not arg.startswith(("-plugin=", "-package="))
+        ]
+        digest.update(("args=" + "\0".join(args) + "\n").encode())
+        digest.update(("split=" + "+".join(job.split_platforms) + "\n").encode())
+        if job.incremental:
+            digest.update(b"incremental\n")
+
+        plugin_dir = job.plugin_dir
+        files = [Path(job.uplugin_path)]
+        for name in HASHED_PLUGIN_DIRS:
+            files.extend(iter_files(plugin_dir / name))
+        for path in files:
+            relative = path.relative_to(plugin_dir).as_posix()
+            digest.update(f"{relative}\0{self.hash_index.digest(path)}\n".encode())
+
+        self.hash_index.save()
+        return digest.hexdigest()
+
+    def entry_dir(self, key):
+        return self.entries_dir / key
+
+    def lookup(self, key):
+        return (self.entry_dir(key) / "entry.json").exists()
+
+    def read_entry(self, entry_dir):
+        try:
+            return json.loads((entry_dir / "entry.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def restore(self, key, package_dir):
+        """Replace package_dir with a copy (or hard links) of a cached package.
+
+        The copy is made next to package_dir and renamed into place, so the
+        folder ends up exactly as a BuildPlugin run would leave it and a
+        failed restore leaves nothing behind. The entry is pinned while it is
+        copied so `evict()` cannot remove it. Returns `(files, bytes)`, or
+        None when the entry is gone.
+        """
+        entry_dir = self.entry_dir(key)
+        source = entry_dir / "package"
+        package_dir = Path(package_dir)
+        with self.lock:
+            if not self.lookup(key):
+                return None
+            self.pinned[key] += 1
+        tmp_dir = package_dir.with_name(
+            f".{package_dir.name}.{os.getpid()}.{threading.get_ident()}.restore"
+        )
+        files = 0
+        total = 0
+        try:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            for path in iter_files(source):
+                target = tmp_dir / path.relative_to(source)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if self.link:
+                    try:
+                        os.link(path, target)
+                    except OSError:
+                        shutil.copy2(path, target)
+                else:
+                    shutil.copy2(path, target)
+                files += 1
+                total += path.stat().st_size
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            shutil.rmtree(package_dir, ignore_errors=True)
+            os.replace(tmp_dir, package_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        finally:
+            with self.lock:
+                self.pinned[key] -= 1
+                if not self.pinned[key]:
+                    del self.pinned[key]
+                entry = self.read_entry(entry_dir)
+                if entry is not None:
+                    entry["last_used"] = time.time()
+                    write_json_atomic(entry_dir / "entry.json", entry)
+        return files, total
+
+    def store(self, key, job):
+        """Copy a freshly built package into the cache; returns (bytes, evicted)"""
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = self.entries_dir / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copytree(job.package_dir, tmp_dir / "package")
+        size = sum(path.stat().st_size for path in iter_files(tmp_dir / "package"))
+        now = time.time()
+        write_json_atomic(
+            tmp_dir / "entry.json",
+            {
+                "plugin": job.plugin_name,
+                "engine_root": str(job.ue_root_path),
+                "size": size,
+                "created": now,
+                "last_used": now,
+            },
+        )
+        try:
+            os.rename(tmp_dir, self.entry_dir(key))
+        except OSError:
+            # Another job stored the same key first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return size, self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits its limit"""
+        with self.lock:
+            entries = []
+            for entry_dir in self.entries_dir.iterdir():
+                if entry_dir.name.startswith(".") or entry_dir.name in self.pinned:
+                    continue
+                entry = self.read_entry(entry_dir)
+                if entry is None:
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+                    continue
+                entries.append((entry["last_used"], entry["size"], entry_dir))
+
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            for _, size, entry_dir in entries:
+                if total <= self.limit_bytes:
+                    break
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total -= size
+                evicted += 1
+            return evicted
+
+    async def run(self, job, runner, log=print, **runner_kwargs):
+        """Restore `job` on a hit, otherwise run `runner` and store the result"""
+        key = await asyncio.to_thread(self.key_for, job)
+        short_key = key[:12]
+
+        started = time.monotonic()
+        restored = None
+        if self.lookup(key):
+            restored = await asyncio.to_thread(self.restore, key, job.package_dir)
+        if restored is not None:
+            files, size = restored
+            self.hits += 1
+            log(
+                f"✓ Build cache hit ({short_key}): restored {files} files "
+                f"({format_size(size)}) in {time.monotonic() - started:.1f}s"
+            )
+            return True, f"Restored from build cache ({short_key})"
+
+        self.misses += 1
+        log(f"Build cache miss ({short_key}), running BuildPlugin...")
+        success, message = await runner(job, log=log, **runner_kwargs)
+        if success:
+            try:
+                size, evicted = await asyncio.to_thread(self.store, key, job)
+                log(
+                    f"Stored package in build cache ({format_size(size)}, "
+                    f"{evicted} old entr{'y' if evicted == 1 else 'ies'} evicted)"
+                )
+            except OSError as ex:
+                log(f"⚠ Could not store package in build cache: {ex}")
+        return success, message
+
+    def stats(self):
+        return f"Build cache: {self.hits} hit(s), {self.misses} miss(es)"
@@ -0,0 +1,661 @@
+"""Headless command line entry point.
+
+    python UnrealPluginMigrationTool.py migrate --plugin X.uplugin --engine UE_ROOT --out DIR
+
+The GUI module is never imported, so build agents do not pay for Flet. The
+feature modules imported below (cache, history, remote, packaging, ...)
+use only the standard library and add a few milliseconds at most; the time
+to launching UAT is reported against `STARTUP_BUDGET_MS`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from .budget import CoreBudget
+from .build_log import BuildLog
+from .batch import DEFAULT_CONCURRENCY, FAILED, SUCCEEDED, MigrationQueue
+from .cache import DEFAULT_CACHE_LIMIT_GB, BuildCache
+from .core import (
+    MigrationJob,
+    UAT_SCRIPT_NAME,
+    format_duration,
+    parse_platforms,
+    run_migration,
+)
+from .deploy import deploy_package
+from .engines import EngineIndex, resolve_engine_root
+from .history import BuildHistory, describe_run
+from .packaging import archive_package, describe_archive, job_archive_path
+from .remote import (
+    DEFAULT_AGENT_CAPACITY,
+    DEFAULT_AGENT_PORT,
+    BuildAgent,
+    WorkerPool,
+    parse_worker,
+)
+from .resources import ResourceMonitor, resources_path, sampling_available
+from .uat_output import UatOutputParser
+from .watch import DEFAULT_DEBOUNCE, watch_plugin
+
+# Time from process entry to launching UAT that the CLI should stay under
+STARTUP_BUDGET_MS = 250
+
+
+def add_cache_arguments(parser):
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always run BuildPlugin instead of restoring unchanged builds",
+    )
+    parser.add_argument("--cache-dir", help="Build cache folder")
+    parser.add_argument(
+        "--cache-size-gb",
+        type=float,
+        default=DEFAULT_CACHE_LIMIT_GB,
+        help=f"Evict old cache entries above this size (default {DEFAULT_CACHE_LIMIT_GB})",
+    )
+    parser.add_argument(
+        "--cache-hardlink",
+        action="store_true",
+        help="Restore cache hits as hard links instead of copies",
+    )
+
+
+def add_preflight_argument(parser):
+    parser.add_argument(
+        "--skip-preflight",
+        action="store_true",
+        help="Do not check the .uplugin against the engine's plugins first",
+    )
+
+
+def add_api_scan_arguments(parser):
+    parser.add_argument(
+        "--skip-api-scan",
+        action="store_true",
+        help="Do not scan the plugin sources for deprecated engine APIs first",
+    )
+    parser.add_argument(
+        "--abort-on-api-errors",
+        action="store_true",
+        help="Fail before building when the scan finds APIs the engine removed",
+    )
+
+
+def add_fail_fast_argument(parser):
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop the build (UAT, UBT and compilers) at the first error and "
+        "remove its partial output",
+    )
+
+
+def add_watch_arguments(parser):
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and rebuild whenever the plugin source changes, "
+        "cancelling a build of older sources (best with --incremental)",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEFAULT_DEBOUNCE,
+        metavar="SECONDS",
+        help=f"Quiet time after the last change before rebuilding "
+        f"(default {DEFAULT_DEBOUNCE})",
+    )
+
+
+def add_split_argument(parser):
+    parser.add_argument(
+        "--split-platforms",
+        type=parse_platforms,
+        default=[],
+        metavar="PLATFORMS",
+        help="Build these target platforms (e.g. Win64,Android) in concurrent "
+        "UAT runs and merge the packages",
+    )
+
+
+def add_incremental_argument(parser):
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Build in a persistent workspace so unchanged modules are not "
+        "recompiled (runs UnrealBuildTool directly instead of BuildPlugin)",
+    )
+
+
+def add_staging_arguments(parser):
+    parser.add_argument(
+        "--stage-source",
+        action="store_true",
+        help="Build from a local mirror of the plugin source (reflinked, hard "
+        "linked or copied, without Binaries/Intermediate) kept between runs",
+    )
+    parser.add_argument(
+        "--stage-root",
+        default="",
+        metavar="DIR",
+        help="Keep the mirror here, e.g. on a tmpfs (default: the cache folder)",
+    )
+
+
+def add_deploy_argument(parser):
+    parser.add_argument(
+        "--deploy",
+        action="append",
+        default=[],
+        metavar="PROJECT",
+        help="After a successful build, copy the changed files of the package "
+        "into this project's Plugins folder (repeat for more projects)",
+    )
+
+
+def add_archive_arguments(parser):
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="Also pack the result into a deduplicated .tar.gz with a manifest",
+    )
+    parser.add_argument(
+        "--archive-keep-debug",
+        action="store_true",
+        help="Keep debug symbols (.pdb, .debug, .dSYM) in the archive",
+    )
+
+
+def add_history_argument(parser):
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Do not record this run in the build history",
+    )
+
+
+def add_worker_argument(parser):
+    parser.add_argument(
+        "--worker",
+        action="append",
+        type=parse_worker,
+        default=[],
+        metavar="HOST:PORT",
+        help="Build on this remote build agent instead of locally "
+        "(repeat for more agents; see the 'agent' command)",
+    )
+
+
+def make_workers(args):
+    return WorkerPool(args.worker) if args.worker else None
+
+
+def add_resources_argument(parser):
+    parser.add_argument(
+        "--no-resource-sampling",
+        action="store_true",
+        help="Do not record CPU, memory and disk use of the build processes",
+    )
+
+
+def add_budget_arguments(parser):
+    parser.add_argument(
+        "--no-core-budget",
+        action="store_true",
+        help="Let every build use all cores instead of sharing them out",
+    )
+    parser.add_argument(
+        "--cores", type=int, help="Cores available to builds (default: all)"
+    )
+    parser.add_argument(
+        "--cores-per-build",
+        type=int,
+        help="Cores each BuildPlugin run gets (default: an even share)",
+    )
+    parser.add_argument(
+        "--memory-budget-gb",
+        type=float,
+        help="Memory available to builds (default: physical memory)",
+    )
+
+
+def make_budget(args, builds):
+    """Core budget shared by `builds` concurrent BuildPlugin runs.
+
+    A single build only gets one when a budget option asks for it.
+    """
+    if args.no_core_budget:
+        return None
+    requested = args.cores or args.cores_per_build or args.memory_budget_gb
+    if builds <= 1 and not requested:
+        return None
+    return CoreBudget.shared(
+        builds,
+        cores=args.cores,
+        cores_per_build=args.cores_per_build,
+        memory_bytes=args.memory_budget_gb and int(args.memory_budget_gb * 1024**3),
+    )
+
+
+def make_history(args):
+    return None if args.no_history else BuildHistory()
+
+
+def make_cache(args):
+    if args.no_cache:
+        return None
+    return BuildCache(args.cache_dir, args.cache_size_gb, link=args.cache_hardlink)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="UnrealPluginMigrationTool",
+        description="Migrate Unreal Engine plugins with RunUAT BuildPlugin.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser("migrate", help="Package one plugin headlessly")
+    migrate.add_argument("--plugin", required=True, help="Path to the .uplugin file")
+    migrate.add_argument(
+        "--engine",
+        required=True,
+        help="Unreal Engine root folder or an installed version such as 5.3",
+    )
+    migrate.add_argument(
+        "--out",
+        required=True,
+        help="Destination folder (the package goes to <out>/Migrated)",
+    )
+    migrate.add_argument(
+        "--startup-budget-ms",
+        type=float,
+        default=STARTUP_BUDGET_MS,
+        help="Warn when startup exceeds this many milliseconds",
+    )
+    add_cache_arguments(migrate)
+    add_preflight_argument(migrate)
+    add_api_scan_arguments(migrate)
+    add_split_argument(migrate)
+    add_fail_fast_argument(migrate)
+    add_history_argument(migrate)
+    add_resources_argument(migrate)
+    add_budget_arguments(migrate)
+    add_incremental_argument(migrate)
+    add_staging_arguments(migrate)
+    add_watch_arguments(migrate)
+    add_deploy_argument(migrate)
+    add_archive_arguments(migrate)
+    add_worker_argument(migrate)
+
+    batch = commands.add_parser(
+        "batch", help="Package several plugins against several engines"
+    )
+    batch.add_argument(
+        "--plugin",
+        action="append",
+        required=True,
+        help="Path to a .uplugin file (repeat for more plugins)",
+    )
+    batch.add_argument(
+        "--engine",
+        action="append",
+        required=True,
+        help="Unreal Engine root folder or version (repeat for more engines)",
+    )
+    batch.add_argument(
+        "--out",
+        required=True,
+        help="Destination folder (packages go to <out>/Migrated/<Plugin>/<Version>)",
+    )
+    batch.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Maximum concurrent UAT runs (default {DEFAULT_CONCURRENCY})",
+    )
+    add_cache_arguments(batch)
+    add_preflight_argument(batch)
+    add_api_scan_arguments(batch)
+    add_split_argument(batch)
+    add_fail_fast_argument(batch)
+    add_history_argument(batch)
+    add_resources_argument(batch)
+    add_budget_arguments(batch)
+    add_incremental_argument(batch)
+    add_staging_arguments(batch)
+    add_archive_arguments(batch)
+    add_worker_argument(batch)
+
+    engines = commands.add_parser("engines", help="List discovered engine installs")
+    engines.add_argument(
+        "--search-root",
+        action="append",
+        default=[],
+        help="Also look for engines in this folder and remember it",
+    )
+
+    history = commands.add_parser("history", help="Show previous migrations")
+    history.add_argument("--plugin", help="Only runs of this plugin (name)")
+    history.add_argument("--engine", help="Only runs on this engine version")
+    history.add_argument("--limit", type=int, default=20, help="Runs to show")
+    history.add_argument(
+        "--summary",
+        action="store_true",
+        help="Show per plugin/engine averages instead of single runs",
+    )
+
+    agent = commands.add_parser(
+        "agent", help="Run builds for other machines as a remote build worker"
+    )
+    agent.add_argument(
+        "--engine",
+        action="append",
+        required=True,
+        help="Unreal Engine root folder or version to offer (repeat for more)",
+    )
+    agent.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address to listen on; use 0.0.0.0 to accept other machines "
+        "(no authentication, trusted networks only)",
+    )
+    agent.add_argument("--port", type=int, default=DEFAULT_AGENT_PORT)
+    agent.add_argument(
+        "--capacity",
+        type=int,
+        default=DEFAULT_AGENT_CAPACITY,
+        help=f"Concurrent builds (default {DEFAULT_AGENT_CAPACITY})",
+    )
+    agent.add_argument("--work-dir", help="Folder for uploads and build output")
+
+    deploy = commands.add_parser(
+        "deploy", help="Copy a migrated package into projects, changed files only"
+    )
+    deploy.add_argument(
+        "--package",
+        required=True,
+        help="Package folder holding the .uplugin, e.g. <out>/Migrated/<Plugin>/<Version>",
+    )
+    deploy.add_argument(
+        "--to",
+        action="append",
+        required=True,
+        metavar="PROJECT",
+        help="Project folder, .uproject or Plugins folder (repeat for more)",
+    )
+
+    commands.add_parser("gui", help="Open the graphical interface (default)")
+    return parser
+
+
+def error(message):
+    print(message, file=sys.stderr)
+
+
+def resolve_engines(specs, remote=False):
+    """Engine roots for folder or version arguments; None if any is unknown.
+
+    With `remote` unknown versions are kept as they are, for build workers
+    that have the engine.
+    """
+    index = None
+    roots = []
+    for spec in specs:
+        # Only pay for discovery when a version rather than a folder is given
+        if index is None and not Path(spec).is_dir():
+            index = EngineIndex()
+        root = resolve_engine_root(spec, index)
+        if root is None and remote:
+            root = spec
+        elif root is None:
+            error(f"✗ No Unreal Engine {spec} found (see the 'engines' command)")
+            return None
+        roots.append(root)
+    return roots
+
+
+def migrate(args, started_at):
+    workers = make_workers(args)
+    engine_roots = resolve_engines([args.engine], remote=workers is not None)
+    if engine_roots is None:
+        return 2
+    job = MigrationJob(
+        uplugin_path=args.plugin,
+        destination_path=args.out,
+        ue_root_path=engine_roots[0],
+        split_platforms=args.split_platforms,
+        incremental=args.incremental,
+        stage_source=args.stage_source,
+        stage_root=args.stage_root,
+    )
+
+    if workers is None and not job.uat_path.exists():
+        error(f"✗ {UAT_SCRIPT_NAME} not found at: {job.uat_path}")
+        return 2
+
+    startup_ms = (time.perf_counter() - started_at) * 1000
+    print(f"Startup: {startup_ms:.0f} ms")
+    if startup_ms > args.startup_budget_ms:
+        error(
+            f"⚠ Startup took {startup_ms:.0f} ms "
+            f"(budget {args.startup_budget_ms:.0f} ms)"
+        )
+
+    budget = None
+    if workers is None:
+        budget = make_budget(args, len(args.split_platforms))
+        if budget is not None:
+            print(budget.describe())
+    cache = make_cache(args)
+    history = make_history(args)
+
+    def build():
+        return migrate_once(args, job, cache, history, workers, budget)
+
+    if args.watch:
+        print("Press Ctrl+C to stop watching")
+        try:
+            asyncio.run(watch_plugin(job, build, debounce=args.debounce))
+        except KeyboardInterrupt:
+            print("Stopped watching")
+        return 0
+    try:
+        return asyncio.run(build())
+    except KeyboardInterrupt:
+        return 130
+
+
+async def migrate_once(args, job, cache, history, workers, budget):
+    """One `migrate` run with its own build log; returns the exit code"""
+    parser = UatOutputParser()
+    build_log = BuildLog.create(job)
+    print(f"Build log: {build_log.path}")
+    monitor = None
+    if not args.no_resource_sampling and sampling_available():
+        monitor = ResourceMonitor(resources_path(build_log.path))
+        print(f"Resource samples: {monitor.csv_path}")
+    try:
+        success, message = await run_migration(
+            job,
+            cache=cache,
+            parser=parser,
+            build_log=build_log,
+            preflight=not args.skip_preflight,
+            history=history,
+            api_scan=not args.skip_api_scan,
+            abort_on_api_errors=args.abort_on_api_errors,
+            workers=workers,
+            monitor=monitor,
+            budget=budget,
+            fail_fast=args.fail_fast,
+        )
+    except asyncio.CancelledError:
+        # run_migration stopped the build and removed its partial output
+        error(f"✗ Migration cancelled. Log: {build_log.path}")
+        raise
+    finally:
+        build_log.close()
+        if monitor is not None:
+            monitor.close()
+    if success:
+        print(f"✓ SUCCESS: Plugin migrated successfully! ({parser.summary()})")
+        if args.archive:
+            try:
+                report = await asyncio.to_thread(
+                    archive_package,
+                    job.package_dir,
+                    job_archive_path(job),
+                    top=job.plugin_name,
+                    keep_debug=args.archive_keep_debug,
+                )
+            except OSError as ex:
+                error(f"✗ Could not create the archive: {ex}")
+                return 1
+            print(describe_archive(report))
+        if args.deploy:
+            reports = await deploy_package(
+                job.package_dir, args.deploy, plugin_name=job.plugin_name
+            )
+            if len(reports) < len(args.deploy):
+                return 1
+        return 0
+    error(f"✗ ERROR: Migration failed! ({parser.summary()})")
+    first_error = build_log.first_error()
+    if first_error is not None:
+        error(f"First error (line {first_error + 1}): {build_log.line(first_error)}")
+    error(f"Last output:\n{message}")
+    error(f"Full log: {build_log.path}")
+    return 1
+
+
+def batch(args):
+    workers = make_workers(args)
+    engine_roots = resolve_engines(args.engine, remote=workers is not None)
+    if engine_roots is None:
+        return 2
+    budget = None
+    if workers is None:
+        # Split jobs start one BuildPlugin run per platform
+        budget = make_budget(args, args.jobs * max(1, len(args.split_platforms)))
+    queue = MigrationQueue(
+        concurrency=args.jobs,
+        on_change=lambda queued: print(f"[{queued.label}] {queued.status}"),
+        cache=make_cache(args),
+        preflight=not args.skip_preflight,
+        split_platforms=args.split_platforms,
+        history=make_history(args),
+        incremental=args.incremental,
+        stage_source=args.stage_source,
+        stage_root=args.stage_root,
+        api_scan=not args.skip_api_scan,
+        abort_on_api_errors=args.abort_on_api_errors,
+        workers=workers,
+        sample_resources=not args.no_resource_sampling,
+        budget=budget,
+        fail_fast=args.fail_fast,
+    )
+    queue.add_matrix(args.plugin, engine_roots, args.out)
+    if workers is None:
+        print(f"Queued {len(queue.jobs)} job(s), running {queue.concurrency} at a time")
+        if budget is not None:
+            print(budget.describe())
+    else:
+        print(f"Queued {len(queue.jobs)} job(s) for {len(args.worker)} build worker(s)")
+
+    try:
+        asyncio.run(queue.run())
+    except KeyboardInterrupt:
+        print("\n" + queue.report())
+        error("✗ Batch cancelled")
+        return 130
+    print("\n" + queue.report())
+    succeeded = [queued for queued in queue.jobs if queued.status == SUCCEEDED]
+    if args.archive and succeeded:
+        try:
+            report = archive_package(
+                Path(args.out) / "Migrated",
+                Path(args.out) / "Migrated.tar.gz",
+                keep_debug=args.archive_keep_debug,
+                include=[queued.job.package_subdir for queued in succeeded],
+            )
+        except OSError as ex:
+            error(f"✗ Could not create the archive: {ex}")
+            return 1
+        print(describe_archive(report))
+    return 1 if any(queued.status == FAILED for queued in queue.jobs) else 0
+
+
+def deploy(args):
+    reports = asyncio.run(deploy_package(args.package, args.to))
+    return 0 if len(reports) == len(args.to) else 1
+
+
+def run_agent(args):
+    engine_roots = resolve_engines(args.engine)
+    if engine_roots is None:
+        return 2
+    agent = BuildAgent(engine_roots, args.capacity, args.work_dir)
+    print(
+        f"Build agent listening on {args.host}:{args.port} with "
+        f"UE {', '.join(sorted(agent.engines))} ({agent.capacity} slot(s))"
+    )
+    try:
+        asyncio.run(agent.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def list_engines(args):
+    index = EngineIndex(extra_roots=args.search_root)
+    engines = index.discover()
+    if not engines:
+        print("No Unreal Engine installs found.")
+        return 1
+    for engine in engines:
+        print(f"{engine.label:<12} {engine.root}")
+    return 0
+
+
+def show_history(args):
+    history = BuildHistory()
+    if args.summary:
+        rows = history.summary(args.plugin)
+        for row in rows:
+            average = format_duration(row["average"]) if row["average"] else "-"
+            print(
+                f"{row['plugin']} @ UE {row['engine_version']:<8} "
+                f"{row['succeeded']}/{row['runs']} succeeded, average {average}"
+            )
+    else:
+        rows = history.recent(args.limit, args.plugin, args.engine)
+        for row in reversed(rows):
+            print(describe_run(row))
+    if not rows:
+        print("No migrations recorded yet.")
+    return 0
+
+
+def main(argv=None, started_at=None):
+    if started_at is None:
+        started_at = time.perf_counter()
+    args = build_parser().parse_args(argv)
+    if args.command == "migrate":
+        return migrate(args, started_at)
+    if args.command == "batch":
+        return batch(args)
+    if args.command == "engines":
+        return list_engines(args)
+    if args.command == "history":
+        return show_history(args)
+    if args.command == "agent":
+        return run_agent(args)
+    if args.command == "deploy":
+        return deploy(args)
+    return 0
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+
+# Console limits: lines kept on screen and UI refreshes per second
+CONSOLE_MAX_LINES = 5000
+CONSOLE_MAX_UPDATES_PER_SEC = 10
+
+
+class ConsoleBuffer:
+    """Bounded ring buffer of console lines, flushed to the UI at a capped rate.
+
+    Lines are collected with `write()` and handed to `on_flush` in batches by
+    the `run()` task, so a burst of output costs one UI update per frame
+    instead of one per line.
+    """
+
+    def __init__(
+        self,
+        on_flush,
+        max_lines=CONSOLE_MAX_LINES,
+        max_updates_per_sec=CONSOLE_MAX_UPDATES_PER_SEC,
+    ):
+        self.on_flush = on_flush
+        self.max_lines = max_lines
+        self.interval = 1.0 / max_updates_per_sec
+        self.lines = deque(maxlen=max_lines)
+        self.pending = []
+        self.running = False
+
+    def write(self, message):
+        for line in str(message).split("\n"):
+            self.lines.append(line)
+            self.pending.append(line)
+        # Nothing older than max_lines can ever reach the screen
+        if len(self.pending) > self.max_lines:
+            del self.pending[: -self.max_lines]
+
+    async def drain(self):
+        """Wait while more lines are pending than the UI can show.
+
+        Producers that await this after each batch are slowed down to the
+        flush rate instead of having their oldest lines dropped.
+        """
+        while self.running and len(self.pending) >= self.max_lines:
+            await asyncio.sleep(self.interval / 2)
+
+    def flush(self):
+        if not self.pending:
+            return
+        batch = self.pending
+        self.pending = []
+        self.on_flush(batch)
+
+    async def run(self):
+        """Flush pending lines at most `max_updates_per_sec` times a second"""
+        self.running = True
+        try:
+            while self.running:
+                await asyncio.sleep(self.interval)
+                self.flush()
+        finally:
+            self.running = False
+
+    def stop(self):
+        self.running = False
+        self.flush()
@@ -0,0 +1,742 @@
+"""UI-free migration core: input validation, UAT command building and streaming.
+
+Nothing in here may import Flet - the CLI path relies on that to start fast.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import platform
+import re
+import shutil
+import signal
+import sqlite3
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from .streams import display_line, read_lines
+from .uat_output import ERROR, UatOutputParser
+
+# Detect platform
+IS_WINDOWS = platform.system() == "Windows"
+IS_MACOS = platform.system() == "Darwin"
+UAT_SCRIPT_NAME = "RunUAT.bat" if IS_WINDOWS else "RunUAT.sh"
+# UAT name of the platform the editor binaries are built for
+HOST_PLATFORM = "Win64" if IS_WINDOWS else "Mac" if IS_MACOS else "Linux"
+
+APP_DIR_NAME = "UnrealPluginMigrationTool"
+
+# Output lines kept in memory for the failure message; the rest is in the log
+FAILURE_TAIL_LINES = 40
+# Seconds a cancelled build gets to exit before its processes are killed
+TERMINATE_GRACE_SECONDS = 3.0
+# Start builds in their own process group so the whole tree can be stopped
+PROCESS_GROUP_OPTIONS = (
+    {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    if IS_WINDOWS
+    else {"start_new_session": True}
+)
+
+
+def user_cache_dir():
+    """Per-user folder for caches and indexes that can be rebuilt at any time"""
+    if IS_WINDOWS:
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif IS_MACOS:
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / APP_DIR_NAME
+
+
+def uat_script_path(ue_root_path):
+    return Path(ue_root_path) / "Engine" / "Build" / "BatchFiles" / UAT_SCRIPT_NAME
+
+
+def write_json_atomic(path, data):
+    """Write JSON through a temporary file so readers never see half a file"""
+    tmp_path = Path(f"{path}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def parse_platforms(text):
+    """Platform list from user input, e.g. "Win64, Android" or "Win64+Linux" """
+    return [name for name in re.split(r"[\s,+]+", text or "") if name]
+
+
+def format_size(num_bytes):
+    """Human readable byte count, e.g. 1.5 GB"""
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            break
+        size /= 1024
+    return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+
+
+def format_duration(seconds):
+    """Compact duration, e.g. 45s, 3m 05s or 1h 02m"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+def read_engine_version(ue_root_path):
+    """Engine version from Engine/Build/Build.version, e.g. "5.3".
+
+    Falls back to the root folder name (UE_5.3 -> 5.3) when the file is
+    missing or unreadable.
+    """
+    version_file = Path(ue_root_path) / "Engine" / "Build" / "Build.version"
+    try:
+        data = json.loads(version_file.read_text(encoding="utf-8-sig"))
+        return f"{data['MajorVersion']}.{data['MinorVersion']}"
+    except (OSError, ValueError, KeyError):
+        name = Path(ue_root_path).name
+        return name[3:] if name.upper().startswith("UE_") else name
+
+
+@dataclass
+class MigrationJob:
+    """One BuildPlugin run: a .uplugin packaged against one engine root"""
+
+    uplugin_path: str = ""
+    destination_path: str = ""
+    ue_root_path: str = ""
+    # Optional folder under Migrated/, used to keep batch outputs apart
+    package_subdir: str = ""
+    # Additional BuildPlugin arguments, e.g. -TargetPlatforms=Win64
+    extra_args: list = field(default_factory=list)
+    # Build each of these target platforms in its own concurrent UAT run
+    split_platforms: list = field(default_factory=list)
+    # Build in a persistent workspace so UBT can reuse earlier object files
+    incremental: bool = False
+    # Build from a local mirror of the plugin source (see staging.py), kept
+    # under stage_root or the per-user cache folder
+    stage_source: bool = False
+    stage_root: str = ""
+
+    def missing_fields(self):
+        """Names of the required inputs that are still empty"""
+        missing_fields = []
+        if not self.uplugin_path:
+            missing_fields.append("Plugin file")
+        if not self.destination_path:
+            missing_fields.append("Destination folder")
+        if not self.ue_root_path:
+            missing_fields.append("UE root folder")
+        return missing_fields
+
+    @property
+    def uat_path(self):
+        return uat_script_path(self.ue_root_path)
+
+    @property
+    def plugin_name(self):
+        return Path(self.uplugin_path).stem
+
+    @property
+    def plugin_dir(self):
+        return Path(self.uplugin_path).parent
+
+    @property
+    def package_dir(self):
+        return Path(self.destination_path) / "Migrated" / self.package_subdir
+
+    @property
+    def staging_dir(self):
+        """Scratch folder for split builds, outside Migrated"""
+        return (
+            Path(self.destination_path)
+            / ".staging"
+            / (self.package_subdir or self.plugin_name)
+        )
+
+    def platform_job(self, target_platform, build_host):
+        """Job building only `target_platform` into its own staging package"""
+        extra_args = [
+            arg
+            for arg in self.extra_args
+            if not arg.lower().startswith(("-targetplatforms=", "-nohostplatform"))
+        ]
+        extra_args.append(f"-TargetPlatforms={target_platform}")
+        if not build_host:
+            extra_args.append("-NoHostPlatform")
+        return replace(
+            self,
+            destination_path=str(self.staging_dir),
+            package_subdir=target_platform,
+            extra_args=extra_args,
+            split_platforms=[],
+        )
+
+    def command(self):
+        """BuildPlugin command as an argument list (no shell quoting needed)"""
+        return [
+            str(self.uat_path),
+            "BuildPlugin",
+            f"-plugin={self.uplugin_path}",
+            f"-package={self.package_dir}",
+            *self.extra_args,
+        ]
+
+
+def limit_parallel_actions(command, actions):
+    """BuildPlugin `command` with UBT running at most `actions` actions at once"""
+    limit = f"-MaxParallelActions={actions}"
+    for index, arg in enumerate(command):
+        if arg.lower().startswith("-ubtargs="):
+            return [*command[:index], f"{arg} {limit}", *command[index + 1 :]]
+    return [*command, f"-ubtargs={limit}"]
+
+
+def format_cores(cores):
+    """Core ids as compact ranges, e.g. `0-3,8`"""
+    ranges = []
+    for core in sorted(cores):
+        if ranges and ranges[-1][1] == core - 1:
+            ranges[-1][1] = core
+        else:
+            ranges.append([core, core])
+    return ",".join(
+        str(first) if first == last else f"{first}-{last}" for first, last in ranges
+    )
+
+
+def format_command(command):
+    return f'"{command[0]}" ' + " ".join(command[1:])
+
+
+async def run_uat_command(
+    job,
+    log=print,
+    parser=None,
+    build_log=None,
+    drain=None,
+    monitor=None,
+    budget=None,
+    fail_fast=False,
+    on_launch=None,
+):
+    """Run BuildPlugin for `job`, streaming every output line to `log`.
+
+    See `run_command` for how output is handled and for `fail_fast`. With
+    `budget` (a `CoreBudget`) the run waits for an allotment of cores and
+    memory, is confined to those cores and UBT (UE5) runs no more actions
+    than it has cores. Returns `(success, message)`
+    where message is the tail of the output (or the failure reason).
+    """
+    job.package_dir.mkdir(parents=True, exist_ok=True)
+    kwargs = {
+        "log": log,
+        "parser": parser,
+        "build_log": build_log,
+        "drain": drain,
+        "monitor": monitor,
+        "fail_fast": fail_fast,
+        "on_launch": on_launch,
+    }
+    if budget is None:
+        return await run_command(job.command(), **kwargs)
+    async with budget.allot(log) as allotment:
+        command = job.command()
+        if not read_engine_version(job.ue_root_path).startswith("4."):
+            command = limit_parallel_actions(command, len(allotment.cores))
+        return await run_command(command, cores=allotment.cores, **kwargs)
+
+
+def record_output(lines, log=print, parser=None, build_log=None, tail_lines=None):
+    """Feed output lines to `parser`, `build_log`, `tail_lines` and `log`"""
+    for line in lines:
+        if not line:
+            continue
+        event = parser.feed(line) if parser is not None else None
+        if build_log is not None:
+            build_log.write(line, is_error=event is not None and event.kind == ERROR)
+        shown_line = display_line(line)
+        if tail_lines is not None:
+            tail_lines.append(shown_line)
+        log(shown_line)
+
+
+async def terminate_process_tree(process):
+    """Stop `process` and every process it started (UBT, compilers, linkers).
+
+    The tree is asked to exit first and killed when it has not after
+    `TERMINATE_GRACE_SECONDS`.
+    """
+    if process.returncode is not None:
+        return
+    try:
+        if IS_WINDOWS:
+            # taskkill /T follows the parent links down the whole tree
+            await asyncio.to_thread(
+                subprocess.run,
+                ["taskkill", "/T", "/F", "/PID", str(process.pid)],
+                capture_output=True,
+            )
+        else:
+            # The process leads its own session, see run_command
+            os.killpg(process.pid, signal.SIGTERM)
+            try:
+                await asyncio.wait_for(process.wait(), TERMINATE_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        # Already gone
+        pass
+    await process.wait()
+
+
+async def run_command(
+    command,
+    log=print,
+    parser=None,
+    build_log=None,
+    drain=None,
+    monitor=None,
+    cores=None,
+    fail_fast=False,
+    on_launch=None,
+):
+    """Run a UAT/UBT command, streaming every output line to `log`.
+
+    Each line is also fed to `parser` (a `UatOutputParser`) and appended to
+    `build_log` (a `BuildLog`) when given. Very long lines are shortened for
+    `log` but kept whole in the build log. `drain()` is awaited after every
+    chunk so a slow consumer can hold back reading (and thus the tool). Only
+    the last few lines are kept in memory. The process tree is sampled by
+    `monitor` (a `ResourceMonitor`) while it runs and confined to the core
+    ids in `cores` when given. `on_launch()` is called right before the
+    process starts, i.e. once the build may begin writing its output.
+
+    The command runs in its own process group. With `fail_fast` the whole
+    tree is stopped as soon as the parser reports an error, and it is always
+    stopped when the caller is cancelled.
+    """
+    # Log the command for user visibility
+    log(f"\nExecuting command:")
+    log(f"{format_command(command)}\n")
+    if build_log is not None:
+        build_log.write(format_command(command))
+    if fail_fast and parser is None:
+        parser = UatOutputParser()
+
+    process = None
+    try:
+        if on_launch is not None:
+            on_launch()
+        # Use create_subprocess_exec with argument list for proper escaping
+        # This avoids shell interpretation issues with spaces in paths
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            **PROCESS_GROUP_OPTIONS,
+        )
+        if monitor is not None:
+            monitor.attach(process.pid)
+        if cores is not None:
+            # Imported here because the budget builds on this module
+            from .budget import affinity_supported, pin_process
+
+            if pin_process(process.pid, cores):
+                log(f"Confined to {len(cores)} core(s): {format_cores(cores)}")
+            elif affinity_supported():
+                log(
+                    f"⚠ Could not confine the build to core(s) {format_cores(cores)}; "
+                    f"it may compete with other builds for CPU"
+                )
+
+        # Read output in large chunks in real-time
+        tail_lines = deque(maxlen=FAILURE_TAIL_LINES)
+        errors_before = parser.errors if parser is not None else 0
+        async for lines in read_lines(process.stdout):
+            record_output(lines, log, parser, build_log, tail_lines)
+            if fail_fast and parser.errors > errors_before:
+                message = "✗ Fail-fast: stopping the build at the first error"
+                log(message)
+                if build_log is not None:
+                    build_log.write(message, is_error=True)
+                await terminate_process_tree(process)
+                return False, "\n".join(tail_lines)
+
+            if drain is not None:
+                await drain()
+            else:
+                # Let other tasks (UI flushes, parallel jobs) run between chunks
+                await asyncio.sleep(0)
+
+        # Wait for process to complete
+        await process.wait()
+
+        tail_output = "\n".join(tail_lines)
+
+        if process.returncode == 0:
+            return True, tail_output
+        else:
+            return (
+                False,
+                tail_output or f"Process exited with code {process.returncode}",
+            )
+
+    except Exception as ex:
+        error_msg = f"Exception occurred: {str(ex)}"
+        log(error_msg)
+        if build_log is not None:
+            build_log.write(error_msg, is_error=True)
+        return False, error_msg
+
+    finally:
+        if process is not None:
+            # Cancelled, or the output consumer failed: leave nothing behind
+            await terminate_process_tree(process)
+            if monitor is not None:
+                monitor.detach(process.pid)
+
+
+def merge_packages(package_dirs, target_dir):
+    """Move the files of several packages into `target_dir`.
+
+    Earlier packages win: a file that already exists is left alone, and
+    counted as a conflict when the sizes differ. Returns `(files, conflicts)`.
+    """
+    shutil.rmtree(target_dir, ignore_errors=True)
+    files = conflicts = 0
+    for package_dir in package_dirs:
+        for dirpath, _, filenames in os.walk(package_dir):
+            target = Path(target_dir) / Path(dirpath).relative_to(package_dir)
+            target.mkdir(parents=True, exist_ok=True)
+            for name in filenames:
+                source = Path(dirpath) / name
+                if (target / name).exists():
+                    if (target / name).stat().st_size != source.stat().st_size:
+                        conflicts += 1
+                    continue
+                os.replace(source, target / name)
+                files += 1
+    return files, conflicts
+
+
+def clean_partial_output(job):
+    """Remove what a stopped build left in Migrated and the staging folder"""
+    destination = Path(job.destination_path)
+    for folder in (job.package_dir, job.staging_dir):
+        shutil.rmtree(folder, ignore_errors=True)
+        # Drop emptied parents up to (not including) the destination folder
+        for parent in folder.parents:
+            if parent == destination or destination not in parent.parents:
+                break
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+
+
+async def run_split_build(
+    job,
+    log=print,
+    parser=None,
+    build_log=None,
+    drain=None,
+    monitor=None,
+    budget=None,
+    fail_fast=False,
+    on_launch=None,
+):
+    """Run BuildPlugin once per platform in `job.split_platforms`, concurrently.
+
+    Only one run builds the host editor binaries (the host platform's run if
+    it is in the list); the others pass `-NoHostPlatform`. Every run packages
+    into its own staging folder and the packages are merged into
+    `job.package_dir` once all of them succeeded. Output lines are prefixed
+    with the platform name and per-platform timings are logged at the end.
+    With `fail_fast` the first failed run stops the others.
+    """
+    platforms = list(dict.fromkeys(job.split_platforms))
+    host = HOST_PLATFORM if HOST_PLATFORM in platforms else platforms[0]
+    platforms.remove(host)
+    platforms.insert(0, host)
+    jobs = [job.platform_job(name, build_host=name == host) for name in platforms]
+    await asyncio.to_thread(shutil.rmtree, job.staging_dir, True)
+    log(f"Splitting BuildPlugin into {len(jobs)} runs: {', '.join(platforms)}")
+
+    timings = {}
+    tasks = []
+    stopping = False
+
+    async def run_platform(platform_job):
+        nonlocal stopping
+        name = platform_job.package_subdir
+        prefix = f"[{name}] "
+
+        def platform_log(message):
+            log("\n".join(prefix + line for line in message.split("\n")))
+
+        started = time.monotonic()
+        try:
+            result = await run_uat_command(
+                platform_job,
+                log=platform_log,
+                parser=parser,
+                build_log=build_log,
+                drain=drain,
+                monitor=monitor,
+                budget=budget,
+                fail_fast=fail_fast,
+                on_launch=on_launch,
+            )
+        except asyncio.CancelledError:
+            if not stopping:
+                raise
+            platform_log("Stopped because another platform failed")
+            return False, "Stopped because another platform failed"
+        finally:
+            timings[name] = time.monotonic() - started
+        if fail_fast and not result[0] and not stopping:
+            stopping = True
+            for task in tasks:
+                if task is not asyncio.current_task():
+                    task.cancel()
+        return result
+
+    tasks.extend(asyncio.ensure_future(run_platform(item)) for item in jobs)
+    results = await asyncio.gather(*tasks)
+
+    log("\nPer-platform timings:")
+    for name, (success, _) in zip(platforms, results):
+        log(f"  {'✓' if success else '✗'} {name:<12} {timings[name]:7.1f}s")
+    if build_log is not None:
+        build_log.write(
+            "Per-platform timings: "
+            + ", ".join(f"{name} {timings[name]:.1f}s" for name in platforms)
+        )
+
+    failed = [
+        (name, message)
+        for name, (success, message) in zip(platforms, results)
+        if not success
+    ]
+    if failed:
+        if not fail_fast:
+            log(f"Staged packages kept for inspection in {job.staging_dir}")
+        return False, "\n\n".join(f"[{name}] {message}" for name, message in failed)
+
+    started = time.monotonic()
+    files, conflicts = await asyncio.to_thread(
+        merge_packages, [item.package_dir for item in jobs], job.package_dir
+    )
+    await asyncio.to_thread(shutil.rmtree, job.staging_dir, True)
+    try:
+        # Drop the emptied .staging folders; stops at the first non-empty one
+        os.removedirs(job.staging_dir.parent)
+    except OSError:
+        pass
+    log(
+        f"Merged {len(jobs)} platform packages into {job.package_dir} "
+        f"({files} files in {time.monotonic() - started:.1f}s)"
+    )
+    if conflicts:
+        log(f"⚠ {conflicts} file(s) differed between platforms; kept the {host} copy")
+    return True, "\n".join(f"{name}: {timings[name]:.1f}s" for name in platforms)
+
+
+async def check_sources(
+    job, log, build_log, preflight, api_scan, abort_on_api_errors, workers
+):
+    """Pre-flight check and API scan of `run_migration`.
+
+    Returns `(False, message)` when the build should not start, else None.
+    """
+    if preflight and workers is not None and not job.uat_path.exists():
+        log("Pre-flight check skipped: the engine is only available on the workers")
+        preflight = False
+    if preflight:
+        # Imported here because preflight itself builds on this module
+        from .preflight import check_plugin
+
+        report = await asyncio.to_thread(check_plugin, job)
+        for warning in report.warnings:
+            log(f"Pre-flight warning: {warning}")
+        if not report.ok:
+            for problem in report.errors:
+                log(f"Pre-flight error: {problem}")
+                if build_log is not None:
+                    build_log.write(f"Pre-flight error: {problem}", is_error=True)
+            return False, "Pre-flight check failed:\n" + "\n".join(report.errors)
+        log(f"Pre-flight check passed ({report.seconds * 1000:.0f} ms)")
+
+    if api_scan:
+        from .api_scan import scan_plugin
+
+        scan = await asyncio.to_thread(scan_plugin, job)
+        for finding in scan.findings:
+            log(str(finding))
+            if build_log is not None and finding in scan.errors:
+                build_log.write(str(finding), is_error=True)
+        log(scan.summary())
+        if abort_on_api_errors and scan.errors:
+            return False, "API scan found removed APIs:\n" + "\n".join(
+                str(finding) for finding in scan.errors
+            )
+    return None
+
+
+async def run_migration(
+    job,
+    log=print,
+    cache=None,
+    parser=None,
+    build_log=None,
+    drain=None,
+    preflight=True,
+    history=None,
+    api_scan=True,
+    abort_on_api_errors=False,
+    workers=None,
+    monitor=None,
+    budget=None,
+    fail_fast=False,
+):
+    """Package `job`, restoring it from `cache` instead of running UAT on a hit.
+
+    With `preflight` the .uplugin is first checked against the engine's
+    plugin catalog and the run fails fast on problems BuildPlugin would only
+    report minutes later. With `api_scan` the plugin sources are scanned for
+    APIs the engine deprecated or removed; findings are logged as
+    file:line, and with `abort_on_api_errors` removed APIs end the run
+    before UAT starts. With `job.stage_source` BuildPlugin reads a local
+    mirror of the plugin instead of its folder. The build's processes are
+    sampled by `monitor` (a `ResourceMonitor`) when given, and run within an
+    allotment of `budget` (a `CoreBudget`). With `workers` (a `WorkerPool`)
+    the build itself runs on a remote agent, and the engine only has to
+    exist there. With `fail_fast` the build is stopped at its first error.
+    A failed fail-fast run or a cancelled one leaves no partial package
+    behind; one stopped before its build launched keeps the previous one.
+    Finished runs, including those stopped by the pre-flight check or API
+    scan, are recorded in `history` (a `BuildHistory`) when given. This is
+    the entry point the GUI, CLI and queue use; `run_uat_command` is the
+    uncached building block, `run_split_build` its per-platform fan-out and
+    `run_incremental_build` the workspace-based alternative.
+    """
+    if workers is not None:
+        runner = workers.run
+    elif job.incremental:
+        from .incremental import run_incremental_build
+
+        runner = run_incremental_build
+    elif job.split_platforms:
+        runner = run_split_build
+    else:
+        runner = run_uat_command
+    ran_uat = False
+    launched = False
+
+    def on_launch():
+        nonlocal launched
+        launched = True
+
+    async def build(job, **kwargs):
+        nonlocal ran_uat
+        ran_uat = True
+        # Workers upload the source and workspaces keep their own copy
+        if job.stage_source and workers is None and not job.incremental:
+            from .staging import stage_plugin_source
+
+            async with stage_plugin_source(job, kwargs["log"]) as staged:
+                return await runner(staged, **kwargs)
+        return await runner(job, **kwargs)
+
+    engine_version = read_engine_version(job.ue_root_path)
+    mode = None
+    if history is not None:
+        from .history import build_mode
+
+        mode = build_mode(job, remote=workers is not None)
+    if history is not None and parser is None:
+        # Phase durations and counts come from the parser
+        parser = UatOutputParser()
+    kwargs = {
+        "parser": parser,
+        "build_log": build_log,
+        "drain": drain,
+        "monitor": monitor,
+        "budget": budget,
+        "fail_fast": fail_fast,
+        "on_launch": on_launch,
+    }
+    started_at = time.time()
+    started = time.monotonic()
+    try:
+        failure = await check_sources(
+            job, log, build_log, preflight, api_scan, abort_on_api_errors, workers
+        )
+        if failure is not None:
+            # Recorded as a failed run below
+            success, message = failure
+        else:
+            if history is not None:
+                estimate = history.estimate(job.plugin_name, engine_version, mode)
+                if estimate is not None:
+                    log(
+                        f"Previous builds of this plugin on UE {engine_version} "
+                        f"took ~{format_duration(estimate)}"
+                    )
+
+            started_at = time.time()
+            started = time.monotonic()
+            if cache is None:
+                success, message = await build(job, log=log, **kwargs)
+            else:
+                success, message = await cache.run(job, build, log=log, **kwargs)
+    except asyncio.CancelledError:
+        log("✗ Migration cancelled")
+        if build_log is not None:
+            build_log.write("Migration cancelled", is_error=True)
+        if launched:
+            await asyncio.to_thread(clean_partial_output, job)
+        raise
+    except Exception as ex:
+        # Staging, the cache, merging or the remote link failed outside UAT
+        success, message = False, f"Exception occurred: {ex}"
+        log(f"✗ {message}")
+        if build_log is not None:
+            build_log.write(message, is_error=True)
+    if not success and fail_fast and launched:
+        await asyncio.to_thread(clean_partial_output, job)
+        log(f"Removed the partial output in {job.package_dir}")
+    resources = monitor.summary() if monitor is not None else None
+    if resources:
+        log(resources)
+        if build_log is not None:
+            build_log.write(resources)
+
+    if history is not None:
+        try:
+            history.record(
+                job,
+                engine_version,
+                started_at,
+                time.monotonic() - started,
+                success,
+                # A cache hit; runs that never got to build count as failed
+                cached=success and not ran_uat,
+                parser=parser,
+                log_path=build_log.path if build_log is not None else None,
+                mode=mode,
+            )
+        except sqlite3.Error as ex:
+            log(f"⚠ Could not record the run in the build history: {ex}")
+    return success, message
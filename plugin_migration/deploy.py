@@ -0,0 +1,247 @@
+"""Delta deployment of a migrated plugin into consumer projects.
+
+`deploy_package()` copies a package from `Migrated` into the `Plugins`
+folder of one or more game projects without rewriting what is already
+there:
+
+- The package is hashed once (BLAKE2, remembered by size and mtime) and
+  compared with each target. A manifest in the deployed plugin folder
+  records the size, mtime and hash of every file it wrote, so unchanged
+  targets are recognised from a stat; files without an entry are hashed
+  when their size matches.
+- Only changed files are copied, several at a time. Each one is written to
+  a temporary file next to its target and renamed over it, so an open
+  editor never loads a half-written DLL or .so. A file the editor has
+  locked (Windows) is reported and retried on the next deploy.
+- Files an earlier deploy wrote that are no longer in the package are
+  removed; files added in the project by hand are left alone.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .cache import FileHashIndex, hash_file, iter_files
+from .core import format_size, user_cache_dir, write_json_atomic
+from .packaging import is_shipped
+
+DEPLOY_FORMAT = 1
+DEPLOY_MANIFEST_NAME = ".plugin-deploy.json"
+# Copies in flight per target; disk bound, so a few are enough
+DEPLOY_WORKERS = 4
+
+
+def default_hash_index_path():
+    return user_cache_dir() / "deploy-hashes.json"
+
+
+def plugin_deploy_dir(target, plugin_name):
+    """Plugin folder inside a project folder, .uproject file or Plugins folder"""
+    target = Path(target)
+    if target.suffix.lower() == ".uproject":
+        return target.parent / "Plugins" / plugin_name
+    if target.name.lower() == "plugins":
+        return target / plugin_name
+    if any(target.glob("*.uproject")):
+        return target / "Plugins" / plugin_name
+    raise ValueError(f"{target} is not a project folder, .uproject or Plugins folder")
+
+
+def package_plugin_name(package_dir):
+    """Name of the plugin in a package folder (from its .uplugin)"""
+    for path in Path(package_dir).glob("*.uplugin"):
+        return path.stem
+    raise ValueError(f"No .uplugin in {package_dir}")
+
+
+def hash_package(package_dir, workers=None, index_path=None):
+    """`{relative path: (path, size, digest)}` of the files to deploy"""
+    package_dir = Path(package_dir)
+    index = FileHashIndex(index_path or default_hash_index_path())
+    paths = [
+        path
+        for path in iter_files(package_dir)
+        if is_shipped(path.relative_to(package_dir).parts, keep_debug=True)
+    ]
+    with ThreadPoolExecutor(workers or os.cpu_count() or 1) as pool:
+        digests = list(pool.map(index.digest, paths))
+    index.save()
+    return {
+        path.relative_to(package_dir).as_posix(): (path, path.stat().st_size, digest)
+        for path, digest in zip(paths, digests)
+    }
+
+
+@dataclass
+class DeployReport:
+    target_dir: Path
+    files: int = 0
+    copied: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    bytes_copied: int = 0
+    # Bytes of unchanged files that did not have to be written
+    bytes_saved: int = 0
+    # Files that could not be replaced, e.g. a DLL loaded by the editor
+    locked: list = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def load_manifest(target_dir):
+    try:
+        manifest = json.loads(
+            (target_dir / DEPLOY_MANIFEST_NAME).read_text(encoding="utf-8")
+        )
+        if manifest.get("format") == DEPLOY_FORMAT:
+            return manifest["files"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def replace_file(source, target):
+    """Copy source over target through a temporary file and a rename"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        shutil.copy2(source, temp)
+        os.replace(temp, target)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+
+
+def deploy_to(files, target_dir, workers=DEPLOY_WORKERS):
+    """Bring target_dir in line with `files` (see `hash_package`); returns a DeployReport"""
+    started = time.monotonic()
+    target_dir = Path(target_dir)
+    report = DeployReport(target_dir, files=len(files))
+    deployed = load_manifest(target_dir)
+    manifest = {}
+    changed = []
+    for relative, (source, size, digest) in files.items():
+        target = target_dir / relative
+        try:
+            stat = target.stat()
+        except FileNotFoundError:
+            changed.append(relative)
+            continue
+        entry = deployed.get(relative)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            current = entry[2]
+        elif stat.st_size == size:
+            # Not deployed by us, or touched since: compare the content
+            current = hash_file(target)
+        else:
+            current = None
+        if current == digest:
+            report.unchanged += 1
+            report.bytes_saved += size
+            manifest[relative] = [stat.st_size, stat.st_mtime_ns, digest]
+        else:
+            changed.append(relative)
+
+    def copy(relative):
+        source, size, digest = files[relative]
+        target = target_dir / relative
+        try:
+            replace_file(source, target)
+        except PermissionError:
+            return relative, None
+        stat = target.stat()
+        return relative, [stat.st_size, stat.st_mtime_ns, digest]
+
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        for relative, entry in pool.map(copy, changed):
+            if entry is None:
+                report.locked.append(relative)
+                continue
+            manifest[relative] = entry
+            report.copied += 1
+            report.bytes_copied += entry[0]
+
+    for relative in deployed.keys() - files.keys():
+        try:
+            (target_dir / relative).unlink()
+            report.removed += 1
+        except FileNotFoundError:
+            pass
+        except PermissionError:
+            report.locked.append(relative)
+            manifest[relative] = deployed[relative]
+            continue
+        # Drop folders the removal emptied, up to the plugin folder
+        for parent in (target_dir / relative).parents:
+            if parent == target_dir:
+                break
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+
+    target_dir.mkdir(parents=True, exist_ok=True)
+    write_json_atomic(
+        target_dir / DEPLOY_MANIFEST_NAME, {"format": DEPLOY_FORMAT, "files": manifest}
+    )
+    report.seconds = time.monotonic() - started
+    return report
+
+
+def describe_deploy(report):
+    line = (
+        f"Deployed to {report.target_dir} in {report.seconds:.1f}s: "
+        f"{report.copied} of {report.files} file(s) copied "
+        f"({format_size(report.bytes_copied)}), {report.unchanged} unchanged "
+        f"({format_size(report.bytes_saved)} not rewritten), "
+        f"{report.removed} removed"
+    )
+    if report.locked:
+        line += (
+            f"\n⚠ {len(report.locked)} file(s) in use, close the editor and "
+            f"deploy again: {', '.join(report.locked[:3])}"
+        )
+    return line
+
+
+async def deploy_package(
+    package_dir, targets, log=print, workers=None, plugin_name=None
+):
+    """Deploy the package in package_dir into every project in `targets`.
+
+    `plugin_name` defaults to the name of the .uplugin in the package.
+    Returns the DeployReports of the targets that could be deployed to.
+    """
+    try:
+        plugin_name = plugin_name or package_plugin_name(package_dir)
+        target_dirs = [plugin_deploy_dir(target, plugin_name) for target in targets]
+    except ValueError as ex:
+        log(f"✗ Deploy failed: {ex}")
+        return []
+    files = await asyncio.to_thread(hash_package, package_dir, workers)
+
+    async def deploy(target_dir):
+        try:
+            report = await asyncio.to_thread(deploy_to, files, target_dir)
+        except OSError as ex:
+            log(f"✗ Deploy to {target_dir} failed: {ex}")
+            return None
+        log(describe_deploy(report))
+        return report
+
+    reports = await asyncio.gather(*(deploy(target) for target in target_dirs))
+    reports = [report for report in reports if report is not None]
+    if len(reports) > 1:
+        log(
+            f"Deployed to {len(reports)} projects, "
+            f"{format_size(sum(report.bytes_saved for report in reports))} "
+            f"not rewritten"
+        )
+    return reports
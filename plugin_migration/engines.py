@@ -0,0 +1,249 @@
+"""Unreal Engine installation discovery with a persistent index.
+
+Standard install folders (plus user roots) are scanned for engines that
+have a RunUAT script, and each engine's Engine/Build/Build.version is parsed.
+Results are stored in `engines.json`; on the next launch a search root is
+only rescanned when its directory mtime changed, and an engine is only
+re-parsed when its Build.version mtime changed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .core import (
+    IS_MACOS,
+    IS_WINDOWS,
+    uat_script_path,
+    user_cache_dir,
+    write_json_atomic,
+)
+
+# Extra search roots, separated like PATH
+SEARCH_PATH_ENV = "UE_ENGINE_SEARCH_PATH"
+INDEX_FORMAT = 1
+
+
+def default_index_path():
+    return user_cache_dir() / "engines.json"
+
+
+def default_search_roots():
+    """Folders that usually contain UE_x.y installs on this platform"""
+    if IS_WINDOWS:
+        roots = [
+            Path(os.environ.get("ProgramFiles", r"C:\Program Files")) / "Epic Games",
+            Path(os.environ.get("ProgramFiles(x86)", r"C:\Program Files (x86)"))
+            / "Epic Games",
+        ]
+    elif IS_MACOS:
+        roots = [Path("/Users/Shared/Epic Games"), Path("/Applications")]
+    else:
+        # Only engine folders in /opt: scanning /opt itself would look into
+        # every package installed there
+        roots = [
+            *sorted(Path("/opt").glob("UnrealEngine*")),
+            *sorted(Path("/opt").glob("UE_*")),
+            Path.home() / "UnrealEngine",
+        ]
+
+    for extra in os.environ.get(SEARCH_PATH_ENV, "").split(os.pathsep):
+        if extra:
+            roots.append(Path(extra))
+    return roots
+
+
+def launcher_install_roots():
+    """Engine folders registered with the Epic Games Launcher (Windows)"""
+    if not IS_WINDOWS:
+        return []
+    program_data = os.environ.get("ProgramData", r"C:\ProgramData")
+    dat = Path(program_data) / "Epic" / "UnrealEngineLauncher" / "LauncherInstalled.dat"
+    try:
+        data = json.loads(dat.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    return [
+        Path(item["InstallLocation"])
+        for item in data.get("InstallationList", [])
+        if item.get("AppName", "").startswith("UE_") and item.get("InstallLocation")
+    ]
+
+
+@dataclass
+class EngineInstall:
+    root: str
+    version: str
+    full_version: str
+    changelist: int = 0
+    branch: str = ""
+    version_mtime_ns: int = 0
+
+    @property
+    def version_key(self):
+        return tuple(
+            int(part) for part in self.full_version.split(".") if part.isdigit()
+        )
+
+    @property
+    def label(self):
+        return f"UE {self.full_version}"
+
+
+def read_engine_install(root):
+    """EngineInstall for root, or None if it is not a usable engine"""
+    root = Path(root)
+    if not uat_script_path(root).exists():
+        return None
+    version_file = root / "Engine" / "Build" / "Build.version"
+    try:
+        mtime_ns = version_file.stat().st_mtime_ns
+        data = json.loads(version_file.read_text(encoding="utf-8-sig"))
+        major, minor = data["MajorVersion"], data["MinorVersion"]
+        patch = data.get("PatchVersion", 0)
+    except (OSError, ValueError, KeyError):
+        return None
+    return EngineInstall(
+        root=str(root),
+        version=f"{major}.{minor}",
+        full_version=f"{major}.{minor}.{patch}",
+        changelist=int(data.get("Changelist", 0) or 0),
+        branch=data.get("BranchName", ""),
+        version_mtime_ns=mtime_ns,
+    )
+
+
+def dir_mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class EngineIndex:
+    """Discovered engines, cached on disk between launches.
+
+    `user_roots` are remembered in the index so engines picked by hand are
+    offered again next time.
+    """
+
+    def __init__(self, path=None, extra_roots=()):
+        self.path = Path(path) if path else default_index_path()
+        self.lock = threading.Lock()
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("format") != INDEX_FORMAT:
+                raise ValueError("stale index format")
+        except (OSError, ValueError):
+            data = {}
+        self.user_roots = data.get("user_roots", [])
+        self.scanned = data.get("scanned", {})
+        for root in extra_roots:
+            self.add_user_root(root, save=False)
+        self.engines = []
+
+    def add_user_root(self, root, save=True):
+        root = str(Path(root))
+        if root not in self.user_roots:
+            self.user_roots.append(root)
+            if save:
+                self.save()
+
+    def search_roots(self):
+        roots = [str(root) for root in default_search_roots()]
+        roots += [str(root) for root in launcher_install_roots()]
+        roots += self.user_roots
+        return list(dict.fromkeys(roots))
+
+    def scan_root(self, root):
+        """Engines at root itself or one level below it"""
+        candidates = [Path(root)]
+        try:
+            candidates += sorted(
+                entry.path for entry in os.scandir(root) if entry.is_dir()
+            )
+        except OSError:
+            pass
+        engines = []
+        for candidate in candidates:
+            engine = read_engine_install(candidate)
+            if engine is not None:
+                engines.append(engine)
+        return engines
+
+    def refresh_root(self, root):
+        """Cached engines for root, rescanning only what changed on disk"""
+        mtime_ns = dir_mtime_ns(root)
+        if mtime_ns is None:
+            self.scanned.pop(root, None)
+            return []
+
+        cached = self.scanned.get(root)
+        if cached is None or cached["mtime_ns"] != mtime_ns:
+            engines = self.scan_root(root)
+        else:
+            engines = []
+            for item in cached["engines"]:
+                engine = EngineInstall(**item)
+                version_file = Path(engine.root) / "Engine" / "Build" / "Build.version"
+                if dir_mtime_ns(version_file) != engine.version_mtime_ns:
+                    engine = read_engine_install(engine.root)
+                if engine is not None:
+                    engines.append(engine)
+
+        self.scanned[root] = {
+            "mtime_ns": mtime_ns,
+            "engines": [asdict(engine) for engine in engines],
+        }
+        return engines
+
+    def discover(self):
+        """All known engines, newest version first"""
+        engines = {}
+        for root in self.search_roots():
+            for engine in self.refresh_root(root):
+                engines.setdefault(os.path.normcase(engine.root), engine)
+        self.engines = sorted(
+            engines.values(), key=lambda engine: engine.version_key, reverse=True
+        )
+        self.save()
+        return self.engines
+
+    def find(self, version):
+        """Newest engine matching a version like "5.3" or "5.3.2" """
+        engines = self.engines or self.discover()
+        for engine in engines:
+            if engine.full_version == version or engine.version == version:
+                return engine
+            if engine.full_version.startswith(version + "."):
+                return engine
+        return None
+
+    def save(self):
+        with self.lock:
+            data = {
+                "format": INDEX_FORMAT,
+                "user_roots": self.user_roots,
+                "scanned": self.scanned,
+            }
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                write_json_atomic(self.path, data)
+            except OSError:
+                # The index is only an accelerator
+                pass
+
+
+def resolve_engine_root(spec, index=None):
+    """Engine root for `spec`, which is either a folder or a version like "5.3".
+
+    Returns None when a version is given but no matching engine was found.
+    """
+    if Path(spec).is_dir():
+        return str(Path(spec))
+    engine = (index or EngineIndex()).find(spec)
+    return engine.root if engine else None
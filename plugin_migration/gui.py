@@ -0,0 +1,1521 @@
+from __future__ import annotations
+
+import flet as ft
+import asyncio
+import os
+import sqlite3
+import time
+from collections import deque
+from pathlib import Path
+
+from .batch import (
+    CANCELLED,
+    DEFAULT_CONCURRENCY,
+    FAILED,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    MigrationQueue,
+)
+from .budget import CoreBudget
+from .build_log import BuildLog
+from .cache import BuildCache
+from .console import ConsoleBuffer
+from .core import (
+    IS_MACOS,
+    IS_WINDOWS,
+    UAT_SCRIPT_NAME,
+    MigrationJob,
+    format_duration,
+    format_size,
+    parse_platforms,
+    read_engine_version,
+    run_migration,
+)
+from .deploy import deploy_package
+from .engines import EngineIndex
+from .history import BuildHistory, build_mode
+from .packaging import archive_package, describe_archive, job_archive_path
+from .remote import WorkerPool, parse_workers
+from .resources import (
+    ResourceMonitor,
+    resources_path,
+    sampling_available,
+    total_memory,
+)
+from .uat_output import ACTION, ERROR, PHASE, WARNING, UatOutputParser
+from .watch import watch_plugin
+
+# Lines materialised at once when browsing a spooled build log
+LOG_PAGE_LINES = 200
+# Latest runs listed in the build history dialog
+HISTORY_VIEW_RUNS = 50
+# Set to also echo the console to the terminal the GUI was started from
+ECHO_CONSOLE_ENV = "UE_MIGRATION_ECHO_CONSOLE"
+
+QUEUE_STATUS_ICONS = {
+    QUEUED: ft.Icons.SCHEDULE_ROUNDED,
+    RUNNING: ft.Icons.PLAY_CIRCLE_ROUNDED,
+    SUCCEEDED: ft.Icons.CHECK_CIRCLE_ROUNDED,
+    FAILED: ft.Icons.ERROR_ROUNDED,
+    CANCELLED: ft.Icons.CANCEL_ROUNDED,
+}
+QUEUE_STATUS_COLORS = {
+    QUEUED: ft.Colors.GREY_400,
+    RUNNING: ft.Colors.BLUE_400,
+    SUCCEEDED: ft.Colors.GREEN,
+    FAILED: ft.Colors.RED,
+    CANCELLED: ft.Colors.ORANGE_400,
+}
+
+
+class UnrealPluginMigrationApp:
+    def __init__(self, page: ft.Page):
+        self.page = page
+        self.page.title = "Unreal Plugin Migration Tool"
+        self.page.theme_mode = ft.ThemeMode.DARK
+        self.page.padding = 20
+
+        # Window sizing (Flet 0.80+ uses page.window)
+        if hasattr(self.page, "window") and self.page.window is not None:
+            self.page.window.width = 900
+            self.page.window.height = 750
+            self.page.window.resizable = True
+        else:
+            # Fallback for older Flet
+            self.page.window_width = 900
+            self.page.window_height = 750
+            self.page.window_resizable = True
+
+        # State variables
+        self.uplugin_path = ""
+        self.destination_path = ""
+        self.ue_root_path = ""
+        self.is_migrating = False
+        # The single migration in progress, cancelled by the Cancel button
+        self.migration_task = None
+        # Watch mode, rebuilding on every change of the plugin source
+        self.watch_task = None
+        self.build_cache = None
+        self.build_history = None
+        self.uat_parser = UatOutputParser()
+
+        # UI Components
+        self.setup_components()
+        self.build_ui()
+
+    def setup_components(self):
+        # File Pickers - Flet 0.80+ style (on_result is a property, not constructor arg)
+        # FilePickers are invisible controls - don't add them to the page
+        self.uplugin_picker = ft.FilePicker()
+        self.uplugin_picker.on_result = self.on_uplugin_result
+
+        self.destination_picker = ft.FilePicker()
+        self.destination_picker.on_result = self.on_destination_result
+
+        self.ue_root_picker = ft.FilePicker()
+        self.ue_root_picker.on_result = self.on_ue_root_result
+
+        # Text Fields for paths (Read-only)
+        self.uplugin_field = ft.TextField(
+            label="Source .uplugin File",
+            read_only=True,
+            hint_text="Select the plugin file to migrate...",
+            border_color=ft.Colors.BLUE_200,
+            text_size=12,
+            dense=True,
+            expand=True,
+        )
+
+        self.destination_field = ft.TextField(
+            label="Destination Folder",
+            read_only=True,
+            hint_text="Select where the migrated plugin will be saved...",
+            border_color=ft.Colors.BLUE_200,
+            text_size=12,
+            dense=True,
+            expand=True,
+        )
+
+        # OS-specific hint text for UE root path
+        if IS_WINDOWS:
+            ue_hint = "e.g., C:\\Program Files\\Epic Games\\UE_5.3"
+        elif IS_MACOS:
+            ue_hint = "e.g., /Users/Shared/Epic Games/UE_5.3 or /Applications/UE_5.3"
+        else:
+            ue_hint = "e.g., /opt/UnrealEngine/UE_5.3"
+
+        self.ue_root_field = ft.TextField(
+            label="Unreal Engine Root Folder",
+            read_only=True,
+            hint_text=ue_hint,
+            border_color=ft.Colors.BLUE_200,
+            text_size=12,
+            dense=True,
+            expand=True,
+        )
+
+        # Installed engines, filled in from the discovery index in the background
+        self.engine_index = EngineIndex()
+        self.engine_dropdown = ft.Dropdown(
+            label="Installed Engines",
+            hint_text="Scanning...",
+            options=[],
+            text_size=12,
+            dense=True,
+            width=200,
+            on_select=self.on_engine_selected,
+        )
+        self.page.run_task(self.discover_engines)
+
+        # Console Output - Flexible height
+        # Each flush appends one Text block, so Flet only sends the new text
+        self.console_output = ft.ListView(
+            controls=[ft.Text("Ready to migrate plugin...", size=11, selectable=True)],
+            auto_scroll=True,
+            expand=True,
+        )
+        self.console_block_sizes = deque([1])
+        self.console = ConsoleBuffer(self.render_console)
+        # Printing every UAT line costs more than rendering it, so opt-in
+        self.echo_console = bool(os.environ.get(ECHO_CONSOLE_ENV))
+        self.page.run_task(self.console.run)
+
+        # Log browsing: a page of the spooled build log instead of the live tail
+        self.build_log = None
+        self.log_view_start = None
+        self.log_highlight = None
+        self.log_search_field = ft.TextField(
+            hint_text="Search build log...",
+            text_size=12,
+            dense=True,
+            expand=True,
+            on_submit=self.search_log,
+        )
+        self.log_position_text = ft.Text("Live", size=12, color=ft.Colors.GREY_400)
+        self.console_toolbar = ft.Row(
+            [
+                self.log_search_field,
+                ft.IconButton(
+                    icon=ft.Icons.SEARCH_ROUNDED,
+                    on_click=self.search_log,
+                    tooltip="Find next match",
+                ),
+                ft.IconButton(
+                    icon=ft.Icons.ERROR_OUTLINE_ROUNDED,
+                    on_click=self.jump_to_first_error,
+                    tooltip="Jump to first error",
+                ),
+                ft.IconButton(
+                    icon=ft.Icons.KEYBOARD_ARROW_UP_ROUNDED,
+                    on_click=self.log_page_up,
+                    tooltip="Previous page",
+                ),
+                ft.IconButton(
+                    icon=ft.Icons.KEYBOARD_ARROW_DOWN_ROUNDED,
+                    on_click=self.log_page_down,
+                    tooltip="Next page",
+                ),
+                ft.IconButton(
+                    icon=ft.Icons.VERTICAL_ALIGN_BOTTOM_ROUNDED,
+                    on_click=self.follow_console,
+                    tooltip="Follow live output",
+                ),
+                self.log_position_text,
+            ],
+            spacing=0,
+        )
+
+        # Progress and Status
+        self.progress_bar = ft.ProgressBar(color=ft.Colors.BLUE, visible=False)
+        # Phase / action counter and live warning/error counts from the parser
+        self.progress_text = ft.Text("", size=12, color=ft.Colors.GREY_400)
+        self.issue_text = ft.Text("", size=12, color=ft.Colors.GREY_400)
+        # Remaining time estimated from earlier runs of the same plugin/engine
+        self.eta_text = ft.Text("", size=12, color=ft.Colors.GREY_400)
+        self.progress_row = ft.Row(
+            [self.progress_text, self.eta_text, self.issue_text],
+            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+            visible=False,
+        )
+        # Live CPU, memory and disk use of the build's processes (Linux only)
+        self.cpu_gauge = ft.ProgressBar(value=0, width=80, color=ft.Colors.GREEN)
+        self.cpu_text = ft.Text("", size=12, color=ft.Colors.GREY_400)
+        self.memory_gauge = ft.ProgressBar(value=0, width=80, color=ft.Colors.PURPLE)
+        self.memory_text = ft.Text("", size=12, color=ft.Colors.GREY_400)
+        self.disk_text = ft.Text("", size=12, color=ft.Colors.GREY_400)
+        self.resource_row = ft.Row(
+            [
+                ft.Text("CPU", size=12),
+                self.cpu_gauge,
+                self.cpu_text,
+                ft.Text("Memory", size=12),
+                self.memory_gauge,
+                self.memory_text,
+                self.disk_text,
+            ],
+            spacing=8,
+            visible=False,
+        )
+        self.last_disk_reading = None
+        self.status_text = ft.Text(
+            "",
+            italic=True,
+            color=ft.Colors.BLUE_400,
+            size=16,
+            weight=ft.FontWeight.BOLD,
+            text_align=ft.TextAlign.CENTER,
+        )
+
+        # Action Button (Flet 0.80+ uses FilledButton instead of ElevatedButton)
+        self.migrate_button = ft.FilledButton(
+            content=ft.Row(
+                [
+                    ft.Icon(ft.Icons.PLAY_ARROW_ROUNDED),
+                    ft.Text("Begin Migration"),
+                ],
+                alignment=ft.MainAxisAlignment.CENTER,
+                spacing=8,
+            ),
+            on_click=self.start_migration_wrapper,
+            style=ft.ButtonStyle(
+                padding=20,
+                shape=ft.RoundedRectangleBorder(radius=8),
+            ),
+            height=50,
+        )
+
+        self.cache_checkbox = ft.Checkbox(
+            label="Reuse cached builds of unchanged plugins",
+            value=True,
+        )
+        self.preflight_checkbox = ft.Checkbox(
+            label="Check the plugin against the engine before building",
+            value=True,
+        )
+        self.api_scan_checkbox = ft.Checkbox(
+            label="Scan sources for deprecated engine APIs",
+            value=True,
+        )
+        self.abort_on_api_errors_checkbox = ft.Checkbox(
+            label="Stop when removed APIs are found",
+            value=False,
+        )
+        self.incremental_checkbox = ft.Checkbox(
+            label="Incremental (keep a workspace and reuse object files)",
+            value=False,
+        )
+        self.stage_source_checkbox = ft.Checkbox(
+            label="Build from a local copy of the source (skips Binaries/Intermediate)",
+            value=False,
+        )
+        self.fail_fast_checkbox = ft.Checkbox(
+            label="Stop at the first compile error (fail fast)",
+            value=False,
+        )
+        self.core_budget_checkbox = ft.Checkbox(
+            label="Share cores and memory between concurrent builds",
+            value=True,
+        )
+        self.archive_checkbox = ft.Checkbox(
+            label="Pack into a .tar.gz for shipping (no Intermediate/debug files)",
+            value=False,
+        )
+        self.split_platforms_field = ft.TextField(
+            label="Split by target platform",
+            hint_text="e.g., Win64, Android (one concurrent UAT run each)",
+            text_size=12,
+            dense=True,
+            width=320,
+        )
+
+        self.stage_root_field = ft.TextField(
+            label="Stage folder",
+            hint_text="local copies kept here, e.g. /dev/shm (empty = cache folder)",
+            text_size=12,
+            dense=True,
+            width=320,
+        )
+
+        self.deploy_field = ft.TextField(
+            label="Deploy to projects",
+            hint_text="project folders, separated by ; (changed files only)",
+            text_size=12,
+            dense=True,
+            width=320,
+        )
+
+        self.workers_field = ft.TextField(
+            label="Build workers",
+            hint_text="host:port, ... (empty = build on this machine)",
+            text_size=12,
+            dense=True,
+            width=320,
+        )
+
+        # Migration Queue - plugin/engine pairs run with bounded parallelism
+        self.migration_queue = MigrationQueue(
+            log=self.log_to_console,
+            on_change=self.on_queue_change,
+            drain=self.console.drain,
+            on_sample=self.on_queue_resource_sample,
+        )
+        self.add_to_queue_button = ft.OutlinedButton(
+            content=ft.Row(
+                [ft.Icon(ft.Icons.PLAYLIST_ADD_ROUNDED), ft.Text("Add to Queue")],
+                alignment=ft.MainAxisAlignment.CENTER,
+                spacing=8,
+            ),
+            on_click=self.add_to_queue,
+            height=50,
+        )
+        self.run_queue_button = ft.OutlinedButton(
+            content=ft.Row(
+                [ft.Icon(ft.Icons.QUEUE_PLAY_NEXT_ROUNDED), ft.Text("Run Queue")],
+                alignment=ft.MainAxisAlignment.CENTER,
+                spacing=8,
+            ),
+            on_click=self.run_queue,
+            height=50,
+        )
+        self.watch_button_icon = ft.Icon(ft.Icons.VISIBILITY_ROUNDED)
+        self.watch_button_text = ft.Text("Watch")
+        self.watch_button = ft.OutlinedButton(
+            content=ft.Row(
+                [self.watch_button_icon, self.watch_button_text],
+                alignment=ft.MainAxisAlignment.CENTER,
+                spacing=8,
+            ),
+            on_click=self.toggle_watch,
+            tooltip="Rebuild whenever the plugin source changes",
+            height=50,
+        )
+        self.cancel_button = ft.OutlinedButton(
+            content=ft.Row(
+                [ft.Icon(ft.Icons.STOP_CIRCLE_ROUNDED), ft.Text("Cancel")],
+                alignment=ft.MainAxisAlignment.CENTER,
+                spacing=8,
+            ),
+            on_click=self.cancel_migration,
+            disabled=True,
+            height=50,
+        )
+        self.concurrency_dropdown = ft.Dropdown(
+            label="Parallel jobs",
+            options=[ft.dropdown.Option(str(n)) for n in range(1, 9)],
+            value=str(DEFAULT_CONCURRENCY),
+            width=140,
+            dense=True,
+        )
+        self.queue_list = ft.Column(spacing=2, tight=True, scroll=ft.ScrollMode.AUTO)
+        self.queue_summary = ft.Text("", size=12, color=ft.Colors.GREY_400)
+        self.queue_section = ft.Container(
+            content=ft.Column(
+                [
+                    ft.Row(
+                        [
+                            ft.Text(
+                                "Queue",
+                                size=15,
+                                weight=ft.FontWeight.W_600,
+                                color=ft.Colors.BLUE_200,
+                            ),
+                            self.queue_summary,
+                            ft.Container(expand=True),
+                            self.concurrency_dropdown,
+                            ft.IconButton(
+                                icon=ft.Icons.CLEAR_ALL_ROUNDED,
+                                on_click=self.clear_queue,
+                                tooltip="Clear finished and pending jobs",
+                            ),
+                        ],
+                        spacing=10,
+                    ),
+                    ft.Container(content=self.queue_list, height=110),
+                ],
+                spacing=6,
+                tight=True,
+            ),
+            visible=False,
+        )
+
+    def build_ui(self):
+        # Header - Compact
+        header = ft.Container(
+            content=ft.Column(
+                [
+                    ft.Row(
+                        [
+                            ft.Icon(
+                                ft.Icons.SETTINGS_SYSTEM_DAYDREAM_ROUNDED,
+                                size=32,
+                                color=ft.Colors.BLUE_400,
+                            ),
+                            ft.Text(
+                                "Unreal Plugin Migration",
+                                size=24,
+                                weight=ft.FontWeight.BOLD,
+                            ),
+                        ],
+                        alignment=ft.MainAxisAlignment.CENTER,
+                    ),
+                    ft.Text(
+                        "Automate your plugin packaging with UAT",
+                        size=13,
+                        color=ft.Colors.GREY_400,
+                    ),
+                ],
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                spacing=4,
+                tight=True,
+            ),
+        )
+
+        # Theme Toggle
+        self.theme_icon = ft.IconButton(
+            icon=ft.Icons.LIGHT_MODE_ROUNDED,
+            on_click=self.toggle_theme,
+            tooltip="Toggle Theme",
+        )
+        self.history_button = ft.IconButton(
+            icon=ft.Icons.HISTORY_ROUNDED,
+            on_click=self.show_history,
+            tooltip="Build history",
+        )
+
+        # Main Content Card - Flexible
+        content_card = ft.Container(
+            content=ft.Column(
+                [
+                    # Section 1: Plugin Selection
+                    self.create_section(
+                        "1. Select Plugin",
+                        ft.Row(
+                            [
+                                self.uplugin_field,
+                                ft.IconButton(
+                                    icon=ft.Icons.FOLDER_OPEN_ROUNDED,
+                                    on_click=self.pick_uplugin_file,
+                                    tooltip="Browse for .uplugin file",
+                                ),
+                            ]
+                        ),
+                    ),
+                    # Section 2: Destination Selection
+                    self.create_section(
+                        "2. Destination",
+                        ft.Row(
+                            [
+                                self.destination_field,
+                                ft.IconButton(
+                                    icon=ft.Icons.CREATE_NEW_FOLDER_ROUNDED,
+                                    on_click=self.pick_destination_folder,
+                                    tooltip="Select destination folder",
+                                ),
+                            ]
+                        ),
+                    ),
+                    # Section 3: UE Root Selection
+                    self.create_section(
+                        "3. Unreal Engine Path",
+                        ft.Row(
+                            [
+                                self.engine_dropdown,
+                                self.ue_root_field,
+                                ft.IconButton(
+                                    icon=ft.Icons.COMPUTER_ROUNDED,
+                                    on_click=self.pick_ue_root_folder,
+                                    tooltip="Select UE root folder",
+                                ),
+                            ]
+                        ),
+                    ),
+                    # Queue Section - only shown once jobs are queued
+                    self.queue_section,
+                    # Console Output Section - Flexible
+                    ft.Container(
+                        content=ft.Column(
+                            [
+                                ft.Text(
+                                    "Console Output",
+                                    size=15,
+                                    weight=ft.FontWeight.W_600,
+                                    color=ft.Colors.BLUE_200,
+                                ),
+                                self.console_toolbar,
+                                ft.Container(
+                                    content=self.console_output,
+                                    border=ft.Border.all(1, ft.Colors.GREY_700),
+                                    border_radius=4,
+                                    padding=8,
+                                    expand=True,
+                                ),
+                            ],
+                            spacing=6,
+                            tight=True,
+                        ),
+                        expand=True,
+                    ),
+                    # Status Message
+                    ft.Container(
+                        content=self.status_text,
+                        padding=8,
+                    ),
+                    # Action Area - Fixed at bottom
+                    ft.Column(
+                        [
+                            ft.Row(
+                                [
+                                    self.cache_checkbox,
+                                    self.preflight_checkbox,
+                                    self.api_scan_checkbox,
+                                    self.abort_on_api_errors_checkbox,
+                                    self.incremental_checkbox,
+                                    self.stage_source_checkbox,
+                                    self.fail_fast_checkbox,
+                                    self.core_budget_checkbox,
+                                    self.archive_checkbox,
+                                    self.split_platforms_field,
+                                    self.stage_root_field,
+                                    self.workers_field,
+                                    self.deploy_field,
+                                ],
+                                wrap=True,
+                            ),
+                            ft.Row(
+                                [
+                                    self.migrate_button,
+                                    self.add_to_queue_button,
+                                    self.run_queue_button,
+                                    self.watch_button,
+                                    self.cancel_button,
+                                ],
+                                alignment=ft.MainAxisAlignment.CENTER,
+                            ),
+                            ft.Container(height=4),
+                            self.progress_bar,
+                            self.progress_row,
+                            self.resource_row,
+                        ],
+                        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                        tight=True,
+                    ),
+                ],
+                spacing=10,
+                tight=True,
+                expand=True,
+            ),
+            padding=20,
+            expand=True,
+        )
+
+        # Main layout - Flexible column
+        main_column = ft.Column(
+            [
+                ft.Row(
+                    [self.history_button, self.theme_icon],
+                    alignment=ft.MainAxisAlignment.END,
+                ),
+                header,
+                ft.Container(height=8),
+                ft.Card(
+                    content=content_card,
+                    elevation=4,
+                    expand=True,
+                ),
+            ],
+            spacing=0,
+            expand=True,
+        )
+
+        self.page.add(main_column)
+
+    def create_section(self, title, content):
+        return ft.Container(
+            content=ft.Column(
+                [
+                    ft.Text(
+                        title,
+                        size=15,
+                        weight=ft.FontWeight.W_600,
+                        color=ft.Colors.BLUE_200,
+                    ),
+                    content,
+                ],
+                spacing=6,
+                tight=True,
+            ),
+        )
+
+    def log_to_console(self, message):
+        """Queue message for the console; the UI catches up on the next flush"""
+        self.console.write(message)
+        if self.echo_console:
+            print(message)
+
+    def render_console(self, lines):
+        """Append a batch of lines to the console and drop the oldest blocks"""
+        if self.log_view_start is not None:
+            # Browsing the build log; the tail is rebuilt when following again
+            self.page.update()
+            return
+        self.console_output.controls.append(
+            ft.Text("\n".join(lines), size=11, selectable=True)
+        )
+        self.console_block_sizes.append(len(lines))
+        total = sum(self.console_block_sizes)
+        while total > self.console.max_lines and len(self.console_block_sizes) > 1:
+            total -= self.console_block_sizes.popleft()
+            self.console_output.controls.pop(0)
+        self.page.update()
+
+    async def show_log_page(self, start, highlight=None):
+        """Materialise one page of the build log, starting at line `start`"""
+        log = self.build_log
+        self.log_view_start = max(0, min(start, len(log) - LOG_PAGE_LINES))
+        self.log_highlight = highlight
+        lines = log.lines(self.log_view_start, LOG_PAGE_LINES)
+        error_lines = set(log.error_lines)
+
+        controls = []
+        for number, line in enumerate(lines, self.log_view_start):
+            controls.append(
+                ft.Text(
+                    f"{number + 1:>7}  {line}",
+                    size=11,
+                    selectable=True,
+                    color=ft.Colors.RED_300 if number in error_lines else None,
+                    bgcolor=(
+                        ft.Colors.with_opacity(0.3, ft.Colors.AMBER)
+                        if number == highlight
+                        else None
+                    ),
+                    key=f"log-{number}" if number == highlight else None,
+                )
+            )
+        self.console_output.controls = controls
+        self.console_output.auto_scroll = False
+        end = self.log_view_start + len(lines)
+        self.log_position_text.value = (
+            f"Lines {self.log_view_start + 1}-{end} of {len(log)}"
+        )
+        self.page.update()
+        if highlight is not None:
+            await self.console_output.scroll_to(scroll_key=f"log-{highlight}")
+
+    def require_build_log(self):
+        if self.build_log is None or not len(self.build_log):
+            self.show_snackbar(
+                "No build log yet - run a migration first.", ft.Colors.AMBER_700
+            )
+            return False
+        return True
+
+    async def search_log(self, e):
+        text = self.log_search_field.value
+        if not text or not self.require_build_log():
+            return
+        if self.log_highlight is not None:
+            start = self.log_highlight + 1
+        else:
+            start = self.log_view_start or 0
+        number = self.build_log.search(text, start)
+        if number is None:
+            self.show_snackbar(f"No match for '{text}'", ft.Colors.AMBER_700)
+            return
+        await self.show_log_page(number - LOG_PAGE_LINES // 4, highlight=number)
+
+    async def jump_to_first_error(self, e):
+        if not self.require_build_log():
+            return
+        number = self.build_log.first_error()
+        if number is None:
+            self.show_snackbar("No errors in the build log.", ft.Colors.GREEN_700)
+            return
+        await self.show_log_page(number - LOG_PAGE_LINES // 4, highlight=number)
+
+    async def log_page_up(self, e):
+        if not self.require_build_log():
+            return
+        if self.log_view_start is None:
+            start = len(self.build_log) - LOG_PAGE_LINES
+        else:
+            start = self.log_view_start - LOG_PAGE_LINES
+        await self.show_log_page(start, self.log_highlight)
+
+    async def log_page_down(self, e):
+        if not self.require_build_log() or self.log_view_start is None:
+            return
+        await self.show_log_page(
+            self.log_view_start + LOG_PAGE_LINES, self.log_highlight
+        )
+
+    def follow_console(self, e=None):
+        """Leave log browsing and show the live console tail again"""
+        if self.log_view_start is None:
+            return
+        self.log_view_start = None
+        self.log_highlight = None
+        self.console.flush()
+        tail = list(self.console.lines)
+        self.console_output.controls = [
+            ft.Text("\n".join(tail), size=11, selectable=True)
+        ]
+        self.console_block_sizes = deque([len(tail)])
+        self.console_output.auto_scroll = True
+        self.log_position_text.value = "Live"
+        self.page.update()
+
+    # Async file picker handlers (Flet 0.80+ returns result directly)
+    async def pick_uplugin_file(self, e):
+        result = await self.uplugin_picker.pick_files(allowed_extensions=["uplugin"])
+        # result is a list of files directly in Flet 0.80+
+        if result and len(result) > 0:
+            self.uplugin_path = result[0].path
+            self.uplugin_field.value = self.uplugin_path
+            self.uplugin_field.border_color = ft.Colors.GREEN
+            self.log_to_console(f"✓ Plugin selected: {self.uplugin_path}")
+            self.page.update()
+
+    async def pick_destination_folder(self, e):
+        result = await self.destination_picker.get_directory_path()
+        # result is the path string directly in Flet 0.80+
+        if result:
+            self.destination_path = result
+            self.destination_field.value = self.destination_path
+            self.destination_field.border_color = ft.Colors.GREEN
+            self.log_to_console(f"✓ Destination selected: {self.destination_path}")
+            self.page.update()
+
+    async def pick_ue_root_folder(self, e):
+        result = await self.ue_root_picker.get_directory_path()
+        # result is the path string directly in Flet 0.80+
+        if result:
+            self.ue_root_path = result
+            self.ue_root_field.value = self.ue_root_path
+            self.ue_root_field.border_color = ft.Colors.GREEN
+            self.engine_index.add_user_root(self.ue_root_path)
+            # List the engine(s) under the new root in the dropdown too
+            self.page.run_task(self.discover_engines)
+            self.log_to_console(f"✓ UE Root selected: {self.ue_root_path}")
+            self.page.update()
+
+    # Legacy event handlers (kept for compatibility, but may not be called in 0.80+)
+    def on_uplugin_result(self, e: ft.FilePickerResultEvent):
+        if e.files:
+            self.uplugin_path = e.files[0].path
+            self.uplugin_field.value = self.uplugin_path
+            self.uplugin_field.border_color = ft.Colors.GREEN
+            self.log_to_console(f"✓ Plugin selected: {self.uplugin_path}")
+            self.page.update()
+
+    def on_destination_result(self, e: ft.FilePickerResultEvent):
+        if e.path:
+            self.destination_path = e.path
+            self.destination_field.value = self.destination_path
+            self.destination_field.border_color = ft.Colors.GREEN
+            self.log_to_console(f"✓ Destination selected: {self.destination_path}")
+            self.page.update()
+
+    def on_ue_root_result(self, e: ft.FilePickerResultEvent):
+        if e.path:
+            self.ue_root_path = e.path
+            self.ue_root_field.value = self.ue_root_path
+            self.ue_root_field.border_color = ft.Colors.GREEN
+            self.engine_index.add_user_root(self.ue_root_path)
+            # List the engine(s) under the new root in the dropdown too
+            self.page.run_task(self.discover_engines)
+            self.log_to_console(f"✓ UE Root selected: {self.ue_root_path}")
+            self.page.update()
+
+    async def discover_engines(self):
+        engines = await asyncio.to_thread(self.engine_index.discover)
+        self.engine_dropdown.options = [
+            ft.dropdown.Option(key=engine.root, text=engine.label) for engine in engines
+        ]
+        self.engine_dropdown.hint_text = (
+            f"{len(engines)} found" if engines else "None found"
+        )
+        self.page.update()
+
+    def on_engine_selected(self, e):
+        if self.engine_dropdown.value:
+            self.ue_root_path = self.engine_dropdown.value
+            self.ue_root_field.value = self.ue_root_path
+            self.ue_root_field.border_color = ft.Colors.GREEN
+            self.log_to_console(f"✓ UE Root selected: {self.ue_root_path}")
+            self.page.update()
+
+    def toggle_theme(self, e):
+        if self.page.theme_mode == ft.ThemeMode.DARK:
+            self.page.theme_mode = ft.ThemeMode.LIGHT
+            self.theme_icon.icon = ft.Icons.DARK_MODE_ROUNDED
+        else:
+            self.page.theme_mode = ft.ThemeMode.DARK
+            self.theme_icon.icon = ft.Icons.LIGHT_MODE_ROUNDED
+        self.page.update()
+
+    async def start_migration_wrapper(self, e):
+        """Wrapper to handle async call from sync button click"""
+        await self.start_migration(e)
+
+    def current_job(self):
+        return MigrationJob(
+            uplugin_path=self.uplugin_path,
+            destination_path=self.destination_path,
+            ue_root_path=self.ue_root_path,
+            split_platforms=parse_platforms(self.split_platforms_field.value),
+            incremental=self.incremental_checkbox.value,
+            stage_source=self.stage_source_checkbox.value,
+            stage_root=(self.stage_root_field.value or "").strip(),
+        )
+
+    def validate_job(self, job):
+        """Highlight missing or invalid inputs; returns True when job can run"""
+        # Validation with clear feedback
+        missing_fields = job.missing_fields()
+        if not self.uplugin_path:
+            self.uplugin_field.border_color = ft.Colors.RED
+        if not self.destination_path:
+            self.destination_field.border_color = ft.Colors.RED
+        if not self.ue_root_path:
+            self.ue_root_field.border_color = ft.Colors.RED
+
+        if missing_fields:
+            error_msg = f"⚠ Missing required fields: {', '.join(missing_fields)}"
+            self.log_to_console(error_msg)
+            self.show_snackbar(error_msg, ft.Colors.AMBER_700)
+            self.status_text.value = "⚠ Please fill all required fields!"
+            self.status_text.color = ft.Colors.AMBER
+            self.page.update()
+            return False
+
+        # Reset field colors
+        self.uplugin_field.border_color = ft.Colors.BLUE_200
+        self.destination_field.border_color = ft.Colors.BLUE_200
+        self.ue_root_field.border_color = ft.Colors.BLUE_200
+
+        uat_path = job.uat_path
+        if not uat_path.exists() and not self.workers_field.value:
+            error_msg = f"✗ {UAT_SCRIPT_NAME} not found at: {uat_path}"
+            self.log_to_console(error_msg)
+            self.show_snackbar(f"{UAT_SCRIPT_NAME} not found!", ft.Colors.RED_700)
+            self.ue_root_field.border_color = ft.Colors.RED
+            self.status_text.value = f"✗ {UAT_SCRIPT_NAME} not found!"
+            self.status_text.color = ft.Colors.RED
+            self.page.update()
+            return False
+        return True
+
+    def active_cache(self):
+        """The build cache when enabled, created on first use"""
+        if not self.cache_checkbox.value:
+            return None
+        if self.build_cache is None:
+            self.build_cache = BuildCache()
+        return self.build_cache
+
+    def active_workers(self):
+        """A pool of the build workers in the workers field, or None"""
+        try:
+            addresses = parse_workers(self.workers_field.value or "")
+        except ValueError:
+            self.log_to_console("⚠ Build workers must be given as host:port")
+            return None
+        if not addresses:
+            return None
+        return WorkerPool(addresses, log=self.log_to_console)
+
+    def active_budget(self, builds):
+        """A core budget shared by `builds` concurrent BuildPlugin runs, or None"""
+        if not self.core_budget_checkbox.value or builds <= 1:
+            return None
+        budget = CoreBudget.shared(builds)
+        self.log_to_console(budget.describe())
+        return budget
+
+    def active_history(self):
+        """The build history database, opened on first use (None if unusable)"""
+        if self.build_history is None:
+            try:
+                self.build_history = BuildHistory()
+            except (OSError, sqlite3.Error) as ex:
+                self.log_to_console(f"⚠ Build history unavailable: {ex}")
+        return self.build_history
+
+    async def track_eta(self, estimate):
+        """Count down the estimated remaining time while a migration runs"""
+        started = time.monotonic()
+        while self.is_migrating:
+            remaining = estimate - (time.monotonic() - started)
+            if remaining > 0:
+                self.eta_text.value = f"ETA {format_duration(remaining)}"
+            else:
+                self.eta_text.value = (
+                    f"Longer than usual (~{format_duration(estimate)})"
+                )
+            self.page.update()
+            await asyncio.sleep(1)
+
+    def set_migrating(self, migrating):
+        self.is_migrating = migrating
+        # Watch mode starts its own migrations
+        busy = migrating or self.watch_task is not None
+        self.migrate_button.disabled = busy
+        self.add_to_queue_button.disabled = busy
+        self.run_queue_button.disabled = busy
+        self.cancel_button.disabled = not migrating
+        self.progress_bar.visible = migrating
+        self.progress_row.visible = migrating
+        if migrating:
+            # Indeterminate until the first UBT action counter shows up
+            self.progress_bar.value = None
+            self.progress_text.value = ""
+            self.issue_text.value = ""
+            self.eta_text.value = ""
+        self.resource_row.visible = migrating and sampling_available()
+        if migrating:
+            self.cpu_gauge.value = self.memory_gauge.value = 0
+            self.cpu_text.value = self.memory_text.value = self.disk_text.value = ""
+            self.last_disk_reading = None
+
+    def show_resources(self, samples):
+        """Show the combined latest samples of the running builds"""
+        cores = os.cpu_count() or 1
+        cpu_percent = sum(sample.cpu_percent for sample in samples)
+        rss_bytes = sum(sample.rss_bytes for sample in samples)
+        disk_bytes = sum(sample.read_bytes + sample.write_bytes for sample in samples)
+        processes = sum(sample.processes for sample in samples)
+        self.cpu_gauge.value = min(cpu_percent / (cores * 100), 1.0)
+        self.cpu_text.value = f"{cpu_percent:.0f}% of {cores * 100}%"
+        memory = total_memory()
+        if memory:
+            self.memory_gauge.value = min(rss_bytes / memory, 1.0)
+        self.memory_text.value = format_size(rss_bytes)
+        now = time.monotonic()
+        rate = ""
+        if self.last_disk_reading is not None:
+            then, before = self.last_disk_reading
+            rate = f"{format_size(max(disk_bytes - before, 0) / (now - then))}/s, "
+        self.last_disk_reading = (now, disk_bytes)
+        self.disk_text.value = f"Disk {rate}{processes} processes"
+        self.page.update()
+
+    def on_resource_sample(self, sample):
+        self.show_resources([sample])
+
+    def on_queue_resource_sample(self, queued, sample):
+        running = [
+            queued.monitor.latest
+            for queued in self.migration_queue.jobs
+            if queued.status == RUNNING
+            and queued.monitor is not None
+            and queued.monitor.latest is not None
+        ]
+        self.show_resources(running)
+
+    def on_uat_event(self, event):
+        """Update progress widgets; the next console flush pushes them to the UI"""
+        parser = self.uat_parser
+        if event.kind == ACTION:
+            self.progress_bar.value = parser.progress
+            module = f" - {parser.module}" if parser.module else ""
+            self.progress_text.value = (
+                f"{parser.phase or 'Compiling'} [{event.current}/{event.total}]{module}"
+            )
+        elif event.kind == PHASE:
+            self.progress_text.value = event.text
+        elif event.kind in (WARNING, ERROR):
+            self.issue_text.value = f"⚠ {parser.warnings}   ✗ {parser.errors}"
+            self.issue_text.color = ft.Colors.RED if parser.errors else ft.Colors.AMBER
+
+    async def start_migration(self, e):
+        job = self.current_job()
+        if not self.validate_job(job):
+            return
+        await self.migrate_job(job)
+
+    async def migrate_job(self, job, dialogs=True):
+        """Run one migration of `job`; `dialogs` shows the result in a dialog"""
+
+        # UI State Update
+        self.log_to_console("\n" + "=" * 50)
+        self.log_to_console("Starting migration process...")
+        self.log_to_console("=" * 50)
+
+        self.set_migrating(True)
+        self.status_text.value = "⏳ MIGRATION IN PROGRESS - PLEASE WAIT..."
+        self.status_text.color = ft.Colors.BLUE_400
+        self.page.update()
+
+        # Run Migration Asynchronously
+        self.follow_console()
+        if self.build_log is not None:
+            self.build_log.close()
+        self.build_log = BuildLog.create(job)
+        self.log_to_console(f"Build log: {self.build_log.path}")
+        self.uat_parser = UatOutputParser(on_event=self.on_uat_event)
+        monitor = None
+        if sampling_available():
+            monitor = ResourceMonitor(
+                resources_path(self.build_log.path),
+                on_sample=self.on_resource_sample,
+            )
+        workers = self.active_workers()
+        history = self.active_history()
+        if history is not None:
+            estimate = history.estimate(
+                job.plugin_name,
+                read_engine_version(job.ue_root_path),
+                build_mode(job, remote=workers is not None),
+            )
+            if estimate is not None:
+                self.page.run_task(self.track_eta, estimate)
+        budget = None
+        if workers is None:
+            budget = self.active_budget(len(job.split_platforms))
+        self.migration_task = asyncio.ensure_future(
+            run_migration(
+                job,
+                log=self.log_to_console,
+                cache=self.active_cache(),
+                parser=self.uat_parser,
+                build_log=self.build_log,
+                drain=self.console.drain,
+                preflight=self.preflight_checkbox.value,
+                history=history,
+                api_scan=self.api_scan_checkbox.value,
+                abort_on_api_errors=self.abort_on_api_errors_checkbox.value,
+                workers=workers,
+                monitor=monitor,
+                budget=budget,
+                fail_fast=self.fail_fast_checkbox.value,
+            )
+        )
+        task = self.migration_task
+        cancelled = None
+        try:
+            # asyncio.wait() does not pass a cancellation of this coroutine
+            # on to the task, so the two can be told apart
+            await asyncio.wait([task])
+        except asyncio.CancelledError as ex:
+            # Cancelled from outside (watch mode): let the build clean up first
+            cancelled = ex
+            task.cancel()
+            await asyncio.wait([task])
+        finally:
+            self.migration_task = None
+            self.build_log.close()
+            if monitor is not None:
+                monitor.close()
+        if cancelled is not None or task.cancelled():
+            self.console.flush()
+            self.set_migrating(False)
+            self.status_text.value = "■ MIGRATION CANCELLED"
+            self.status_text.color = ft.Colors.ORANGE_400
+            self.page.update()
+            if cancelled is not None:
+                # The caller must not take the job for finished
+                raise cancelled
+            return
+        success, message = task.result()
+        if success and self.archive_checkbox.value:
+            await self.create_archive(
+                job.package_dir, job_archive_path(job), top=job.plugin_name
+            )
+        targets = [
+            target.strip()
+            for target in (self.deploy_field.value or "").split(";")
+            if target.strip()
+        ]
+        if success and targets:
+            await deploy_package(
+                job.package_dir,
+                targets,
+                log=self.log_to_console,
+                plugin_name=job.plugin_name,
+            )
+        self.console.flush()
+
+        # Reset UI State
+        self.set_migrating(False)
+
+        if success:
+            self.log_to_console("\n" + "=" * 50)
+            self.log_to_console("✓ SUCCESS: Plugin migrated successfully!")
+            self.log_to_console(self.uat_parser.summary())
+            self.log_to_console("=" * 50)
+            self.status_text.value = "✓ MIGRATION COMPLETED SUCCESSFULLY!"
+            self.status_text.color = ft.Colors.GREEN
+            self.page.update()
+
+            # Show success dialog
+            await asyncio.sleep(0.5)
+            if dialogs:
+                self.show_dialog(
+                    "✓ Migration Successful!",
+                    "Your plugin has been migrated successfully!\n\n"
+                    "The migrated plugin is located in the 'Migrated' subfolder "
+                    "of your selected destination.\n\n"
+                    "Check the console output above for detailed information.",
+                )
+        else:
+            self.log_to_console("\n" + "=" * 50)
+            self.log_to_console("✗ ERROR: Migration failed!")
+            self.log_to_console(self.uat_parser.summary())
+            first_error = self.build_log.first_error()
+            if first_error is not None:
+                error_text = (
+                    f"line {first_error + 1}: {self.build_log.line(first_error)}"
+                )
+            else:
+                error_text = message.splitlines()[-1] if message else "unknown error"
+            self.log_to_console(f"First error: {error_text}")
+            self.log_to_console("=" * 50)
+            self.status_text.value = "✗ MIGRATION FAILED!"
+            self.status_text.color = ft.Colors.RED
+            self.page.update()
+
+            # Show error dialog
+            await asyncio.sleep(0.5)
+            if dialogs:
+                self.show_dialog(
+                    "✗ Migration Failed",
+                    f"The migration process encountered an error.\n\n"
+                    f"First error: {error_text[:500]}\n\n"
+                    f"Use 'Jump to first error' above the console, or open the "
+                    f"full log at:\n{self.build_log.path}",
+                )
+
+        self.page.update()
+
+    async def toggle_watch(self, e):
+        """Start or stop rebuilding the plugin whenever its source changes"""
+        if self.watch_task is not None:
+            self.watch_task.cancel()
+            return
+        job = self.current_job()
+        if not self.validate_job(job):
+            return
+        self.watch_task = asyncio.ensure_future(
+            watch_plugin(
+                job,
+                lambda: self.migrate_job(job, dialogs=False),
+                log=self.log_to_console,
+            )
+        )
+        self.set_watching(True)
+        watch_task = self.watch_task
+        try:
+            # Stop Watching cancels watch_task; this handler only ends early
+            # when it is cancelled itself, which is passed on after cleanup
+            await asyncio.wait([watch_task])
+        except asyncio.CancelledError:
+            watch_task.cancel()
+            await asyncio.wait([watch_task])
+            raise
+        finally:
+            self.watch_task = None
+            self.set_watching(False)
+            self.log_to_console("Stopped watching the plugin source")
+        if not watch_task.cancelled() and watch_task.exception() is not None:
+            self.log_to_console(f"✗ Watch mode failed: {watch_task.exception()}")
+
+    def set_watching(self, watching):
+        self.watch_button_icon.icon = (
+            ft.Icons.VISIBILITY_OFF_ROUNDED if watching else ft.Icons.VISIBILITY_ROUNDED
+        )
+        self.watch_button_text.value = "Stop Watching" if watching else "Watch"
+        self.set_migrating(self.is_migrating)
+        self.page.update()
+
+    async def cancel_migration(self, e):
+        """Stop the running migration or queue, killing its build processes"""
+        if self.migration_task is not None:
+            self.migration_task.cancel()
+        self.migration_queue.cancel()
+        self.cancel_button.disabled = True
+        self.status_text.value = "⏳ CANCELLING..."
+        self.status_text.color = ft.Colors.ORANGE_400
+        self.page.update()
+
+    async def add_to_queue(self, e):
+        job = self.current_job()
+        if not self.validate_job(job):
+            return
+        self.migration_queue.split_platforms = job.split_platforms
+        self.migration_queue.incremental = job.incremental
+        self.migration_queue.stage_source = job.stage_source
+        self.migration_queue.stage_root = job.stage_root
+        queued = self.migration_queue.add(
+            job.uplugin_path, job.ue_root_path, job.destination_path
+        )
+        self.log_to_console(f"+ Queued {queued.label} -> {queued.job.package_dir}")
+        self.refresh_queue()
+
+    def clear_queue(self, e):
+        self.migration_queue.jobs = [
+            queued for queued in self.migration_queue.jobs if queued.status == RUNNING
+        ]
+        self.refresh_queue()
+
+    def on_queue_change(self, queued):
+        self.log_to_console(f"[{queued.label}] {queued.status}")
+        self.refresh_queue()
+
+    def refresh_queue(self):
+        """Rebuild the per-job rows and the aggregate summary"""
+        jobs = self.migration_queue.jobs
+        self.queue_list.controls = [
+            ft.Row(
+                [
+                    ft.Icon(
+                        QUEUE_STATUS_ICONS[queued.status],
+                        color=QUEUE_STATUS_COLORS[queued.status],
+                        size=16,
+                    ),
+                    ft.Text(queued.label, size=12, expand=True),
+                    ft.Text(
+                        queued.parser.summary() if queued.started_at else "",
+                        size=12,
+                        color=ft.Colors.GREY_400,
+                    ),
+                    ft.Text(
+                        f"{queued.duration:.0f}s" if queued.started_at else "",
+                        size=12,
+                        color=ft.Colors.GREY_400,
+                    ),
+                ],
+                spacing=8,
+            )
+            for queued in jobs
+        ]
+        self.queue_summary.value = self.migration_queue.summary()
+        self.queue_section.visible = bool(jobs)
+        self.page.update()
+
+    async def run_queue(self, e):
+        pending = [
+            queued for queued in self.migration_queue.jobs if queued.status == QUEUED
+        ]
+        if not pending:
+            self.show_snackbar("The queue has no pending jobs.", ft.Colors.AMBER_700)
+            return
+
+        self.migration_queue.concurrency = int(self.concurrency_dropdown.value)
+        self.log_to_console("\n" + "=" * 50)
+        self.log_to_console(
+            f"Running {len(pending)} queued job(s), "
+            f"{self.migration_queue.concurrency} at a time..."
+        )
+        self.log_to_console("=" * 50)
+
+        self.migration_queue.cache = self.active_cache()
+        self.migration_queue.preflight = self.preflight_checkbox.value
+        self.migration_queue.api_scan = self.api_scan_checkbox.value
+        self.migration_queue.abort_on_api_errors = (
+            self.abort_on_api_errors_checkbox.value
+        )
+        self.migration_queue.history = self.active_history()
+        self.migration_queue.fail_fast = self.fail_fast_checkbox.value
+        self.migration_queue.workers = self.active_workers()
+        self.migration_queue.budget = None
+        if self.migration_queue.workers is None:
+            # Split jobs start one BuildPlugin run per platform
+            splits = max(len(queued.job.split_platforms) for queued in pending)
+            self.migration_queue.budget = self.active_budget(
+                self.migration_queue.concurrency * max(1, splits)
+            )
+        self.set_migrating(True)
+        self.status_text.value = "⏳ QUEUE IN PROGRESS - PLEASE WAIT..."
+        self.status_text.color = ft.Colors.BLUE_400
+        self.page.update()
+
+        await self.migration_queue.run()
+        succeeded = [queued for queued in pending if queued.status == SUCCEEDED]
+        if self.archive_checkbox.value:
+            # One archive per destination, holding all of its succeeded jobs
+            by_destination = {}
+            for queued in succeeded:
+                migrated_dir = Path(queued.job.destination_path) / "Migrated"
+                by_destination.setdefault(migrated_dir, []).append(
+                    queued.job.package_subdir
+                )
+            for migrated_dir, subdirs in by_destination.items():
+                await self.create_archive(
+                    migrated_dir, migrated_dir.with_suffix(".tar.gz"), include=subdirs
+                )
+        self.console.flush()
+
+        self.set_migrating(False)
+        report = self.migration_queue.report()
+        self.log_to_console("\n" + report)
+        failed = any(queued.status == FAILED for queued in pending)
+        if failed:
+            self.status_text.value = "✗ QUEUE FINISHED WITH FAILURES!"
+            self.status_text.color = ft.Colors.RED
+        elif any(queued.status == CANCELLED for queued in pending):
+            self.status_text.value = "■ QUEUE CANCELLED"
+            self.status_text.color = ft.Colors.ORANGE_400
+            self.refresh_queue()
+            self.page.update()
+            return
+        else:
+            self.status_text.value = "✓ QUEUE COMPLETED SUCCESSFULLY!"
+            self.status_text.color = ft.Colors.GREEN
+        self.refresh_queue()
+
+        await asyncio.sleep(0.5)
+        self.show_dialog(
+            "✗ Queue Finished With Failures" if failed else "✓ Queue Completed",
+            f"{self.migration_queue.summary()}\n\n"
+            "Each job was packaged into Migrated/<Plugin>/<EngineVersion> "
+            "under its destination.",
+        )
+
+    async def create_archive(self, root, archive_path, **options):
+        self.log_to_console(f"Packing {root} into {archive_path}...")
+        try:
+            report = await asyncio.to_thread(
+                archive_package, root, archive_path, **options
+            )
+        except OSError as ex:
+            self.log_to_console(f"⚠ Could not create the archive: {ex}")
+            return
+        self.log_to_console(describe_archive(report))
+
+    async def show_history(self, e):
+        """Dialog with per plugin/engine averages and the latest runs.
+
+        Async so it runs on the event loop like the migrations: Flet runs
+        sync handlers on worker threads, and the SQLite connection may only
+        be used by the thread that opened it.
+        """
+        history = self.active_history()
+        if history is None:
+            self.show_snackbar("The build history is unavailable.", ft.Colors.AMBER_700)
+            return
+        runs = history.recent(HISTORY_VIEW_RUNS)
+        if not runs:
+            self.show_dialog("Build History", "No migrations recorded yet.")
+            return
+
+        averages = [
+            f"{row['plugin']} @ UE {row['engine_version']}: "
+            f"{row['succeeded']}/{row['runs']} succeeded, average "
+            + (format_duration(row["average"]) if row["average"] else "-")
+            for row in history.summary()
+        ]
+        table = ft.DataTable(
+            columns=[
+                ft.DataColumn(ft.Text("When")),
+                ft.DataColumn(ft.Text("Plugin")),
+                ft.DataColumn(ft.Text("Engine")),
+                ft.DataColumn(ft.Text("Result")),
+                ft.DataColumn(ft.Text("Duration"), numeric=True),
+                ft.DataColumn(ft.Text("Warnings"), numeric=True),
+                ft.DataColumn(ft.Text("Errors"), numeric=True),
+            ],
+            rows=[
+                ft.DataRow(
+                    cells=[
+                        ft.DataCell(
+                            ft.Text(
+                                time.strftime(
+                                    "%Y-%m-%d %H:%M",
+                                    time.localtime(row["started_at"]),
+                                )
+                            )
+                        ),
+                        ft.DataCell(ft.Text(row["plugin"])),
+                        ft.DataCell(ft.Text(row["engine_version"])),
+                        ft.DataCell(
+                            ft.Text(
+                                (
+                                    "cached"
+                                    if row["cached"]
+                                    else (
+                                        "✓"
+                                        if row["success"]
+                                        else f"✗ {row['exit_code'] or ''}"
+                                    )
+                                ),
+                                color=(
+                                    ft.Colors.GREEN if row["success"] else ft.Colors.RED
+                                ),
+                            )
+                        ),
+                        ft.DataCell(ft.Text(format_duration(row["duration"]))),
+                        ft.DataCell(ft.Text(str(row["warnings"]))),
+                        ft.DataCell(ft.Text(str(row["errors"]))),
+                    ]
+                )
+                for row in runs
+            ],
+            column_spacing=16,
+            heading_row_height=32,
+            data_row_min_height=28,
+            data_row_max_height=28,
+        )
+        self.page.dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Build History", size=22, weight=ft.FontWeight.BOLD),
+            content=ft.Column(
+                [
+                    ft.Text("\n".join(averages), size=12, selectable=True),
+                    ft.Row([table], scroll=ft.ScrollMode.AUTO),
+                ],
+                scroll=ft.ScrollMode.AUTO,
+                width=760,
+                height=420,
+            ),
+            actions=[ft.TextButton("Close", on_click=self.close_dialog)],
+            actions_alignment=ft.MainAxisAlignment.END,
+        )
+        self.page.dialog.open = True
+        self.page.update()
+
+    def show_snackbar(self, message, color):
+        self.page.snack_bar = ft.SnackBar(
+            content=ft.Text(message, size=14),
+            bgcolor=color,
+            duration=4000,
+        )
+        self.page.snack_bar.open = True
+        self.page.update()
+
+    def show_dialog(self, title, content):
+        """Show a modal dialog with the result"""
+        self.page.dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text(title, size=22, weight=ft.FontWeight.BOLD),
+            content=ft.Text(content, size=14, selectable=True),
+            actions=[
+                ft.TextButton(
+                    "OK",
+                    on_click=self.close_dialog,
+                    style=ft.ButtonStyle(
+                        padding=15,
+                    ),
+                )
+            ],
+            actions_alignment=ft.MainAxisAlignment.END,
+        )
+        self.page.dialog.open = True
+        self.page.update()
+
+    def close_dialog(self, e=None):
+        self.page.dialog.open = False
+        self.page.update()
+
+
+def main(page: ft.Page):
+    UnrealPluginMigrationApp(page)
+
+
+def run_gui():
+    # `app()` is deprecated in newer Flet (0.80+). Prefer `run()` when present.
+    if hasattr(ft, "run"):
+        ft.run(main)
+    else:
+        ft.app(target=main)
@@ -0,0 +1,219 @@
+"""SQLite build history.
+
+Every migration is recorded with its plugin, engine version, arguments,
+exit code, duration, per-phase durations, warning/error counts and build
+mode (see `build_mode()`). The history drives the ETA shown during a run
+(based on earlier runs of the same plugin/engine pair in the same mode)
+and makes slowdowns across engine upgrades easy
+to spot with `summary()`.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+
+from .core import format_duration, user_cache_dir
+
+SCHEMA_VERSION = 2
+# Successful, uncached runs the ETA is based on
+ETA_SAMPLE_RUNS = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    plugin TEXT NOT NULL,
+    engine_version TEXT NOT NULL,
+    engine_root TEXT NOT NULL,
+    args TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    success INTEGER NOT NULL,
+    exit_code INTEGER,
+    cached INTEGER NOT NULL,
+    warnings INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    log_path TEXT,
+    mode TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS runs_by_pair ON runs (plugin, engine_version, started_at);
+CREATE INDEX IF NOT EXISTS runs_by_start ON runs (started_at);
+CREATE TABLE IF NOT EXISTS run_phases (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    phase TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (run_id, phase)
+);
+CREATE INDEX IF NOT EXISTS run_phases_by_phase ON run_phases (phase);
+"""
+
+
+def build_mode(job, remote=False):
+    """How a run was built, e.g. "full", "incremental" or "remote split=Android+Win64".
+
+    Durations are only comparable between runs of the same mode.
+    """
+    parts = ["remote"] if remote else []
+    if job.incremental and not remote:
+        parts.append("incremental")
+    if job.split_platforms:
+        parts.append("split=" + "+".join(sorted(set(job.split_platforms))))
+    return " ".join(parts) or "full"
+
+
+def default_history_path():
+    return user_cache_dir() / "history.sqlite3"
+
+
+class BuildHistory:
+    """Run records in a SQLite database shared by the GUI and the CLI"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else default_history_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=10)
+        self.db.row_factory = sqlite3.Row
+        # WAL lets a GUI and CLI runs write without blocking readers
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA foreign_keys=ON")
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            with self.db:
+                self.db.executescript(SCHEMA)
+                columns = {
+                    row["name"] for row in self.db.execute("PRAGMA table_info(runs)")
+                }
+                if "mode" not in columns:
+                    # Version 1 databases: their runs keep an unknown mode
+                    self.db.execute(
+                        "ALTER TABLE runs ADD COLUMN mode TEXT NOT NULL DEFAULT ''"
+                    )
+                self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def record(
+        self,
+        job,
+        engine_version,
+        started_at,
+        duration,
+        success,
+        cached=False,
+        parser=None,
+        log_path=None,
+        mode="",
+    ):
+        """Store one finished run and return its id"""
+        exit_code = parser.exit_code if parser is not None else None
+        if exit_code is None and not cached:
+            exit_code = 0 if success else None
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO runs (plugin, engine_version, engine_root, args,"
+                " started_at, duration, success, exit_code, cached, warnings,"
+                " errors, log_path, mode)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.plugin_name,
+                    engine_version,
+                    str(job.ue_root_path),
+                    json.dumps(job.extra_args + job.split_platforms),
+                    started_at,
+                    duration,
+                    int(success),
+                    exit_code,
+                    int(cached),
+                    parser.warnings if parser is not None else 0,
+                    parser.errors if parser is not None else 0,
+                    str(log_path) if log_path else None,
+                    mode,
+                ),
+            )
+            if parser is not None:
+                self.db.executemany(
+                    "INSERT INTO run_phases (run_id, phase, seconds) VALUES (?, ?, ?)",
+                    [
+                        (cursor.lastrowid, phase, seconds)
+                        for phase, seconds in parser.phase_durations().items()
+                    ],
+                )
+        return cursor.lastrowid
+
+    def estimate(self, plugin, engine_version, mode=None):
+        """Typical duration in seconds of this pair's recent builds, or None.
+
+        With `mode` (see `build_mode()`) only runs built the same way count.
+        """
+        mode_filter = " AND mode = ?" if mode is not None else ""
+        rows = self.db.execute(
+            "SELECT duration FROM runs WHERE plugin = ? AND engine_version = ?"
+            f" AND success = 1 AND cached = 0{mode_filter}"
+            " ORDER BY started_at DESC LIMIT ?",
+            (
+                plugin,
+                engine_version,
+                *([mode] if mode is not None else []),
+                ETA_SAMPLE_RUNS,
+            ),
+        ).fetchall()
+        if not rows:
+            return None
+        return statistics.median(row["duration"] for row in rows)
+
+    def recent(self, limit=50, plugin=None, engine_version=None):
+        """Latest runs, newest first, optionally for one plugin and/or engine"""
+        conditions = []
+        params = []
+        if plugin:
+            conditions.append("plugin = ?")
+            params.append(plugin)
+        if engine_version:
+            conditions.append("engine_version = ?")
+            params.append(engine_version)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.db.execute(
+            f"SELECT * FROM runs {where} ORDER BY started_at DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+
+    def phases(self, run_id):
+        rows = self.db.execute(
+            "SELECT phase, seconds FROM run_phases WHERE run_id = ?", (run_id,)
+        )
+        return {row["phase"]: row["seconds"] for row in rows}
+
+    def summary(self, plugin=None):
+        """Per plugin/engine pair: runs, successes, average duration of the
+        successful uncached builds and when the pair last ran"""
+        where, params = ("WHERE plugin = ?", (plugin,)) if plugin else ("", ())
+        return self.db.execute(
+            "SELECT plugin, engine_version, COUNT(*) AS runs,"
+            " SUM(success) AS succeeded,"
+            " AVG(CASE WHEN success = 1 AND cached = 0 THEN duration END) AS average,"
+            " MAX(started_at) AS last_run"
+            f" FROM runs {where} GROUP BY plugin, engine_version"
+            " ORDER BY plugin, engine_version",
+            params,
+        ).fetchall()
+
+    def close(self):
+        self.db.close()
+
+
+def describe_run(row):
+    """One-line description of a `runs` row"""
+    if row["cached"]:
+        result = "cached"
+    elif row["success"]:
+        result = "ok"
+    else:
+        result = f"failed ({row['exit_code']})" if row["exit_code"] else "failed"
+    started = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["started_at"]))
+    mode = f"  [{row['mode']}]" if row["mode"] not in ("", "full") else ""
+    return (
+        f"{started}  {row['plugin']} @ UE {row['engine_version']}  {result:<12} "
+        f"{format_duration(row['duration']):>8}  "
+        f"{row['warnings']} warnings, {row['errors']} errors{mode}"
+    )
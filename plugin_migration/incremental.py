@@ -0,0 +1,268 @@
+"""Incremental builds in a persistent host project.
+
+BuildPlugin wipes its package folder and host project on every run, so each
+call recompiles every module. In incremental mode the plugin is synced into
+a working copy kept in the user cache folder (one per plugin and engine),
+only new or changed files are copied, and UnrealBuildTool is run directly
+on it, so the working copy's Intermediate folder - object files, makefiles
+and action history - survives between runs. The same targets as
+BuildPlugin's are built (the host editor, and the game target in
+Development and Shipping for each target platform), and the compiled plugin
+is copied into Migrated the way BuildPlugin packages it, including the
+static libraries monolithic game builds link against.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+from .core import (
+    HOST_PLATFORM,
+    IS_MACOS,
+    IS_WINDOWS,
+    format_size,
+    read_engine_version,
+    run_command,
+    user_cache_dir,
+    write_json_atomic,
+)
+
+WORKSPACE_FORMAT = 1
+# Configurations BuildPlugin builds the game target in
+GAME_CONFIGURATIONS = ("Development", "Shipping")
+# Under Intermediate/Build, what BuildPlugin packages for game targets
+STATIC_LIBRARY_SUFFIXES = (".lib", ".a", ".precompiled")
+# Top-level plugin folders written by UBT or the editor, never synced
+UNSYNCED_DIRS = {"Binaries", "Intermediate", "Saved", ".git", ".vs", ".idea"}
+# Plugin folders copied into Migrated, like a BuildPlugin package
+PACKAGED_DIRS = ("Binaries", "Config", "Content", "Resources", "Shaders", "Source")
+
+# One build at a time per working copy
+_workspace_locks = {}
+
+
+def default_workspaces_dir():
+    return user_cache_dir() / "workspaces"
+
+
+def ubt_script_path(ue_root_path):
+    batch_files = Path(ue_root_path) / "Engine" / "Build" / "BatchFiles"
+    if IS_WINDOWS:
+        return batch_files / "Build.bat"
+    return batch_files / ("Mac" if IS_MACOS else "Linux") / "Build.sh"
+
+
+def iter_plugin_files(plugin_dir):
+    """Relative path and file of everything that belongs to the plugin source"""
+    plugin_dir = Path(plugin_dir)
+    for dirpath, dirnames, filenames in os.walk(plugin_dir):
+        if Path(dirpath) == plugin_dir:
+            dirnames[:] = [name for name in dirnames if name not in UNSYNCED_DIRS]
+        for name in filenames:
+            path = Path(dirpath) / name
+            yield path.relative_to(plugin_dir).as_posix(), path
+
+
+class Workspace:
+    """Persistent host project that builds one plugin against one engine"""
+
+    def __init__(self, job, workspaces_dir=None):
+        self.job = job
+        engine_version = read_engine_version(job.ue_root_path)
+        identity = "\n".join(
+            os.path.normcase(str(Path(path).resolve()))
+            for path in (job.ue_root_path, job.plugin_dir)
+        )
+        suffix = hashlib.blake2b(identity.encode(), digest_size=4).hexdigest()
+        workspaces_dir = (
+            Path(workspaces_dir) if workspaces_dir else default_workspaces_dir()
+        )
+        self.dir = workspaces_dir / f"{job.plugin_name}-{engine_version}-{suffix}"
+        self.project_file = self.dir / "HostProject" / "HostProject.uproject"
+        self.plugin_dir = self.dir / "HostProject" / "Plugins" / job.plugin_name
+        self.state_file = self.dir / "workspace.json"
+        self.legacy_targets = engine_version.startswith("4.")
+
+    def load_state(self):
+        try:
+            state = json.loads(self.state_file.read_text(encoding="utf-8"))
+            if state.get("format") == WORKSPACE_FORMAT:
+                return state
+        except (OSError, ValueError):
+            pass
+        return {"format": WORKSPACE_FORMAT, "files": {}}
+
+    def sync(self):
+        """Bring the working copy up to date with the plugin source.
+
+        Files are compared with the size and mtime they had at the last sync
+        and copied with a fresh mtime, so UBT recompiles a changed file even
+        when its new content is older (e.g. after a checkout). Files deleted
+        from the source are deleted from the working copy. Returns
+        `(copied, removed, bytes_copied)`.
+        """
+        state = self.load_state()
+        synced = state["files"]
+        current = {}
+        copied = bytes_copied = 0
+        for relative, source in iter_plugin_files(self.job.plugin_dir):
+            stat = source.stat()
+            signature = [stat.st_size, stat.st_mtime_ns]
+            current[relative] = signature
+            target = self.plugin_dir / relative
+            if synced.get(relative) == signature and target.exists():
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, target)
+            copied += 1
+            bytes_copied += stat.st_size
+
+        removed = 0
+        for relative in synced.keys() - current.keys():
+            try:
+                (self.plugin_dir / relative).unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+
+        project = {
+            "FileVersion": 3,
+            "Plugins": [{"Name": self.job.plugin_name, "Enabled": True}],
+        }
+        if not self.project_file.exists():
+            self.project_file.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.project_file, project)
+        write_json_atomic(
+            self.state_file, {"format": WORKSPACE_FORMAT, "files": current}
+        )
+        return copied, removed, bytes_copied
+
+    def commands(self, max_actions=None):
+        """UBT invocations for the targets BuildPlugin builds.
+
+        The host editor in Development, then the game target in every
+        GAME_CONFIGURATIONS for the host (or each split platform). With
+        `max_actions` UBT runs at most that many actions at once.
+        """
+        script = str(ubt_script_path(self.job.ue_root_path))
+        editor = "UE4Editor" if self.legacy_targets else "UnrealEditor"
+        game = "UE4Game" if self.legacy_targets else "UnrealGame"
+        common = [
+            f"-Project={self.project_file}",
+            f"-Plugin={self.plugin_dir / Path(self.job.uplugin_path).name}",
+            "-WaitMutex",
+        ]
+        if max_actions and not self.legacy_targets:
+            common.append(f"-MaxParallelActions={max_actions}")
+        commands = [[script, editor, HOST_PLATFORM, "Development", *common]]
+        for target_platform in self.job.split_platforms or [HOST_PLATFORM]:
+            for configuration in GAME_CONFIGURATIONS:
+                commands.append([script, game, target_platform, configuration, *common])
+        return commands
+
+    def static_libraries(self):
+        """Game target libraries under Intermediate/Build, as BuildPlugin packages"""
+        build_dir = self.plugin_dir / "Intermediate" / "Build"
+        game = "UE4Game" if self.legacy_targets else "UnrealGame"
+        for dirpath, _, filenames in os.walk(build_dir):
+            if game not in Path(dirpath).relative_to(build_dir).parts:
+                continue
+            for filename in filenames:
+                if filename.endswith(STATIC_LIBRARY_SUFFIXES):
+                    yield Path(dirpath) / filename
+
+    def package(self, package_dir):
+        """Copy the built plugin into `package_dir`; returns `(files, bytes)`"""
+        shutil.rmtree(package_dir, ignore_errors=True)
+        Path(package_dir).mkdir(parents=True, exist_ok=True)
+        descriptor = Path(self.job.uplugin_path).name
+        shutil.copy2(self.plugin_dir / descriptor, Path(package_dir) / descriptor)
+        files, size = 1, (self.plugin_dir / descriptor).stat().st_size
+        for name in PACKAGED_DIRS:
+            source = self.plugin_dir / name
+            if not source.is_dir():
+                continue
+            for dirpath, _, filenames in os.walk(source):
+                target = Path(package_dir) / Path(dirpath).relative_to(self.plugin_dir)
+                target.mkdir(parents=True, exist_ok=True)
+                for filename in filenames:
+                    shutil.copy2(Path(dirpath) / filename, target / filename)
+                    files += 1
+                    size += (target / filename).stat().st_size
+        for library in self.static_libraries():
+            target = Path(package_dir) / library.relative_to(self.plugin_dir)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(library, target)
+            files += 1
+            size += target.stat().st_size
+        return files, size
+
+
+async def run_incremental_build(
+    job,
+    log=print,
+    parser=None,
+    build_log=None,
+    drain=None,
+    monitor=None,
+    budget=None,
+    fail_fast=False,
+    on_launch=None,
+):
+    """Build `job` in its persistent workspace and package it into Migrated.
+
+    With `budget` (a `CoreBudget`) the UBT runs share one allotment; see
+    `run_command` for `fail_fast` and `on_launch`.
+    """
+    script = ubt_script_path(job.ue_root_path)
+    if not script.exists():
+        message = f"UnrealBuildTool script not found at: {script}"
+        log(message)
+        return False, message
+
+    workspace = Workspace(job)
+    lock = _workspace_locks.setdefault(workspace.dir, asyncio.Lock())
+    async with lock:
+        started = time.monotonic()
+        copied, removed, bytes_copied = await asyncio.to_thread(workspace.sync)
+        log(
+            f"Incremental workspace: {workspace.dir}\n"
+            f"Synced {copied} changed file(s) ({format_size(bytes_copied)}), "
+            f"removed {removed}, in {time.monotonic() - started:.1f}s"
+        )
+        if job.extra_args:
+            log(
+                f"Note: BuildPlugin arguments are ignored in incremental mode: "
+                f"{' '.join(job.extra_args)}"
+            )
+
+        async with AsyncExitStack() as stack:
+            cores = None
+            if budget is not None:
+                cores = (await stack.enter_async_context(budget.allot(log))).cores
+            message = ""
+            for command in workspace.commands(len(cores) if cores else None):
+                success, message = await run_command(
+                    command,
+                    log=log,
+                    parser=parser,
+                    build_log=build_log,
+                    drain=drain,
+                    monitor=monitor,
+                    cores=cores,
+                    fail_fast=fail_fast,
+                    on_launch=on_launch,
+                )
+                if not success:
+                    return False, message
+
+        files, size = await asyncio.to_thread(workspace.package, job.package_dir)
+        log(f"Packaged {files} files ({format_size(size)}) into {job.package_dir}")
+        return True, message
@@ -0,0 +1,222 @@
+"""Distributable archives of migrated plugins.
+
+`archive_package()` turns a `Migrated` folder into a `.tar.gz` for shipping:
+
+- Build clutter (Intermediate, Saved) is always left out and debug symbols
+  are left out unless asked for.
+- A manifest with the size and BLAKE2 hash of every file is stored as the
+  first archive member and next to the archive.
+- Files with identical content (the same binary packaged for several engine
+  versions or platforms) are stored once; later copies become hard link
+  entries.
+- Compression runs on all cores: the tar stream is cut into blocks that are
+  compressed in parallel as independent gzip members, which concatenate
+  into a standard gzip file. Files are streamed, never read whole.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import os
+import tarfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .cache import hash_file, iter_files
+from .core import format_size, read_engine_version
+
+ARCHIVE_BLOCK_SIZE = 4 * 1024 * 1024
+COMPRESS_LEVEL = 6
+MANIFEST_NAME = "manifest.json"
+# Never shipped: UBT and editor working folders
+EXCLUDED_DIRS = {"Intermediate", "Saved", "HostProject"}
+# Debug information, only shipped with keep_debug
+DEBUG_SUFFIXES = (".pdb", ".debug", ".sym", ".dwarf")
+DEBUG_DIR_SUFFIXES = (".dSYM",)
+
+
+def is_shipped(relative_parts, keep_debug=False):
+    """Whether a file (given as its relative path parts) belongs in the archive"""
+    if any(part in EXCLUDED_DIRS for part in relative_parts[:-1]):
+        return False
+    if keep_debug:
+        return True
+    if any(part.endswith(DEBUG_DIR_SUFFIXES) for part in relative_parts[:-1]):
+        return False
+    return not relative_parts[-1].lower().endswith(DEBUG_SUFFIXES)
+
+
+class ParallelGzipWriter(io.RawIOBase):
+    """Write-only stream compressed block by block on a thread pool.
+
+    zlib releases the GIL, so blocks really compress concurrently. At most
+    two blocks per worker are in flight, which bounds memory use.
+    """
+
+    def __init__(self, fileobj, workers=None, block_size=ARCHIVE_BLOCK_SIZE):
+        self.fileobj = fileobj
+        self.block_size = block_size
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ThreadPoolExecutor(self.workers)
+        self.pending = []
+        self.buffer = bytearray()
+        self.bytes_in = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer += data
+        self.bytes_in += len(data)
+        while len(self.buffer) >= self.block_size:
+            self.submit(bytes(self.buffer[: self.block_size]))
+            del self.buffer[: self.block_size]
+        return len(data)
+
+    def submit(self, block):
+        self.pending.append(self.pool.submit(gzip.compress, block, COMPRESS_LEVEL))
+        while len(self.pending) > 2 * self.workers:
+            self.fileobj.write(self.pending.pop(0).result())
+
+    def close(self):
+        if self.closed:
+            return
+        if self.buffer or not self.bytes_in:
+            self.submit(bytes(self.buffer))
+            self.buffer.clear()
+        for future in self.pending:
+            self.fileobj.write(future.result())
+        self.pending.clear()
+        self.pool.shutdown()
+        super().close()
+
+
+@dataclass
+class ArchiveReport:
+    archive_path: Path
+    manifest_path: Path
+    files: int = 0
+    duplicates: int = 0
+    excluded: int = 0
+    bytes_in: int = 0
+    bytes_deduplicated: int = 0
+    bytes_out: int = 0
+    seconds: float = 0.0
+
+
+def job_archive_path(job):
+    """<destination>/<Plugin>-UE<version>.tar.gz for a single migration"""
+    engine_version = read_engine_version(job.ue_root_path)
+    return Path(job.destination_path) / f"{job.plugin_name}-UE{engine_version}.tar.gz"
+
+
+def build_manifest(root, keep_debug=False, workers=None, include=None):
+    """Manifest entries for the shipped files below root, plus the excluded count.
+
+    `include` limits the manifest to these folders (relative to root).
+    """
+    root = Path(root)
+    folders = [root / folder for folder in include] if include else [root]
+    files = []
+    excluded = 0
+    for path in (path for folder in folders for path in iter_files(folder)):
+        relative = path.relative_to(root)
+        if is_shipped(relative.parts, keep_debug):
+            files.append((relative.as_posix(), path))
+        else:
+            excluded += 1
+    with ThreadPoolExecutor(workers or os.cpu_count() or 1) as pool:
+        digests = list(pool.map(hash_file, (path for _, path in files)))
+    manifest = [
+        {"path": relative, "size": path.stat().st_size, "blake2b": digest}
+        for (relative, path), digest in zip(files, digests)
+    ]
+    return manifest, excluded
+
+
+def archive_package(
+    root, archive_path, top=None, keep_debug=False, workers=None, include=None
+):
+    """Write root as a deduplicated .tar.gz with a manifest; returns an ArchiveReport.
+
+    Members are stored under `top` (default: the folder name of root).
+    """
+    started = time.monotonic()
+    root = Path(root)
+    archive_path = Path(archive_path)
+    top = top or root.name
+    manifest, excluded = build_manifest(root, keep_debug, workers, include)
+
+    name = archive_path.name
+    for suffix in (".tar.gz", ".tgz"):
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+    manifest_path = archive_path.with_name(f"{name}.{MANIFEST_NAME}")
+    manifest_data = json.dumps({"root": top, "files": manifest}, indent=1).encode(
+        "utf-8"
+    )
+    manifest_path.write_bytes(manifest_data)
+
+    report = ArchiveReport(archive_path, manifest_path, excluded=excluded)
+    tmp_path = archive_path.with_name(f"{archive_path.name}.{os.getpid()}.tmp")
+    first_by_digest = {}
+    stream = None
+    try:
+        with open(tmp_path, "wb") as out:
+            stream = ParallelGzipWriter(out, workers)
+            with tarfile.open(
+                fileobj=stream, mode="w|", format=tarfile.PAX_FORMAT
+            ) as tar:
+                info = tarfile.TarInfo(f"{top}/{MANIFEST_NAME}")
+                info.size = len(manifest_data)
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(manifest_data))
+                for entry in manifest:
+                    arcname = f"{top}/{entry['path']}"
+                    report.files += 1
+                    report.bytes_in += entry["size"]
+                    original = first_by_digest.get(entry["blake2b"])
+                    if original is None:
+                        first_by_digest[entry["blake2b"]] = arcname
+                        tar.add(root / entry["path"], arcname, recursive=False)
+                        continue
+                    # Same content already stored: add a hard link to it
+                    info = tar.gettarinfo(root / entry["path"], arcname)
+                    info.type = tarfile.LNKTYPE
+                    info.linkname = original
+                    info.size = 0
+                    tar.addfile(info)
+                    report.duplicates += 1
+                    report.bytes_deduplicated += entry["size"]
+            stream.close()
+        os.replace(tmp_path, archive_path)
+    finally:
+        # On failure: stop the compression threads and drop the partial file
+        if stream is not None:
+            stream.pool.shutdown(cancel_futures=True)
+        tmp_path.unlink(missing_ok=True)
+
+    report.bytes_out = archive_path.stat().st_size
+    report.seconds = time.monotonic() - started
+    return report
+
+
+def describe_archive(report):
+    lines = [
+        f"Archive: {report.archive_path} ({format_size(report.bytes_out)}, "
+        f"{report.files} files from {format_size(report.bytes_in)} "
+        f"in {report.seconds:.1f}s)",
+        f"Manifest: {report.manifest_path}",
+    ]
+    if report.duplicates:
+        lines.append(
+            f"{report.duplicates} duplicate file(s) stored once, "
+            f"saving {format_size(report.bytes_deduplicated)}"
+        )
+    if report.excluded:
+        lines.append(f"{report.excluded} intermediate/debug file(s) left out")
+    return "\n".join(lines)
@@ -0,0 +1,280 @@
+"""Pre-flight checks of a .uplugin against the target engine.
+
+Missing plugin dependencies, bad module types or loading phases and module
+name clashes otherwise only show up minutes into BuildPlugin. The engine's
+bundled plugins are indexed once into a `PluginCatalog`, cached on disk and
+shared in memory by every job that targets the same engine, so checking a
+plugin takes milliseconds.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .core import user_cache_dir, write_json_atomic
+
+CATALOG_FORMAT = 2
+
+MODULE_TYPES = {
+    "Runtime",
+    "RuntimeNoCommandlet",
+    "RuntimeAndProgram",
+    "CookedOnly",
+    "UncookedOnly",
+    "Developer",
+    "DeveloperTool",
+    "Editor",
+    "EditorNoCommandlet",
+    "EditorAndProgram",
+    "Program",
+    "ServerOnly",
+    "ClientOnly",
+    "ClientOnlyNoCommandlet",
+}
+LOADING_PHASES = {
+    "EarliestPossible",
+    "PostConfigInit",
+    "PostSplashScreen",
+    "PreEarlyLoadingScreen",
+    "PreLoadingScreen",
+    "PreDefault",
+    "Default",
+    "PostDefault",
+    "PostEngineInit",
+    "None",
+}
+# Folders inside a plugin that never contain further .uplugin files
+SKIPPED_CATALOG_DIRS = {
+    "Binaries",
+    "Config",
+    "Content",
+    "Intermediate",
+    "Resources",
+    "Shaders",
+    "Source",
+    "ThirdParty",
+}
+
+
+def default_catalogs_dir():
+    return user_cache_dir() / "plugin-catalogs"
+
+
+def catalog_plugin_dirs(ue_root_path):
+    """Engine/Plugins and the Plugins folders of platform extensions"""
+    engine_dir = Path(ue_root_path) / "Engine"
+    folders = [engine_dir / "Plugins"]
+    try:
+        platforms = sorted(entry.path for entry in os.scandir(engine_dir / "Platforms"))
+    except OSError:
+        platforms = []
+    folders.extend(
+        Path(platform) / "Plugins"
+        for platform in platforms
+        if (Path(platform) / "Plugins").is_dir()
+    )
+    return folders
+
+
+def read_descriptor(path):
+    """Parsed .uplugin JSON (descriptors may start with a BOM)"""
+    return json.loads(Path(path).read_text(encoding="utf-8-sig"))
+
+
+@dataclass
+class PluginCatalog:
+    """Bundled plugins of one engine: plugin name -> module name -> type"""
+
+    plugins: dict = field(default_factory=dict)
+
+    @property
+    def module_owners(self):
+        return {
+            module: plugin
+            for plugin, modules in self.plugins.items()
+            for module in modules
+        }
+
+    @classmethod
+    def scan(cls, ue_root_path):
+        catalog = cls()
+        for plugins_dir in catalog_plugin_dirs(ue_root_path):
+            for dirpath, dirnames, filenames in os.walk(plugins_dir):
+                dirnames[:] = [
+                    name for name in dirnames if name not in SKIPPED_CATALOG_DIRS
+                ]
+                for filename in filenames:
+                    if not filename.endswith(".uplugin"):
+                        continue
+                    try:
+                        descriptor = read_descriptor(Path(dirpath) / filename)
+                    except (OSError, ValueError):
+                        continue
+                    catalog.plugins[filename[: -len(".uplugin")]] = {
+                        module.get("Name", ""): module.get("Type", "")
+                        for module in descriptor.get("Modules", [])
+                    }
+        return catalog
+
+
+def catalog_signature(ue_root_path):
+    """Changes whenever the engine version or its plugin folders change"""
+    engine_dir = Path(ue_root_path) / "Engine"
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        digest.update((engine_dir / "Build" / "Build.version").read_bytes())
+    except OSError:
+        pass
+    folders = []
+    for plugins_dir in catalog_plugin_dirs(ue_root_path):
+        try:
+            folders += [plugins_dir] + sorted(
+                Path(entry.path) for entry in os.scandir(plugins_dir) if entry.is_dir()
+            )
+        except OSError:
+            pass
+    for folder in folders:
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            # Removed since it was listed, or unreadable
+            continue
+        digest.update(f"{folder}:{mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+_catalogs = {}
+_catalog_locks = {}
+_catalogs_lock = threading.Lock()
+
+
+def engine_catalog(ue_root_path, catalogs_dir=None):
+    """Catalog for an engine, built at most once and shared by all callers"""
+    key = os.path.normcase(str(Path(ue_root_path).resolve()))
+    with _catalogs_lock:
+        lock = _catalog_locks.setdefault(key, threading.Lock())
+
+    with lock:
+        signature = catalog_signature(ue_root_path)
+        cached = _catalogs.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        catalogs_dir = Path(catalogs_dir) if catalogs_dir else default_catalogs_dir()
+        cache_file = (
+            catalogs_dir
+            / f"{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}.json"
+        )
+        catalog = None
+        try:
+            data = json.loads(cache_file.read_text(encoding="utf-8"))
+            if data["format"] == CATALOG_FORMAT and data["signature"] == signature:
+                catalog = PluginCatalog(plugins=data["plugins"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+        if catalog is None:
+            catalog = PluginCatalog.scan(ue_root_path)
+            try:
+                catalogs_dir.mkdir(parents=True, exist_ok=True)
+                write_json_atomic(
+                    cache_file,
+                    {
+                        "format": CATALOG_FORMAT,
+                        "signature": signature,
+                        "root": str(ue_root_path),
+                        "plugins": catalog.plugins,
+                    },
+                )
+            except OSError:
+                pass
+
+        _catalogs[key] = (signature, catalog)
+        return catalog
+
+
+@dataclass
+class PreflightReport:
+    errors: list = field(default_factory=list)
+    warnings: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def check_plugin(job, catalog=None):
+    """Validate job's .uplugin against the target engine's plugin catalog"""
+    started = time.perf_counter()
+    report = PreflightReport()
+    uplugin_path = Path(job.uplugin_path)
+
+    try:
+        descriptor = read_descriptor(uplugin_path)
+    except OSError as ex:
+        report.errors.append(f"Cannot read {uplugin_path.name}: {ex.strerror}")
+        return report
+    except ValueError as ex:
+        report.errors.append(f"{uplugin_path.name} is not valid JSON: {ex}")
+        return report
+
+    if catalog is None:
+        catalog = engine_catalog(job.ue_root_path)
+    plugin_name = uplugin_path.stem
+
+    if plugin_name in catalog.plugins:
+        report.warnings.append(
+            f"The engine already ships a plugin named '{plugin_name}'"
+        )
+
+    engine_owners = catalog.module_owners
+    # UBT finds *.Build.cs anywhere below Source, e.g. Source/Runtime/Foo
+    build_files = {
+        path.name[: -len(".Build.cs")]
+        for path in (uplugin_path.parent / "Source").rglob("*.Build.cs")
+    }
+    for module in descriptor.get("Modules", []):
+        name = module.get("Name")
+        if not name:
+            report.errors.append('A module entry has no "Name"')
+            continue
+        module_type = module.get("Type")
+        if module_type not in MODULE_TYPES:
+            report.errors.append(f"Module '{name}' has unknown Type '{module_type}'")
+        elif module_type == "Developer":
+            report.warnings.append(
+                f"Module '{name}' uses the deprecated Type 'Developer' "
+                "(use 'DeveloperTool' or 'UncookedOnly')"
+            )
+        phase = module.get("LoadingPhase", "Default")
+        if phase not in LOADING_PHASES:
+            report.errors.append(f"Module '{name}' has unknown LoadingPhase '{phase}'")
+        if name in engine_owners:
+            report.errors.append(
+                f"Module '{name}' clashes with a module of the engine plugin "
+                f"'{engine_owners[name]}'"
+            )
+        if name not in build_files:
+            report.errors.append(f"Module '{name}' has no {name}.Build.cs under Source")
+
+    for dependency in descriptor.get("Plugins", []):
+        name = dependency.get("Name")
+        if not name or not dependency.get("Enabled", True):
+            continue
+        if name in catalog.plugins:
+            continue
+        message = f"Depends on plugin '{name}', which is not bundled with this engine"
+        if dependency.get("Optional"):
+            report.warnings.append(message + " (optional)")
+        else:
+            report.errors.append(message)
+
+    report.seconds = time.perf_counter() - started
+    return report
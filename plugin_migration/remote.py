@@ -0,0 +1,554 @@
+"""Remote build workers.
+
+A build agent (`UnrealPluginMigrationTool.py agent --engine 5.4`) runs
+BuildPlugin on behalf of other machines, and `WorkerPool` hands jobs to a
+set of agents. Each request uses its own TCP connection. Every message is
+one JSON line; a message with a "size" is followed by that many bytes of
+payload, a .tar.gz:
+
+    client -> agent  {"type": "hello", "protocol": 1}
+    agent -> client  {"type": "hello", "protocol": 1, "host": "...",
+                      "capacity": 2, "busy": 0, "engines": ["5.3", "5.4"]}
+
+    client -> agent  {"type": "build", "protocol": 1, "plugin": "X/X.uplugin",
+                      "engine": "5.4", "extra_args": [...],
+                      "split_platforms": [...], "size": N} + plugin source
+    agent -> client  {"type": "output", "lines": [...]}  (repeated)
+    agent -> client  {"type": "result", "success": true, "message": "...",
+                      "size": N} + package
+
+Output lines arrive unshortened and go through the client's parser and
+build log like local UAT output; message lines have no length limit. A
+client cancels a build by closing its connection, which the agent notices
+right away and answers by stopping the build. The protocol has no authentication: agents
+listen on localhost unless told otherwise and should only be exposed on
+trusted networks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import platform
+import re
+import shutil
+import tarfile
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .budget import CoreBudget
+from .cache import iter_files
+from .core import (
+    FAILURE_TAIL_LINES,
+    MigrationJob,
+    format_size,
+    read_engine_version,
+    record_output,
+    run_split_build,
+    run_uat_command,
+)
+from .incremental import iter_plugin_files
+from .streams import read_long_line
+
+PROTOCOL_VERSION = 1
+DEFAULT_AGENT_PORT = 47810
+DEFAULT_AGENT_CAPACITY = 2
+CONNECT_TIMEOUT = 5.0
+TRANSFER_CHUNK_SIZE = 1024 * 1024
+# Transfers favour speed: sources and binaries are compressed once per run
+TRANSFER_COMPRESS_LEVEL = 1
+
+
+def parse_worker(entry):
+    """(host, port) from "host:port" or "host" (default port)"""
+    host, _, port = entry.strip().rpartition(":")
+    if not host:
+        return entry.strip(), DEFAULT_AGENT_PORT
+    return host, int(port)
+
+
+def parse_workers(text):
+    """(host, port) pairs from entries separated by whitespace or commas"""
+    return [parse_worker(entry) for entry in re.split(r"[\s,]+", text) if entry]
+
+
+def pack_tree(files, archive_path):
+    """Write `(arcname, path)` pairs into a quickly compressed .tar.gz"""
+    with tarfile.open(
+        archive_path, "w:gz", compresslevel=TRANSFER_COMPRESS_LEVEL
+    ) as tar:
+        for arcname, path in files:
+            tar.add(path, arcname, recursive=False)
+
+
+def pack_plugin(job, archive_path):
+    """The plugin source as `<Plugin>/...`, without build output"""
+    pack_tree(
+        (
+            (f"{job.plugin_name}/{relative}", path)
+            for relative, path in iter_plugin_files(job.plugin_dir)
+        ),
+        archive_path,
+    )
+
+
+def pack_package(package_dir, archive_path):
+    pack_tree(
+        (
+            (path.relative_to(package_dir).as_posix(), path)
+            for path in iter_files(package_dir)
+        ),
+        archive_path,
+    )
+
+
+def unpack_tree(archive_path, target_dir):
+    """Extract an archive made by `pack_tree`, refusing links and escaping paths"""
+    target_dir = Path(target_dir).resolve()
+    target_dir.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(archive_path, "r:gz") as tar:
+        members = tar.getmembers()
+        for member in members:
+            path = (target_dir / member.name).resolve()
+            if not (member.isfile() or member.isdir()) or not path.is_relative_to(
+                target_dir
+            ):
+                raise ValueError(f"Unsafe archive member: {member.name}")
+        tar.extractall(target_dir, members)
+
+
+async def send_message(writer, message, payload=None):
+    """Send one message, followed by the file `payload` when given"""
+    if payload is not None:
+        message = dict(message, size=Path(payload).stat().st_size)
+    writer.write(json.dumps(message).encode("utf-8") + b"\n")
+    if payload is not None:
+        with open(payload, "rb") as f:
+            while chunk := f.read(TRANSFER_CHUNK_SIZE):
+                writer.write(chunk)
+                await writer.drain()
+    await writer.drain()
+
+
+async def read_message(reader, payload_path=None):
+    """Read one message; its payload, if any, is saved to `payload_path`"""
+    line = await read_long_line(reader)
+    if not line:
+        raise ConnectionError("Connection closed")
+    message = json.loads(line)
+    size = message.get("size")
+    if size is not None:
+        if payload_path is None:
+            raise ValueError(f"Unexpected payload with {message.get('type')}")
+        with open(payload_path, "wb") as f:
+            remaining = size
+            while remaining:
+                chunk = await reader.read(min(TRANSFER_CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ConnectionError("Connection closed during transfer")
+                f.write(chunk)
+                remaining -= len(chunk)
+    return message
+
+
+async def close_connection(writer):
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+
+
+class RemoteOutput:
+    """`BuildLog` stand-in on the agent that forwards lines to the client.
+
+    Lines are batched and sent whenever the runner drains between chunks.
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.lines = []
+
+    def write(self, line, is_error=False):
+        self.lines.append(line)
+
+    def flush(self):
+        if self.lines:
+            message = {"type": "output", "lines": self.lines}
+            self.writer.write(json.dumps(message).encode("utf-8") + b"\n")
+            self.lines = []
+
+    async def drain(self):
+        self.flush()
+        await self.writer.drain()
+
+
+class BuildAgent:
+    """Runs BuildPlugin for remote clients against the engines it was given.
+
+    At most `capacity` builds run at once; further requests wait for a slot.
+    The machine's cores and memory are split evenly between the slots.
+    """
+
+    def __init__(
+        self, engine_roots, capacity=DEFAULT_AGENT_CAPACITY, work_dir=None, log=print
+    ):
+        self.engines = {read_engine_version(root): str(root) for root in engine_roots}
+        self.capacity = max(1, capacity)
+        self.busy = 0
+        self.slots = None
+        self.budget = None
+        self.work_dir = (
+            Path(work_dir)
+            if work_dir
+            else Path(tempfile.gettempdir()) / "plugin-migration-agent"
+        )
+        self.log = log
+
+    async def listen(self, host="127.0.0.1", port=DEFAULT_AGENT_PORT):
+        """Start accepting requests; returns the `asyncio.Server`"""
+        self.slots = asyncio.Semaphore(self.capacity)
+        self.budget = CoreBudget.shared(self.capacity)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def serve_forever(self, host="127.0.0.1", port=DEFAULT_AGENT_PORT):
+        server = await self.listen(host, port)
+        async with server:
+            await server.serve_forever()
+
+    def info(self):
+        return {
+            "type": "hello",
+            "protocol": PROTOCOL_VERSION,
+            "host": platform.node(),
+            "capacity": self.capacity,
+            "busy": self.busy,
+            "engines": sorted(self.engines),
+        }
+
+    async def handle(self, reader, writer):
+        build_dir = Path(tempfile.mkdtemp(prefix="build-", dir=self.work_dir))
+        peer = writer.get_extra_info("peername")
+        try:
+            request = await read_message(reader, build_dir / "plugin.tar.gz")
+            if request.get("protocol") != PROTOCOL_VERSION:
+                await send_message(
+                    writer,
+                    {
+                        "type": "result",
+                        "success": False,
+                        "message": f"Unsupported protocol {request.get('protocol')}",
+                    },
+                )
+            elif request["type"] == "hello":
+                await send_message(writer, self.info())
+            elif request["type"] == "build":
+                await self.build(request, build_dir, reader, writer)
+        except (OSError, ValueError, KeyError, tarfile.TarError) as ex:
+            self.log(f"Request from {peer} failed: {ex}")
+        finally:
+            await asyncio.to_thread(shutil.rmtree, build_dir, True)
+            await close_connection(writer)
+
+    async def build(self, request, build_dir, reader, writer):
+        engine_version = request["engine"]
+        if engine_version not in self.engines:
+            message = f"UE {engine_version} is not available on {platform.node()}"
+            await send_message(
+                writer, {"type": "result", "success": False, "message": message}
+            )
+            return
+
+        plugin_root = build_dir / "plugin"
+        await asyncio.to_thread(unpack_tree, build_dir / "plugin.tar.gz", plugin_root)
+        uplugin_path = (plugin_root / request["plugin"]).resolve()
+        if not uplugin_path.is_relative_to(plugin_root.resolve()):
+            raise ValueError(f"Plugin path outside the upload: {request['plugin']}")
+        job = MigrationJob(
+            uplugin_path=str(uplugin_path),
+            destination_path=str(build_dir / "out"),
+            ue_root_path=self.engines[engine_version],
+            extra_args=list(request.get("extra_args", [])),
+            split_platforms=list(request.get("split_platforms", [])),
+        )
+        label = f"{job.plugin_name} @ UE {engine_version}"
+
+        # The client sends nothing more; EOF means it went away or cancelled
+        task = asyncio.ensure_future(
+            self.run_build(job, label, request, build_dir, writer)
+        )
+        closed = asyncio.ensure_future(reader.read(1))
+        try:
+            await asyncio.wait([task, closed], return_when=asyncio.FIRST_COMPLETED)
+            if not task.done():
+                self.log(f"[{label}] client disconnected, stopping the build")
+                task.cancel()
+                await asyncio.wait([task])
+                return
+            task.result()
+        finally:
+            task.cancel()
+            closed.cancel()
+            if closed.done() and not closed.cancelled():
+                # A reset connection; already handled as a disconnect
+                closed.exception()
+
+    async def run_build(self, job, label, request, build_dir, writer):
+        async with self.slots:
+            self.busy += 1
+            started = time.monotonic()
+            success = False
+            self.log(f"[{label}] building ({self.busy}/{self.capacity} slots busy)")
+            try:
+                output = RemoteOutput(writer)
+                runner = run_split_build if job.split_platforms else run_uat_command
+                success, message = await runner(
+                    job,
+                    log=lambda message: None,
+                    build_log=output,
+                    drain=output.drain,
+                    budget=self.budget,
+                    fail_fast=bool(request.get("fail_fast")),
+                )
+                output.flush()
+                result = {"type": "result", "success": success, "message": message}
+                if success:
+                    package = build_dir / "package.tar.gz"
+                    await asyncio.to_thread(pack_package, job.package_dir, package)
+                    await send_message(writer, result, package)
+                else:
+                    await send_message(writer, result)
+            finally:
+                self.busy -= 1
+                self.log(
+                    f"[{label}] {'done' if success else 'failed'} "
+                    f"in {time.monotonic() - started:.1f}s"
+                )
+
+
+@dataclass
+class RemoteWorker:
+    host: str
+    port: int
+    name: str = ""
+    capacity: int = 0
+    busy: int = 0
+    engines: list = field(default_factory=list)
+
+    @property
+    def address(self):
+        return f"{self.host}:{self.port}"
+
+    @property
+    def free(self):
+        return self.capacity - self.busy
+
+
+class WorkerPool:
+    """Client side: runs jobs on remote agents.
+
+    Each job goes to the agent with the most free slots among those that
+    have its engine version, waiting when all of them are busy. `run` has
+    the same contract as `run_uat_command`, so it slots into `run_migration`
+    (and thus the build cache, history and queue) as just another runner.
+    """
+
+    def __init__(self, addresses, log=print):
+        self.workers = [RemoteWorker(host, port) for host, port in addresses]
+        self.log = log
+        self.connected = False
+        self.connect_lock = asyncio.Lock()
+        self.changed = asyncio.Condition()
+        self.jobs_per_worker = {}
+
+    @property
+    def capacity(self):
+        return sum(worker.capacity for worker in self.workers)
+
+    async def hello(self, worker):
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(worker.host, worker.port),
+            CONNECT_TIMEOUT,
+        )
+        try:
+            await send_message(writer, {"type": "hello", "protocol": PROTOCOL_VERSION})
+            reply = await asyncio.wait_for(read_message(reader), CONNECT_TIMEOUT)
+        finally:
+            await close_connection(writer)
+        if reply.get("type") != "hello":
+            raise ConnectionError(reply.get("message", "Unexpected reply"))
+        worker.name = reply["host"]
+        worker.capacity = reply["capacity"]
+        worker.engines = reply["engines"]
+
+    async def connect(self):
+        """Ask every agent for its capacity and engines; unreachable ones are dropped"""
+        async with self.connect_lock:
+            if self.connected:
+                return self.workers
+            results = await asyncio.gather(
+                *(self.hello(worker) for worker in self.workers),
+                return_exceptions=True,
+            )
+            reachable = []
+            for worker, result in zip(self.workers, results):
+                if isinstance(result, Exception):
+                    self.log(
+                        f"⚠ Build worker {worker.address} is unavailable: "
+                        f"{result or type(result).__name__}"
+                    )
+                    continue
+                self.log(
+                    f"Build worker {worker.address} ({worker.name}): "
+                    f"{worker.capacity} slot(s), UE {', '.join(worker.engines)}"
+                )
+                reachable.append(worker)
+            self.workers = reachable
+            self.connected = True
+            return self.workers
+
+    async def acquire(self, engine_version):
+        """Reserve a slot on the least busy agent with this engine, or None"""
+        await self.connect()
+        candidates = [
+            worker for worker in self.workers if engine_version in worker.engines
+        ]
+        if not candidates:
+            return None
+        async with self.changed:
+            await self.changed.wait_for(
+                lambda: any(worker.free > 0 for worker in candidates)
+            )
+            worker = max(candidates, key=lambda worker: worker.free)
+            worker.busy += 1
+        return worker
+
+    async def release(self, worker):
+        async with self.changed:
+            worker.busy -= 1
+            self.changed.notify_all()
+
+    async def run(
+        self,
+        job,
+        log=print,
+        parser=None,
+        build_log=None,
+        drain=None,
+        monitor=None,
+        budget=None,
+        fail_fast=False,
+        on_launch=None,
+    ):
+        """Build `job` on a remote agent and unpack the result into its package dir.
+
+        `monitor` and `budget` are accepted for the runner contract; remote
+        processes are not sampled and agents keep their own core budget.
+        `fail_fast` is applied by the agent. `on_launch()` is called before
+        the received package replaces the local one. Cancelling closes the
+        connection, which stops the remote build.
+        """
+        engine_version = read_engine_version(job.ue_root_path)
+        if job.incremental:
+            log(
+                "Note: build workers do not keep incremental workspaces; running BuildPlugin"
+            )
+        transfer_dir = Path(tempfile.mkdtemp(prefix="plugin-migration-"))
+        worker = None
+        try:
+            upload = transfer_dir / "plugin.tar.gz"
+            await asyncio.to_thread(pack_plugin, job, upload)
+            worker = await self.acquire(engine_version)
+            if worker is None:
+                message = f"No build worker has UE {engine_version}"
+                log(message)
+                return False, message
+            return await self.run_on(
+                worker,
+                job,
+                engine_version,
+                upload,
+                log,
+                parser,
+                build_log,
+                drain,
+                fail_fast,
+                on_launch,
+            )
+        except (OSError, ValueError, KeyError, tarfile.TarError) as ex:
+            where = f"Build worker {worker.address}" if worker else "Remote build"
+            message = f"{where} failed: {ex or type(ex).__name__}"
+            log(message)
+            if build_log is not None:
+                build_log.write(message, is_error=True)
+            return False, message
+        finally:
+            if worker is not None:
+                await self.release(worker)
+            await asyncio.to_thread(shutil.rmtree, transfer_dir, True)
+
+    async def run_on(
+        self,
+        worker,
+        job,
+        engine_version,
+        upload,
+        log,
+        parser,
+        build_log,
+        drain,
+        fail_fast=False,
+        on_launch=None,
+    ):
+        started = time.monotonic()
+        self.jobs_per_worker[worker.address] = (
+            self.jobs_per_worker.get(worker.address, 0) + 1
+        )
+        log(
+            f"Sending {job.plugin_name} ({format_size(upload.stat().st_size)}) "
+            f"to build worker {worker.address} ({worker.name})"
+        )
+        reader, writer = await asyncio.open_connection(worker.host, worker.port)
+        download = upload.with_name("package.tar.gz")
+        tail_lines = deque(maxlen=FAILURE_TAIL_LINES)
+        try:
+            request = {
+                "type": "build",
+                "protocol": PROTOCOL_VERSION,
+                "plugin": f"{job.plugin_name}/{Path(job.uplugin_path).name}",
+                "engine": engine_version,
+                "extra_args": job.extra_args,
+                "split_platforms": job.split_platforms,
+                "fail_fast": fail_fast,
+            }
+            await send_message(writer, request, upload)
+            while True:
+                message = await read_message(reader, download)
+                if message["type"] != "output":
+                    break
+                record_output(message["lines"], log, parser, build_log, tail_lines)
+                if drain is not None:
+                    await drain()
+        finally:
+            await close_connection(writer)
+
+        if message["type"] != "result":
+            raise ValueError(f"Unexpected message {message['type']}")
+        if not message["success"]:
+            return False, "\n".join(tail_lines) or message["message"]
+        if message.get("size") is None:
+            raise ValueError("No package received")
+        size = download.stat().st_size
+        if on_launch is not None:
+            on_launch()
+        await asyncio.to_thread(shutil.rmtree, job.package_dir, True)
+        await asyncio.to_thread(unpack_tree, download, job.package_dir)
+        log(
+            f"Received package from {worker.address} ({format_size(size)}), "
+            f"remote build took {time.monotonic() - started:.1f}s"
+        )
+        return True, message["message"]
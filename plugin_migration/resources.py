@@ -0,0 +1,212 @@
+"""Resource sampling of the build's process tree.
+
+A `ResourceMonitor` follows every process started by `run_command` (UAT,
+then UBT, the compilers and linkers below it) through /proc at a fixed
+interval. Each sample records the number of processes in the tree, their
+CPU use in percent of one core, their combined resident memory and the
+bytes they read from and wrote to storage so far. Samples are appended to
+a CSV file next to the build log and passed to `on_sample` for live
+display; `summary()` condenses a run into one line for sizing machines
+and concurrency.
+
+Sampling needs /proc, so it is only available on Linux.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from .core import format_size
+
+SAMPLE_INTERVAL = 1.0
+PROC = Path("/proc")
+CSV_HEADER = "elapsed,processes,cpu_percent,rss_bytes,read_bytes,write_bytes\n"
+
+
+def sampling_available():
+    return (PROC / "self" / "stat").exists()
+
+
+def resources_path(log_path):
+    """Samples file stored next to a build log"""
+    log_path = Path(log_path)
+    return log_path.with_name(f"{log_path.stem}.resources.csv")
+
+
+def total_memory():
+    """Physical memory in bytes, or None"""
+    try:
+        with open(PROC / "meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def read_stat(pid):
+    """`(ppid, cpu ticks, rss pages)` of a process, or None when it is gone"""
+    try:
+        data = (PROC / str(pid) / "stat").read_bytes()
+    except OSError:
+        return None
+    # The command name may contain spaces and parentheses
+    fields = data[data.rindex(b")") + 2 :].split()
+    return int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[21])
+
+
+def read_io(pid):
+    """`(read_bytes, write_bytes)` of a process, or None when not readable"""
+    try:
+        data = (PROC / str(pid) / "io").read_text(encoding="ascii")
+    except OSError:
+        return None
+    values = dict(line.split(": ") for line in data.splitlines() if ": " in line)
+    return int(values["read_bytes"]), int(values["write_bytes"])
+
+
+class ResourceSample(NamedTuple):
+    elapsed: float
+    processes: int
+    cpu_percent: float
+    rss_bytes: int
+    # Totals so far, including processes that have exited
+    read_bytes: int
+    write_bytes: int
+
+
+class ResourceMonitor:
+    """Samples the process trees below the attached pids.
+
+    Sampling starts with the first `attach()` and pauses while no process is
+    attached, so one monitor can follow a whole migration: split builds
+    attach several UAT runs at once, incremental builds one UBT run after
+    another.
+    """
+
+    def __init__(self, csv_path=None, interval=SAMPLE_INTERVAL, on_sample=None):
+        self.interval = interval
+        self.on_sample = on_sample
+        self.roots = set()
+        self.task = None
+        self.started = time.monotonic()
+        self.ticks_per_second = os.sysconf("SC_CLK_TCK")
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+        self.last_sampled = None
+        self.last_ticks = {}
+        # Last I/O counters of every process seen, exited ones included
+        self.io = {}
+        self.samples = []
+        self.csv_path = Path(csv_path) if csv_path else None
+        self.csv = None
+        if self.csv_path is not None:
+            self.csv = open(self.csv_path, "w", encoding="ascii")
+            self.csv.write(CSV_HEADER)
+
+    def attach(self, pid):
+        self.roots.add(pid)
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+    def detach(self, pid):
+        self.roots.discard(pid)
+
+    async def run(self):
+        while self.roots:
+            sample = await asyncio.to_thread(self.sample)
+            self.record(sample)
+            await asyncio.sleep(self.interval)
+        self.last_sampled = None
+
+    def tree(self):
+        """Stats of the attached processes and all their descendants"""
+        stats = {}
+        children = {}
+        for entry in os.scandir(PROC):
+            if entry.name.isdigit():
+                stat = read_stat(entry.name)
+                if stat is not None:
+                    pid = int(entry.name)
+                    stats[pid] = stat
+                    children.setdefault(stat[0], []).append(pid)
+        tree = {}
+        pending = [pid for pid in self.roots if pid in stats]
+        while pending:
+            pid = pending.pop()
+            tree[pid] = stats[pid]
+            pending.extend(children.get(pid, ()))
+        return tree
+
+    def sample(self):
+        now = time.monotonic()
+        tree = self.tree()
+        ticks = {pid: stat[1] for pid, stat in tree.items()}
+        cpu_percent = 0.0
+        if self.last_sampled is not None:
+            # New processes count from 0, so their whole runtime is included
+            used = sum(
+                count - self.last_ticks.get(pid, 0) for pid, count in ticks.items()
+            )
+            elapsed = max(now - self.last_sampled, 1e-6)
+            cpu_percent = used / self.ticks_per_second / elapsed * 100
+        self.last_sampled = now
+        self.last_ticks = ticks
+        for pid in tree:
+            counters = read_io(pid)
+            if counters is not None:
+                self.io[pid] = counters
+        return ResourceSample(
+            elapsed=now - self.started,
+            processes=len(tree),
+            cpu_percent=cpu_percent,
+            rss_bytes=sum(stat[2] for stat in tree.values()) * self.page_size,
+            read_bytes=sum(counters[0] for counters in self.io.values()),
+            write_bytes=sum(counters[1] for counters in self.io.values()),
+        )
+
+    def record(self, sample):
+        self.samples.append(sample)
+        if self.csv is not None:
+            self.csv.write(
+                f"{sample.elapsed:.2f},{sample.processes},{sample.cpu_percent:.1f},"
+                f"{sample.rss_bytes},{sample.read_bytes},{sample.write_bytes}\n"
+            )
+            self.csv.flush()
+        if self.on_sample is not None:
+            self.on_sample(sample)
+
+    @property
+    def latest(self):
+        return self.samples[-1] if self.samples else None
+
+    def close(self):
+        self.roots.clear()
+        if self.task is not None:
+            self.task.cancel()
+        if self.csv is not None:
+            self.csv.close()
+            self.csv = None
+
+    def summary(self):
+        """One-line profile of the sampled run, or None without samples"""
+        if not self.samples:
+            return None
+        # The first sample has no earlier one to measure CPU time against
+        measured = self.samples[1:] or self.samples
+        cores = os.cpu_count() or 1
+        average_cpu = sum(sample.cpu_percent for sample in measured) / len(measured)
+        last = self.samples[-1]
+        return (
+            f"Resources: CPU avg {average_cpu:.0f}% / peak "
+            f"{max(sample.cpu_percent for sample in self.samples):.0f}% "
+            f"of {cores * 100}%, peak memory "
+            f"{format_size(max(sample.rss_bytes for sample in self.samples))}, "
+            f"up to {max(sample.processes for sample in self.samples)} processes, "
+            f"disk {format_size(last.read_bytes)} read / "
+            f"{format_size(last.write_bytes)} written"
+        )
@@ -0,0 +1,189 @@
+"""Local staging of the plugin source.
+
+BuildPlugin reads the plugin straight from its folder, which may be on a
+slow network share or sit next to gigabytes of Binaries and Intermediate.
+With source staging the plugin is first mirrored into a local folder (in
+the per-user cache, or under `stage_root`, e.g. a tmpfs) and BuildPlugin
+reads that copy instead:
+
+- Generated folders (Binaries, Intermediate, Saved, VCS/IDE folders) are
+  left out.
+- Files are cloned as reflinks where the file system supports them (Btrfs,
+  XFS, APFS), hard linked within one file system, and copied otherwise.
+- The staged copy is kept between runs; only files whose size or mtime
+  changed are staged again and deleted files are removed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from .core import IS_MACOS, format_size, user_cache_dir, write_json_atomic
+from .incremental import iter_plugin_files
+
+STAGE_FORMAT = 1
+REFLINK = "reflink"
+HARDLINK = "hardlink"
+COPY = "copy"
+# Cheapest first; a method is dropped for the rest of a sync once it fails
+CLONE_METHODS = (REFLINK, HARDLINK, COPY)
+# ioctl(FICLONE) from linux/fs.h
+FICLONE = 0x40049409
+
+# One job at a time per staged copy, from its sync to the end of its build
+_stage_locks = {}
+
+
+def default_stage_root():
+    return user_cache_dir() / "source-staging"
+
+
+def reflink_supported():
+    return sys.platform.startswith("linux") or IS_MACOS
+
+
+def reflink(source, target):
+    """Clone `source` to the new file `target` sharing its data blocks"""
+    if IS_MACOS:
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(source), os.fsencode(target), 0) != 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(source))
+        return
+    import fcntl
+
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(source, target)
+
+
+@dataclass
+class StageReport:
+    stage_dir: Path
+    files: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    # Files staged per method
+    methods: dict = field(default_factory=lambda: dict.fromkeys(CLONE_METHODS, 0))
+    bytes_total: int = 0
+    bytes_copied: int = 0
+    seconds: float = 0.0
+
+
+class SourceStage:
+    """Local mirror of one plugin's source folder"""
+
+    def __init__(self, job, stage_root=None):
+        self.job = job
+        identity = os.path.normcase(str(Path(job.plugin_dir).resolve()))
+        suffix = hashlib.blake2b(identity.encode(), digest_size=4).hexdigest()
+        stage_root = Path(stage_root) if stage_root else default_stage_root()
+        self.dir = stage_root / f"{job.plugin_name}-{suffix}"
+        self.plugin_dir = self.dir / job.plugin_name
+        self.state_file = self.dir / "stage.json"
+
+    def load_state(self):
+        try:
+            state = json.loads(self.state_file.read_text(encoding="utf-8"))
+            if state.get("format") == STAGE_FORMAT:
+                return state
+        except (OSError, ValueError):
+            pass
+        return {"format": STAGE_FORMAT, "files": {}}
+
+    def sync(self):
+        """Bring the staged copy up to date; returns a StageReport"""
+        started = time.monotonic()
+        report = StageReport(self.dir)
+        methods = [
+            method
+            for method in CLONE_METHODS
+            if method != REFLINK or reflink_supported()
+        ]
+        staged = self.load_state()["files"]
+        current = {}
+        for relative, source in iter_plugin_files(self.job.plugin_dir):
+            stat = source.stat()
+            signature = [stat.st_size, stat.st_mtime_ns]
+            current[relative] = signature
+            report.files += 1
+            report.bytes_total += stat.st_size
+            target = self.plugin_dir / relative
+            if staged.get(relative) == signature and target.exists():
+                report.unchanged += 1
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            for method in list(methods):
+                try:
+                    target.unlink(missing_ok=True)
+                    if method == REFLINK:
+                        reflink(source, target)
+                    elif method == HARDLINK:
+                        os.link(source, target)
+                    else:
+                        shutil.copy2(source, target)
+                        report.bytes_copied += stat.st_size
+                except OSError:
+                    if method == COPY:
+                        raise
+                    # Not supported between these folders, e.g. another volume
+                    methods.remove(method)
+                    continue
+                report.methods[method] += 1
+                break
+
+        for relative in staged.keys() - current.keys():
+            try:
+                (self.plugin_dir / relative).unlink()
+                report.removed += 1
+            except FileNotFoundError:
+                pass
+
+        write_json_atomic(self.state_file, {"format": STAGE_FORMAT, "files": current})
+        report.seconds = time.monotonic() - started
+        return report
+
+    def staged_job(self):
+        """`job` reading its plugin from the staged copy"""
+        return replace(
+            self.job,
+            uplugin_path=str(self.plugin_dir / Path(self.job.uplugin_path).name),
+        )
+
+
+def describe_stage(report):
+    staged = ", ".join(
+        f"{count} {method}" for method, count in report.methods.items() if count
+    )
+    return (
+        f"Staged plugin source in {report.stage_dir} in {report.seconds:.1f}s: "
+        f"{report.files} files ({format_size(report.bytes_total)}), "
+        f"{report.unchanged} unchanged, {staged or 'none staged'}, "
+        f"{report.removed} removed, {format_size(report.bytes_copied)} copied"
+    )
+
+
+@asynccontextmanager
+async def stage_plugin_source(job, log=print):
+    """Stage `job`'s plugin (under `job.stage_root`) and yield the staged job.
+
+    The staged copy stays locked until the block exits, so another job
+    staging the same plugin can't change it while BuildPlugin reads it.
+    """
+    stage = SourceStage(job, job.stage_root or None)
+    lock = _stage_locks.setdefault(stage.dir, asyncio.Lock())
+    async with lock:
+        report = await asyncio.to_thread(stage.sync)
+        log(describe_stage(report))
+        yield stage.staged_job()
@@ -0,0 +1,78 @@
+"""Chunked reader for subprocess output.
+
+`StreamReader.readline()` is limited to 64 KiB per line (longer UBT lines
+raise `LimitOverrunError`) and costs a decode and a task switch per line.
+`read_lines()` instead reads large chunks, decodes them with an incremental
+UTF-8 decoder (so multi-byte characters split across chunks survive), splits
+lines itself and hands them out in batches. Lines of any length are kept
+whole; `display_line()` shortens them for the console only.
+
+`read_long_line()` is the same for protocols that mix lines with binary
+payloads on one stream: it reads one line of any length without reading
+past it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+
+READ_CHUNK_SIZE = 256 * 1024
+# Longer lines are shortened in the console (the build log keeps them whole)
+MAX_DISPLAY_LINE_CHARS = 4000
+
+
+def display_line(line):
+    if len(line) <= MAX_DISPLAY_LINE_CHARS:
+        return line
+    hidden = len(line) - MAX_DISPLAY_LINE_CHARS
+    return f"{line[:MAX_DISPLAY_LINE_CHARS]} … [{hidden} more characters in the log]"
+
+
+async def read_lines(stream, chunk_size=READ_CHUNK_SIZE):
+    """Yield lists of complete, right-stripped lines read from `stream`.
+
+    One list is produced per chunk read. A partial line at the end of a
+    chunk is carried over as a list of pieces, so an arbitrarily long line
+    costs linear time and is joined once when its newline arrives.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    partial = []
+    while True:
+        chunk = await stream.read(chunk_size)
+        final = not chunk
+        text = decoder.decode(chunk, final=final)
+
+        lines = text.split("\n")
+        if len(lines) > 1:
+            partial.append(lines[0])
+            lines[0] = "".join(partial)
+            partial = [lines.pop()]
+            yield [line.rstrip() for line in lines]
+        elif text:
+            partial.append(text)
+
+        if final:
+            last = "".join(partial).rstrip()
+            if last:
+                yield [last]
+            return
+
+
+async def read_long_line(stream):
+    """One line (with its newline) of any length; b"" at EOF.
+
+    `readuntil()` stops at the stream's buffer limit, so longer lines are
+    taken out of the buffer piece by piece until their newline arrives.
+    """
+    pieces = []
+    while True:
+        try:
+            pieces.append(await stream.readuntil(b"\n"))
+            break
+        except asyncio.LimitOverrunError as ex:
+            pieces.append(await stream.readexactly(ex.consumed))
+        except asyncio.IncompleteReadError as ex:
+            pieces.append(ex.partial)
+            break
+    return b"".join(pieces)
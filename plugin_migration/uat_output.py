@@ -0,0 +1,173 @@
+"""Incremental parser for RunUAT / UnrealBuildTool output.
+
+`UatOutputParser.feed()` is called once per output line and turns the
+interesting ones into `UatEvent`s: UBT action counters (`[12/345] Compile
+...`), module boundaries, warnings, errors and BuildPlugin phases. It has to
+keep up with UBT at full speed, so every pattern is precompiled and most
+lines are rejected by a cheap substring test before any regex runs.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import NamedTuple
+
+ACTION = "action"
+PHASE = "phase"
+WARNING = "warning"
+ERROR = "error"
+
+# "[12/345] Compile [x64] Module.MyPlugin.cpp"
+ACTION_RE = re.compile(r"^\[(\d+)/(\d+)\]\s+(.*)")
+# Unity files and link outputs name the module being built
+MODULE_RE = re.compile(
+    r"Module\.(\w+?)(?:\.\d+)?\.cpp|Unreal\w*?-(\w+?)(?:-\w+)*\.(?:dll|so|dylib|lib)"
+)
+# "Foo.cpp(12): error C2065:", "error: ...", "ERROR: ...", "LogInit: Error: ..."
+ERROR_RE = re.compile(
+    r"(?:^|[\s):])(?:fatal )?error(?: [A-Z]{1,3}\d+)?\s*:", re.IGNORECASE
+)
+WARNING_RE = re.compile(r"(?:^|[\s):])warning(?: [A-Z]{1,3}\d+)?\s*:", re.IGNORECASE)
+# "AutomationTool exiting with ExitCode=25 (Error_Unknown)"
+EXIT_CODE_RE = re.compile(r"ExitCode=(-?\d+)")
+
+# Substring -> phase name, checked in order on lines that are not actions
+PHASES = (
+    ("BUILD COMMAND STARTED", "Starting"),
+    ("Reading plugin", "Reading plugin"),
+    ("Building plugin for host platforms", "Building for host platforms"),
+    ("Building plugin for target platforms", "Building for target platforms"),
+    ("Running UnrealBuildTool", "Compiling"),
+    ("UnrealBuildTool.dll", "Compiling"),
+    ("UnrealBuildTool.exe", "Compiling"),
+    ("Building ", "Compiling"),
+    ("Copying ", "Packaging"),
+    ("Writing ", "Packaging"),
+    ("BUILD SUCCESSFUL", "Build successful"),
+    ("BUILD FAILED", "Build failed"),
+    ("AutomationTool exiting", "Finished"),
+)
+PHASE_HINTS = tuple(marker for marker, _ in PHASES)
+
+
+class UatEvent(NamedTuple):
+    kind: str
+    text: str
+    current: int = 0
+    total: int = 0
+    # Set on the first action of a new module
+    module: str = ""
+
+
+class UatOutputParser:
+    """Turns UAT output lines into events and keeps running totals.
+
+    `on_event(event)` is called for every recognised line. Counters are
+    available as attributes at any time and once the run has finished, and
+    `phase_durations()` tells how long each phase took.
+    """
+
+    def __init__(self, on_event=None):
+        self.on_event = on_event
+        self.warnings = 0
+        self.errors = 0
+        self.phase = ""
+        self.module = ""
+        self.modules = []
+        self.current = 0
+        self.total = 0
+        # Number of UBT action batches seen (one per UBT invocation)
+        self.batches = 0
+        # Seconds spent in each finished phase, and when the current one began
+        self.phase_seconds = {}
+        self.phase_started = 0.0
+        # From "AutomationTool exiting with ExitCode=N", None until seen
+        self.exit_code = None
+
+    @property
+    def progress(self):
+        """Fraction of the current UBT action batch that has completed"""
+        return self.current / self.total if self.total else 0.0
+
+    def feed(self, line):
+        event = self.parse(line)
+        if event is not None and self.on_event is not None:
+            self.on_event(event)
+        return event
+
+    def parse(self, line):
+        if line[:1] == "[":
+            match = ACTION_RE.match(line)
+            if match:
+                return self.parse_action(match)
+
+        if "rror" in line or "RROR" in line:
+            if ERROR_RE.search(line):
+                self.errors += 1
+                return UatEvent(ERROR, line)
+        if "arning" in line or "ARNING" in line:
+            if WARNING_RE.search(line):
+                self.warnings += 1
+                return UatEvent(WARNING, line)
+
+        for marker in PHASE_HINTS:
+            if marker in line:
+                return self.parse_phase(line)
+        return None
+
+    def parse_action(self, match):
+        current = int(match.group(1))
+        total = int(match.group(2))
+        description = match.group(3)
+        if current == 1 or total != self.total:
+            self.batches += 1
+        self.current = current
+        self.total = total
+
+        module = ""
+        if "Module." in description or "Unreal" in description:
+            module_match = MODULE_RE.search(description)
+            if module_match:
+                name = module_match.group(1) or module_match.group(2)
+                if name != self.module:
+                    self.module = module = name
+                    if name not in self.modules:
+                        self.modules.append(name)
+        return UatEvent(ACTION, description, current, total, module)
+
+    def parse_phase(self, line):
+        for marker, phase in PHASES:
+            if marker in line:
+                if phase == "Finished":
+                    match = EXIT_CODE_RE.search(line)
+                    if match:
+                        self.exit_code = int(match.group(1))
+                if phase == self.phase:
+                    return None
+                now = time.monotonic()
+                if self.phase:
+                    self.phase_seconds[self.phase] = (
+                        self.phase_seconds.get(self.phase, 0.0)
+                        + now
+                        - self.phase_started
+                    )
+                self.phase = phase
+                self.phase_started = now
+                return UatEvent(PHASE, phase)
+        return None
+
+    def phase_durations(self):
+        """Seconds per phase, counting the current phase up to now"""
+        durations = dict(self.phase_seconds)
+        if self.phase:
+            durations[self.phase] = (
+                durations.get(self.phase, 0.0) + time.monotonic() - self.phase_started
+            )
+        return durations
+
+    def summary(self):
+        return (
+            f"{self.warnings} warning{'s' if self.warnings != 1 else ''}, "
+            f"{self.errors} error{'s' if self.errors != 1 else ''}"
+        )
@@ -0,0 +1,303 @@
+"""Watch mode: rebuild whenever the plugin source changes.
+
+A `PluginWatcher` follows the plugin folder with inotify on Linux and falls
+back to polling file sizes and mtimes elsewhere (or when inotify is out of
+watches). Generated folders (Binaries, Intermediate, Saved, VCS/IDE
+folders), the migration output and editor swap files are ignored. Changes
+are reported in bursts: a save-all that touches twenty files yields one
+burst once the folder has been quiet for `debounce` seconds.
+
+`watch_plugin` runs a build right away and a new one after every burst,
+cancelling a build that is still running for older sources. Together with
+incremental builds this gives a short edit-compile loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import os
+import struct
+import sys
+from pathlib import Path
+
+from .incremental import UNSYNCED_DIRS, iter_plugin_files
+
+DEFAULT_DEBOUNCE = 0.5
+POLL_INTERVAL = 1.0
+INOTIFY = "inotify"
+POLLING = "polling"
+# Editor scratch files that never affect a build
+IGNORED_SUFFIXES = (".swp", ".swx", ".tmp", "~")
+
+# From sys/inotify.h
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+# IN_MODIFY and IN_ATTRIB catch writes by programs that keep the file open and
+# `touch`, which the polling fallback sees as size/mtime changes too
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def inotify_available():
+    return sys.platform.startswith("linux")
+
+
+class Inotify:
+    """Recursive inotify watch on a folder tree"""
+
+    def __init__(self, root, skip_dir):
+        self.root = Path(root)
+        self.skip_dir = skip_dir
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise self.error()
+        # Watch descriptor -> watched folder
+        self.folders = {}
+        try:
+            self.add_tree(self.root)
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def error(self, path=None):
+        errno = ctypes.get_errno()
+        return OSError(errno, os.strerror(errno), str(path) if path else None)
+
+    def add_tree(self, folder):
+        for dirpath, dirnames, _ in os.walk(folder):
+            dirnames[:] = [
+                name for name in dirnames if not self.skip_dir(Path(dirpath) / name)
+            ]
+            wd = self.libc.inotify_add_watch(
+                self.fd, os.fsencode(dirpath), ctypes.c_uint32(WATCH_MASK)
+            )
+            if wd < 0:
+                # ENOSPC: out of watches (fs.inotify.max_user_watches)
+                raise self.error(dirpath)
+            self.folders[wd] = Path(dirpath)
+
+    def read(self):
+        """Paths changed since the last call; None when events were lost"""
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                folder = self.folders.get(wd)
+                if mask & IN_IGNORED:
+                    self.folders.pop(wd, None)
+                    continue
+                if folder is None or not name:
+                    continue
+                path = folder / os.fsdecode(name)
+                if mask & IN_ISDIR:
+                    if self.skip_dir(path):
+                        continue
+                    if mask & (IN_CREATE | IN_MOVED_TO) and path.is_dir():
+                        # Files may already be in it, e.g. a folder moved in
+                        self.add_tree(path)
+                        changed.update(source for _, source in iter_plugin_files(path))
+                changed.add(path)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PluginWatcher:
+    """Reports bursts of changes to the source files of a plugin.
+
+    `ignored` holds further folders to leave out, e.g. a migration output
+    inside the plugin folder.
+    """
+
+    def __init__(
+        self,
+        plugin_dir,
+        debounce=DEFAULT_DEBOUNCE,
+        poll_interval=POLL_INTERVAL,
+        ignored=(),
+        use_inotify=True,
+    ):
+        self.plugin_dir = Path(plugin_dir).resolve()
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.ignored = [Path(path).resolve() for path in ignored if path]
+        self.use_inotify = use_inotify and inotify_available()
+        self.method = None
+        self.inotify = None
+        self.poller = None
+        self.pending = set()
+        self.changed = asyncio.Event()
+
+    def skip_dir(self, path):
+        relative = path.relative_to(self.plugin_dir)
+        if len(relative.parts) == 1 and relative.name in UNSYNCED_DIRS:
+            return True
+        return any(path == folder or folder in path.parents for folder in self.ignored)
+
+    def relevant(self, path):
+        if path.name.endswith(IGNORED_SUFFIXES):
+            return False
+        relative = path.relative_to(self.plugin_dir)
+        if relative.parts and relative.parts[0] in UNSYNCED_DIRS:
+            return False
+        return not any(folder in path.parents for folder in self.ignored)
+
+    def start(self):
+        """Start watching; returns the method used (inotify or polling)"""
+        if self.use_inotify:
+            try:
+                self.inotify = Inotify(self.plugin_dir, self.skip_dir)
+                asyncio.get_running_loop().add_reader(self.inotify.fd, self.on_inotify)
+                self.method = INOTIFY
+                return self.method
+            except OSError:
+                self.inotify = None
+        self.poller = asyncio.get_running_loop().create_task(self.poll())
+        self.method = POLLING
+        return self.method
+
+    def notify(self, paths):
+        paths = {path for path in paths if self.relevant(path)}
+        if paths:
+            self.pending.update(paths)
+            self.changed.set()
+
+    def on_inotify(self):
+        try:
+            paths = self.inotify.read()
+        except OSError:
+            # Out of watches for a new folder: poll from here on
+            self.close()
+            self.poller = asyncio.get_running_loop().create_task(self.poll())
+            self.method = POLLING
+            paths = None
+        if paths is None:
+            # Events were lost; report the folder as a whole
+            self.pending.add(self.plugin_dir)
+            self.changed.set()
+            return
+        self.notify(paths)
+
+    def snapshot(self):
+        result = {}
+        for _, path in iter_plugin_files(self.plugin_dir):
+            if not self.relevant(path):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            result[path] = (stat.st_size, stat.st_mtime_ns)
+        return result
+
+    async def poll(self):
+        previous = await asyncio.to_thread(self.snapshot)
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = await asyncio.to_thread(self.snapshot)
+            self.notify(
+                path
+                for path in previous.keys() | current.keys()
+                if previous.get(path) != current.get(path)
+            )
+            previous = current
+
+    async def changes(self):
+        """Yield the changed paths of each burst, once it has settled"""
+        while True:
+            await self.changed.wait()
+            while True:
+                self.changed.clear()
+                try:
+                    await asyncio.wait_for(self.changed.wait(), self.debounce)
+                except asyncio.TimeoutError:
+                    break
+            paths, self.pending = sorted(self.pending), set()
+            yield [path.relative_to(self.plugin_dir).as_posix() for path in paths]
+
+    def close(self):
+        if self.inotify is not None:
+            asyncio.get_running_loop().remove_reader(self.inotify.fd)
+            self.inotify.close()
+            self.inotify = None
+        if self.poller is not None:
+            self.poller.cancel()
+            self.poller = None
+
+
+def describe_changes(paths, limit=3):
+    shown = ", ".join(path or "." for path in paths[:limit])
+    more = f" and {len(paths) - limit} more" if len(paths) > limit else ""
+    return f"{len(paths)} change(s): {shown}{more}"
+
+
+async def watch_plugin(job, build, log=print, debounce=DEFAULT_DEBOUNCE):
+    """Run `build()` now and again after every burst of source changes.
+
+    A build still running when new changes arrive is cancelled (and waited
+    for, so it has cleaned up) before the next one starts. An exception
+    raised by a build is logged. Runs until cancelled.
+    """
+    watcher = PluginWatcher(
+        job.plugin_dir,
+        debounce=debounce,
+        ignored=[Path(job.destination_path) / "Migrated", job.staging_dir],
+    )
+    method = watcher.start()
+    log(f"Watching {watcher.plugin_dir} for changes ({method})")
+    if not job.incremental:
+        log("Tip: incremental builds only recompile the modules that changed")
+
+    def start_build():
+        task = asyncio.ensure_future(build())
+        task.add_done_callback(report_failure)
+        return task
+
+    def report_failure(task):
+        if not task.cancelled() and task.exception() is not None:
+            log(f"✗ Build failed: {task.exception()!r}")
+
+    task = start_build()
+    try:
+        async for paths in watcher.changes():
+            log(f"\nSource changed, {describe_changes(paths)}")
+            if not task.done():
+                log("Cancelling the build of the previous sources...")
+                task.cancel()
+                await asyncio.wait([task])
+            task = start_build()
+    finally:
+        watcher.close()
+        if not task.done():
+            task.cancel()
+            await asyncio.wait([task])
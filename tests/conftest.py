@@ -0,0 +1,45 @@
+"""Shared fixtures: a private cache folder and the fake engine of the benchmarks"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fake_engine import make_fake_engine, make_fake_plugin  # noqa: E402
+
+from plugin_migration.core import MigrationJob  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    """Keep catalogs, scan caches and hash indexes out of the real cache folder"""
+    home = tmp_path / "cache-home"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(home))
+    monkeypatch.setenv("LOCALAPPDATA", str(home))
+    return home
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Fake UE 5.4 root whose BuildPlugin prints a short, successful build"""
+    return make_fake_engine(tmp_path / "UE", lines=50, stamp_every=0)
+
+
+@pytest.fixture
+def uplugin(tmp_path):
+    return make_fake_plugin(tmp_path / "plugins")
+
+
+@pytest.fixture
+def job(tmp_path, engine, uplugin):
+    return MigrationJob(
+        uplugin_path=str(uplugin),
+        destination_path=str(tmp_path / "out"),
+        ue_root_path=str(engine),
+    )
@@ -0,0 +1,139 @@
+import pytest
+
+from plugin_migration import api_scan
+from plugin_migration.api_scan import DEPRECATED, REMOVED, scan_plugin, version_key
+from plugin_migration.core import MigrationJob
+
+from fake_engine import make_fake_engine, make_fake_plugin
+
+
+def write_source(job, relative, text):
+    path = job.plugin_dir / "Source" / "Bench" / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def found(report):
+    return [
+        (finding.path.rsplit("/", 1)[-1], finding.line, finding.text)
+        for finding in report.findings
+    ]
+
+
+def test_rules_apply_from_their_engine_version(tmp_path, job):
+    write_source(job, "Style.cpp", "\nconst auto& Style = FEditorStyle::Get();\n")
+    report = scan_plugin(job)
+    assert found(report) == [("Style.cpp", 2, "FEditorStyle")]
+    assert report.findings[0].severity == DEPRECATED
+    assert report.warnings and not report.errors
+
+    # FEditorStyle was only deprecated in 5.1
+    job.ue_root_path = str(make_fake_engine(tmp_path / "UE50", version=(5, 0)))
+    assert scan_plugin(job).findings == []
+
+
+def test_removed_apis_are_errors(job):
+    write_source(
+        job, "Paths.cpp", "FString Dir = FPaths::GameDir();\nARRAY_COUNT(x);\n"
+    )
+    report = scan_plugin(job)
+    assert [finding.severity for finding in report.errors] == [REMOVED, REMOVED]
+    assert str(report.errors[0]).startswith("Source/Bench/Paths.cpp:1: error:")
+
+
+def test_comments_and_strings_are_ignored(job):
+    write_source(
+        job,
+        "Notes.cpp",
+        "// FEditorStyle was renamed\n"
+        "/* UProperty\n   FPaths::GameDir() */\n"
+        'Log(TEXT("use FEditorStyle"));\n'
+        "auto& S = FEditorStyle::Get(); // real\n",
+    )
+    assert found(scan_plugin(job)) == [("Notes.cpp", 5, "FEditorStyle")]
+
+
+def test_digit_separators_are_not_character_literals(job):
+    write_source(
+        job,
+        "Limits.cpp",
+        "int Max = 1'000; auto& S = FEditorStyle::Get(); char C = 'x';\n"
+        "char Quote = '\\''; ARRAY_COUNT(x);\n",
+    )
+    assert found(scan_plugin(job)) == [
+        ("Limits.cpp", 1, "FEditorStyle"),
+        ("Limits.cpp", 2, "ARRAY_COUNT("),
+    ]
+
+
+def test_rules_matching_a_literal_still_apply(job):
+    write_source(
+        job,
+        "Bench.Build.cs",
+        'PublicDependencyModuleNames.AddRange(new[] { "Core", "PhysX" });\n',
+    )
+    write_source(job, "Style.h", '#include "EditorStyleSet.h"\n')
+    assert found(scan_plugin(job)) == [
+        ("Bench.Build.cs", 1, '"PhysX"'),
+        ("Style.h", 1, '#include "EditorStyleSet.h"'),
+    ]
+
+
+def test_only_changed_files_are_rescanned(job):
+    write_source(job, "A.cpp", "FEditorStyle::Get();\n")
+    write_source(job, "B.cpp", "// nothing\n")
+    # The fake plugin brings Bench.Build.cs and Bench.cpp
+    assert scan_plugin(job).scanned == 4
+
+    report = scan_plugin(job)
+    assert report.scanned == 0
+    assert found(report) == [("A.cpp", 1, "FEditorStyle")]
+
+    path = write_source(job, "A.cpp", "FAppStyle::Get();\n")
+    report = scan_plugin(job)
+    assert report.scanned == 1
+    assert report.findings == []
+
+    path.unlink()
+    assert scan_plugin(job).files == 3
+
+
+def test_concurrent_scans_merge_their_cache_entries(tmp_path, job, monkeypatch):
+    other = MigrationJob(
+        uplugin_path=str(make_fake_plugin(tmp_path / "other", name="Other")),
+        destination_path=str(tmp_path / "out"),
+        ue_root_path=job.ue_root_path,
+    )
+    scan_file = api_scan.scan_file
+    nested = []
+
+    def scan_file_and_other_plugin(path, version):
+        # Another job scans and saves while this one is still scanning
+        if not nested:
+            nested.append(None)
+            nested[0] = scan_plugin(other)
+        return scan_file(path, version)
+
+    monkeypatch.setattr(api_scan, "scan_file", scan_file_and_other_plugin)
+    assert scan_plugin(job).scanned == 2
+    monkeypatch.setattr(api_scan, "scan_file", scan_file)
+    assert nested[0].scanned == 2
+    assert scan_plugin(other).scanned == 0
+    assert scan_plugin(job).scanned == 0
+
+
+def test_process_pool(job, monkeypatch):
+    monkeypatch.setattr(api_scan, "PROCESS_POOL_MIN_FILES", 4)
+    for index in range(8):
+        write_source(job, f"File{index}.cpp", f"int X{index};\nANY_PACKAGE;\n")
+    report = scan_plugin(job, workers=2)
+    assert report.scanned == 10
+    assert len(report.warnings) == 8
+
+
+@pytest.mark.parametrize(
+    "version, key", [("5.4", (5, 4)), ("4.27", (4, 27)), ("custom", (0, 0))]
+)
+def test_version_key(version, key):
+    assert version_key(version) == key
@@ -0,0 +1,52 @@
+import asyncio
+
+from plugin_migration.budget import CoreBudget
+from plugin_migration.core import format_cores, limit_parallel_actions
+
+
+def test_limit_parallel_actions():
+    command = ["RunUAT.sh", "BuildPlugin", "-plugin=a"]
+    assert limit_parallel_actions(command, 4) == [
+        *command,
+        "-ubtargs=-MaxParallelActions=4",
+    ]
+    assert limit_parallel_actions([*command, "-ubtargs=-NoPCH"], 2) == [
+        *command,
+        "-ubtargs=-NoPCH -MaxParallelActions=2",
+    ]
+
+
+def test_format_cores():
+    assert format_cores([3, 0, 1, 2, 8]) == "0-3,8"
+
+
+def test_allotments_wait_for_free_cores():
+    budget = CoreBudget(cores=1, memory_bytes=1 << 30, memory_per_core=1 << 20)
+    events = []
+
+    async def build(name, seconds):
+        async with budget.allot(log=lambda line: events.append(f"{name} waits")) as a:
+            events.append(f"{name} runs on {a.cores}")
+            await asyncio.sleep(seconds)
+        events.append(f"{name} done")
+
+    async def main():
+        await asyncio.gather(build("a", 0.05), build("b", 0))
+
+    asyncio.run(main())
+    core = budget.cores[0]
+    assert events == [
+        f"a runs on [{core}]",
+        "b waits",
+        "a done",
+        f"b runs on [{core}]",
+        "b done",
+    ]
+    assert budget.free_cores == budget.cores
+    assert budget.free_memory == budget.memory_bytes
+
+
+def test_shared_budget_splits_the_cores():
+    budget = CoreBudget.shared(2)
+    assert budget.cores_per_build == max(1, len(budget.cores) // 2)
+    assert budget.request()[0] == budget.cores_per_build
@@ -0,0 +1,70 @@
+from plugin_migration.build_log import BuildLog, prune_logs
+
+
+def make_log(tmp_path, lines):
+    log = BuildLog(tmp_path / "run.log")
+    for line, is_error in lines:
+        log.write(line, is_error=is_error)
+    return log
+
+
+def test_lines_are_read_back_by_number(tmp_path):
+    log = make_log(tmp_path, [(f"line {index} ✓", False) for index in range(100)])
+    assert len(log) == 100
+    assert log.lines(10, 3) == ["line 10 ✓", "line 11 ✓", "line 12 ✓"]
+    assert log.lines(98, 10) == ["line 98 ✓", "line 99 ✓"]
+    assert log.lines(200, 10) == []
+    assert log.line(0) == "line 0 ✓"
+
+
+def test_multi_line_messages_are_indexed_per_line(tmp_path):
+    log = make_log(
+        tmp_path,
+        [
+            ("Starting", False),
+            ("Pre-flight check failed:\nfirst problem\nsecond problem", True),
+            ("after", False),
+            ("Bench.cpp(1): error C2065: x", True),
+        ],
+    )
+    assert len(log) == 6
+    assert log.lines(0, 6) == [
+        "Starting",
+        "Pre-flight check failed:",
+        "first problem",
+        "second problem",
+        "after",
+        "Bench.cpp(1): error C2065: x",
+    ]
+    assert list(log.error_lines) == [1, 5]
+    assert log.next_error(1) == 5
+    assert log.search("second") == 3
+    assert log.search("after") == 4
+
+
+def test_errors_and_search(tmp_path):
+    lines = [(f"line {index}", False) for index in range(10)]
+    lines[3] = ("Foo.cpp(3): error C1: bad", True)
+    lines[7] = ("Foo.cpp(7): error C1: worse", True)
+    log = make_log(tmp_path, lines)
+    assert log.first_error() == 3
+    assert log.next_error(3) == 7
+    assert log.next_error(7) is None
+    # Case-insensitive, from `start` on, wrapping around
+    assert log.search("ERROR") == 3
+    assert log.search("error", start=4) == 7
+    assert log.search("line 1", start=5) == 1
+    assert log.search("missing") is None
+
+
+def test_log_is_readable_after_close(tmp_path):
+    log = make_log(tmp_path, [("only", False)])
+    log.close()
+    assert log.lines(0, 1) == ["only"]
+
+
+def test_old_logs_are_pruned(tmp_path):
+    for index in range(5):
+        (tmp_path / f"{index}.log").write_text("x", encoding="utf-8")
+    prune_logs(tmp_path, keep=2)
+    assert len(list(tmp_path.glob("*.log"))) == 2
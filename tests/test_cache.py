@@ -0,0 +1,152 @@
+import asyncio
+import os
+
+from plugin_migration.cache import BuildCache, FileHashIndex
+from plugin_migration.core import run_migration
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def store_package(cache, job, files):
+    for name, text in files.items():
+        write(job.package_dir / name, text)
+    key = cache.key_for(job)
+    cache.store(key, job)
+    return key
+
+
+def test_key_is_stable_and_tracks_inputs(tmp_path, job):
+    cache = BuildCache(tmp_path / "cache")
+    key = cache.key_for(job)
+    assert cache.key_for(job) == key
+
+    # The output folder is not part of the key
+    job.destination_path = str(tmp_path / "elsewhere")
+    assert cache.key_for(job) == key
+
+    job.extra_args = ["-TargetPlatforms=Win64"]
+    assert cache.key_for(job) != key
+    job.extra_args = []
+
+    write(job.plugin_dir / "Source" / "Bench" / "Bench.cpp", "// changed\n")
+    changed = cache.key_for(job)
+    assert changed != key
+
+    # Binaries and Intermediate never reach the package
+    write(job.plugin_dir / "Intermediate" / "x.obj", "obj")
+    assert cache.key_for(job) == changed
+
+    job.incremental = True
+    assert cache.key_for(job) != changed
+
+
+def test_restore_replaces_the_package_folder(tmp_path, job):
+    cache = BuildCache(tmp_path / "cache")
+    key = store_package(
+        cache, job, {"Bench.uplugin": "{}", "Binaries/Win64/a.dll": "a"}
+    )
+
+    write(job.package_dir / "Binaries" / "Linux" / "stale.so", "old")
+    assert cache.restore(key, job.package_dir) == (2, 3)
+    restored = sorted(
+        path.relative_to(job.package_dir).as_posix()
+        for path in job.package_dir.rglob("*")
+        if path.is_file()
+    )
+    assert restored == ["Bench.uplugin", "Binaries/Win64/a.dll"]
+    # No temporary folder is left next to the package
+    assert not list(job.package_dir.parent.glob("*.restore"))
+    assert not cache.pinned
+
+
+def test_restore_of_a_missing_entry(tmp_path, job):
+    cache = BuildCache(tmp_path / "cache")
+    assert cache.restore("0" * 40, job.package_dir) is None
+
+
+def test_linked_restore(tmp_path, job):
+    cache = BuildCache(tmp_path / "cache", link=True)
+    key = store_package(cache, job, {"a.bin": "data"})
+    cache.restore(key, job.package_dir)
+    source = cache.entry_dir(key) / "package" / "a.bin"
+    assert os.path.samefile(source, job.package_dir / "a.bin")
+
+
+def test_eviction_skips_pinned_entries(tmp_path, job):
+    cache = BuildCache(tmp_path / "cache", limit_gb=0)
+    key = store_package(cache, job, {"a.bin": "data"})
+    # A limit of 0 evicts everything on store
+    assert not cache.lookup(key)
+
+    cache.limit_bytes = 1 << 30
+    key = store_package(cache, job, {"a.bin": "data"})
+    cache.limit_bytes = 0
+    cache.pinned[key] += 1
+    assert cache.evict() == 0
+    assert cache.lookup(key)
+    cache.pinned.clear()
+    assert cache.evict() == 1
+
+
+def test_hash_index_forgets_deleted_files(tmp_path):
+    source = tmp_path / "a.txt"
+    source.write_text("a", encoding="utf-8")
+    index = FileHashIndex(tmp_path / "index.json")
+    digest = index.digest(source)
+    index.save()
+
+    index = FileHashIndex(tmp_path / "index.json")
+    assert index.entries[str(source)][2] == digest
+    source.unlink()
+    index.save()
+    assert FileHashIndex(tmp_path / "index.json").entries == {}
+
+
+def test_run_stores_on_miss_and_restores_on_hit(tmp_path, job):
+    cache = BuildCache(tmp_path / "cache")
+    builds = []
+
+    async def runner(job, log):
+        builds.append(job)
+        write(job.package_dir / "Bench.uplugin", "{}")
+        return True, "built"
+
+    assert asyncio.run(cache.run(job, runner, log=lambda line: None)) == (
+        True,
+        "built",
+    )
+    success, message = asyncio.run(cache.run(job, runner, log=lambda line: None))
+    assert success and message.startswith("Restored from build cache")
+    assert len(builds) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_failed_builds_are_not_cached(tmp_path, job):
+    cache = BuildCache(tmp_path / "cache")
+
+    async def runner(job, log):
+        return False, "failed"
+
+    asyncio.run(cache.run(job, runner, log=lambda line: None))
+    asyncio.run(cache.run(job, runner, log=lambda line: None))
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_migration_is_restored_from_the_cache(tmp_path, job):
+    """End to end: BuildPlugin of the fake engine runs once"""
+    cache = BuildCache(tmp_path / "cache")
+    lines = []
+    success, _ = asyncio.run(run_migration(job, log=lines.append, cache=cache))
+    assert success
+    assert (job.package_dir / "Binaries" / "Host" / "Bench.bin").exists()
+
+    (job.package_dir / "leftover.txt").write_text("x", encoding="utf-8")
+    lines.clear()
+    success, message = asyncio.run(run_migration(job, log=lines.append, cache=cache))
+    assert success and message.startswith("Restored from build cache")
+    assert not any("BUILD COMMAND STARTED" in line for line in lines)
+    assert (job.package_dir / "Binaries" / "Host" / "Bench.bin").exists()
+    assert not (job.package_dir / "leftover.txt").exists()
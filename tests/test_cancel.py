@@ -0,0 +1,56 @@
+import asyncio
+
+from plugin_migration.core import run_migration
+
+from fake_engine import configure_fake_engine
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def test_fail_fast_removes_the_partial_package(job, engine):
+    write(job.package_dir / "Binaries" / "Host" / "old.bin", b"old")
+    configure_fake_engine(
+        engine, lines=200, rate=1000, stamp_every=0, error_every=20, exit_code=25
+    )
+    success, _ = asyncio.run(run_migration(job, log=lambda line: None, fail_fast=True))
+    assert not success
+    assert not job.package_dir.exists()
+
+
+def test_cancel_stops_the_build_and_cleans_up(job, engine):
+    configure_fake_engine(engine, lines=100, rate=50, stamp_every=0)
+    lines = []
+
+    async def main():
+        task = asyncio.ensure_future(run_migration(job, log=lines.append))
+        for _ in range(100):
+            if any("Compile" in line for line in lines):
+                break
+            await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    assert asyncio.run(main())
+    assert "✗ Migration cancelled" in lines
+    assert not job.package_dir.exists()
+
+
+def test_cancel_before_the_launch_keeps_the_previous_package(job):
+    write(job.package_dir / "Binaries" / "Host" / "good.bin", b"good")
+
+    async def main():
+        task = asyncio.ensure_future(run_migration(job, log=lambda line: None))
+        # Cancelled during the pre-flight check, before UAT started
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(main())
+    assert (job.package_dir / "Binaries" / "Host" / "good.bin").exists()
@@ -0,0 +1,76 @@
+import asyncio
+
+from plugin_migration.console import ConsoleBuffer
+
+
+def test_write_splits_lines_and_flush_hands_them_over():
+    batches = []
+    console = ConsoleBuffer(batches.append)
+    console.write("one")
+    console.write("two\nthree")
+    console.flush()
+    assert batches == [["one", "two", "three"]]
+    assert list(console.lines) == ["one", "two", "three"]
+
+    # Nothing pending: no empty UI update
+    console.flush()
+    assert len(batches) == 1
+
+
+def test_only_the_latest_lines_are_kept():
+    batches = []
+    console = ConsoleBuffer(batches.append, max_lines=3)
+    for index in range(10):
+        console.write(f"line {index}")
+    assert list(console.lines) == ["line 7", "line 8", "line 9"]
+    console.flush()
+    assert batches == [["line 7", "line 8", "line 9"]]
+
+
+def test_run_flushes_at_the_capped_rate_and_stop_flushes_the_rest():
+    batches = []
+
+    async def main():
+        console = ConsoleBuffer(batches.append, max_updates_per_sec=20)
+        task = asyncio.ensure_future(console.run())
+        for index in range(200):
+            console.write(f"line {index}")
+            if index % 50 == 49:
+                await asyncio.sleep(0.08)
+        console.stop()
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(main())
+    # A few batches at most, not one per line, and no line lost
+    assert 2 <= len(batches) <= 8
+    assert [line for batch in batches for line in batch] == [
+        f"line {index}" for index in range(200)
+    ]
+
+
+def test_drain_waits_until_the_ui_caught_up():
+    batches = []
+
+    async def main():
+        console = ConsoleBuffer(batches.append, max_lines=10, max_updates_per_sec=50)
+        # Not running: nothing would ever flush, so drain returns at once
+        for index in range(10):
+            console.write(f"early {index}")
+        await asyncio.wait_for(console.drain(), 0.1)
+
+        task = asyncio.ensure_future(console.run())
+        await asyncio.sleep(0)
+        written = 0
+        for batch in range(5):
+            for _ in range(10):
+                console.write(f"line {written}")
+                written += 1
+            await console.drain()
+            assert len(console.pending) < console.max_lines
+        console.stop()
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(main())
+    # Producers were held back instead of having lines dropped
+    lines = [line for batch in batches for line in batch]
+    assert lines[-50:] == [f"line {index}" for index in range(50)]
@@ -0,0 +1,30 @@
+import asyncio
+
+from plugin_migration.core import run_migration
+
+from fake_engine import configure_fake_engine
+
+
+def test_migration_against_the_fake_engine(job):
+    lines = []
+    success, message = asyncio.run(run_migration(job, log=lines.append))
+    assert success, message
+    assert any(line.startswith("Pre-flight check passed") for line in lines)
+    assert any(line.startswith("API scan:") for line in lines)
+    assert (job.package_dir / "Binaries" / "Host" / "Bench.bin").exists()
+
+
+def test_failed_migration(job, engine):
+    configure_fake_engine(engine, lines=20, stamp_every=0, error_every=10, exit_code=25)
+    success, message = asyncio.run(run_migration(job, log=lambda line: None))
+    assert not success
+    assert "25" in message
+
+
+def test_unexpected_errors_fail_the_migration(job, monkeypatch):
+    def broken(ue_root_path):
+        raise OSError("disk on fire")
+
+    monkeypatch.setattr("plugin_migration.preflight.engine_catalog", broken)
+    success, message = asyncio.run(run_migration(job, log=lambda line: None))
+    assert (success, message) == (False, "Exception occurred: disk on fire")
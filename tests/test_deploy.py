@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from plugin_migration.deploy import (
+    deploy_package,
+    deploy_to,
+    hash_package,
+    plugin_deploy_dir,
+)
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+@pytest.fixture
+def package(tmp_path):
+    package = tmp_path / "Migrated"
+    write(package / "Bench.uplugin", b"{}")
+    write(package / "Binaries" / "Win64" / "UnrealEditor-Bench.dll", b"dll" * 100)
+    write(package / "Resources" / "Icon128.png", b"png")
+    # Build leftovers are not deployed
+    write(package / "Intermediate" / "Build" / "Bench.obj", b"obj")
+    return package
+
+
+def deploy(package, target, tmp_path):
+    files = hash_package(package, workers=2, index_path=tmp_path / "hashes.json")
+    return deploy_to(files, target)
+
+
+def test_only_changed_files_are_copied(tmp_path, package):
+    target = tmp_path / "Project" / "Plugins" / "Bench"
+    report = deploy(package, target, tmp_path)
+    assert (report.files, report.copied, report.unchanged) == (3, 3, 0)
+    assert not (target / "Intermediate").exists()
+
+    report = deploy(package, target, tmp_path)
+    assert (report.copied, report.unchanged, report.bytes_copied) == (0, 3, 0)
+
+    write(package / "Binaries" / "Win64" / "UnrealEditor-Bench.dll", b"new" * 100)
+    report = deploy(package, target, tmp_path)
+    assert (report.copied, report.unchanged) == (1, 2)
+    assert (target / "Binaries" / "Win64" / "UnrealEditor-Bench.dll").read_bytes() == (
+        b"new" * 100
+    )
+
+
+def test_removed_files_are_deleted_but_manual_files_kept(tmp_path, package):
+    target = tmp_path / "Plugins" / "Bench"
+    deploy(package, target, tmp_path)
+    write(target / "Config" / "Local.ini", b"mine")
+    (package / "Resources" / "Icon128.png").unlink()
+
+    report = deploy(package, target, tmp_path)
+    assert report.removed == 1
+    assert not (target / "Resources").exists()
+    assert (target / "Config" / "Local.ini").read_bytes() == b"mine"
+
+
+def test_identical_files_without_a_manifest_are_not_rewritten(tmp_path, package):
+    target = tmp_path / "Plugins" / "Bench"
+    write(target / "Bench.uplugin", b"{}")
+    write(target / "Resources" / "Icon128.png", b"PNG")
+    report = deploy(package, target, tmp_path)
+    # Same size but different content is copied; the .uplugin is kept
+    assert (report.copied, report.unchanged) == (2, 1)
+    assert (target / "Resources" / "Icon128.png").read_bytes() == b"png"
+
+
+def test_plugin_deploy_dir(tmp_path):
+    project = tmp_path / "Game"
+    write(project / "Game.uproject", b"{}")
+    expected = project / "Plugins" / "Bench"
+    assert plugin_deploy_dir(project, "Bench") == expected
+    assert plugin_deploy_dir(project / "Game.uproject", "Bench") == expected
+    assert plugin_deploy_dir(project / "Plugins", "Bench") == expected
+    with pytest.raises(ValueError):
+        plugin_deploy_dir(tmp_path / "NotAProject", "Bench")
+
+
+def test_deploy_package_to_several_projects(tmp_path, package):
+    projects = []
+    for name in ("A", "B"):
+        write(tmp_path / name / f"{name}.uproject", b"{}")
+        projects.append(tmp_path / name)
+    lines = []
+    reports = asyncio.run(deploy_package(package, projects, log=lines.append))
+    assert [report.copied for report in reports] == [3, 3]
+    assert (tmp_path / "B" / "Plugins" / "Bench" / "Bench.uplugin").exists()
+    assert lines[-1] == "Deployed to 2 projects, 0 B not rewritten"
+
+    reports = asyncio.run(
+        deploy_package(package, [tmp_path / "Missing"], log=lines.append)
+    )
+    assert reports == []
+    assert lines[-1].startswith("✗ Deploy failed:")
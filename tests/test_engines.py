@@ -0,0 +1,61 @@
+import sys
+
+import pytest
+
+from plugin_migration.engines import (
+    SEARCH_PATH_ENV,
+    EngineIndex,
+    default_search_roots,
+    resolve_engine_root,
+)
+
+from fake_engine import make_fake_engine
+
+
+@pytest.fixture
+def index(tmp_path):
+    return EngineIndex(tmp_path / "engines.json")
+
+
+def test_engines_in_search_roots_are_found(tmp_path, index, monkeypatch):
+    make_fake_engine(tmp_path / "Engines" / "UE_5.3", version=(5, 3))
+    make_fake_engine(tmp_path / "Engines" / "UE_5.4", version=(5, 4))
+    (tmp_path / "Engines" / "NotAnEngine").mkdir()
+    monkeypatch.setenv(SEARCH_PATH_ENV, str(tmp_path / "Engines"))
+
+    engines = index.discover()
+    ours = [engine.label for engine in engines if str(tmp_path) in engine.root]
+    assert ours == ["UE 5.4.0", "UE 5.3.0"]
+    assert index.find("5.3").root == str(tmp_path / "Engines" / "UE_5.3")
+    assert resolve_engine_root("5.4", index) == str(tmp_path / "Engines" / "UE_5.4")
+    assert resolve_engine_root("9.9", index) is None
+
+
+def test_user_roots_are_remembered(tmp_path, index):
+    root = make_fake_engine(tmp_path / "Custom", version=(5, 2))
+    index.add_user_root(root)
+    reopened = EngineIndex(index.path)
+    assert reopened.user_roots == [str(root)]
+    assert [engine.root for engine in reopened.discover()].count(str(root)) == 1
+
+
+def test_changed_engines_are_reparsed(tmp_path, index, monkeypatch):
+    monkeypatch.setenv(SEARCH_PATH_ENV, str(tmp_path / "Engines"))
+    root = make_fake_engine(tmp_path / "Engines" / "UE_5.3", version=(5, 3))
+    assert index.find("5.3") is not None
+
+    make_fake_engine(root, version=(5, 5))
+    reopened = EngineIndex(index.path)
+    assert reopened.find("5.5").root == str(root)
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Linux search roots")
+def test_opt_itself_is_not_a_search_root(monkeypatch):
+    monkeypatch.delenv(SEARCH_PATH_ENV, raising=False)
+    roots = default_search_roots()
+    assert all(str(root) != "/opt" for root in roots)
+    assert all(
+        root.name.startswith(("UnrealEngine", "UE_"))
+        for root in roots
+        if str(root).startswith("/opt")
+    )
@@ -0,0 +1,97 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from plugin_migration.core import run_migration
+from plugin_migration.history import BuildHistory, build_mode, describe_run
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = BuildHistory(tmp_path / "history.sqlite3")
+    yield history
+    history.close()
+
+
+def record(history, job, duration, success=True, cached=False, mode="full", at=0):
+    return history.record(
+        job, "5.4", 1000.0 + at, duration, success, cached=cached, mode=mode
+    )
+
+
+def test_estimate_is_the_median_of_recent_successful_builds(history, job):
+    assert history.estimate(job.plugin_name, "5.4") is None
+    for at, duration in enumerate([500, 100, 110, 120, 130, 140]):
+        record(history, job, duration, at=at)
+    record(history, job, 999, success=False, at=10)
+    record(history, job, 1, cached=True, at=11)
+    # The five latest successful, uncached runs: 100..140
+    assert history.estimate(job.plugin_name, "5.4") == 120
+    assert history.estimate(job.plugin_name, "5.3") is None
+
+
+def test_estimate_per_build_mode(history, job):
+    record(history, job, 600, mode="full")
+    record(history, job, 30, mode="incremental", at=1)
+    assert history.estimate(job.plugin_name, "5.4", "full") == 600
+    assert history.estimate(job.plugin_name, "5.4", "incremental") == 30
+    assert history.estimate(job.plugin_name, "5.4", "split=Win64") is None
+    assert history.estimate(job.plugin_name, "5.4") == 315
+
+
+def test_build_mode(job):
+    assert build_mode(job) == "full"
+    job.incremental = True
+    assert build_mode(job) == "incremental"
+    assert build_mode(job, remote=True) == "remote"
+    job.split_platforms = ["Win64", "Android", "Win64"]
+    assert build_mode(job) == "incremental split=Android+Win64"
+
+
+def test_version_1_databases_are_upgraded(tmp_path, job):
+    path = tmp_path / "old.sqlite3"
+    db = sqlite3.connect(path)
+    db.executescript(
+        "CREATE TABLE runs (id INTEGER PRIMARY KEY, plugin TEXT NOT NULL,"
+        " engine_version TEXT NOT NULL, engine_root TEXT NOT NULL,"
+        " args TEXT NOT NULL, started_at REAL NOT NULL, duration REAL NOT NULL,"
+        " success INTEGER NOT NULL, exit_code INTEGER, cached INTEGER NOT NULL,"
+        " warnings INTEGER NOT NULL, errors INTEGER NOT NULL, log_path TEXT);"
+        "INSERT INTO runs VALUES (1, 'Bench', '5.4', '/UE', '[]', 1, 42, 1, 0,"
+        " 0, 0, 0, NULL);"
+        "PRAGMA user_version=1;"
+    )
+    db.close()
+
+    history = BuildHistory(path)
+    try:
+        (row,) = history.recent()
+        assert row["mode"] == ""
+        assert "[" not in describe_run(row)
+        assert history.estimate("Bench", "5.4", "full") is None
+        assert history.estimate("Bench", "5.4") == 42
+    finally:
+        history.close()
+
+
+def test_migrations_are_recorded(history, job):
+    """End to end against the fake engine, including a run stopped by pre-flight"""
+    lines = []
+    success, _ = asyncio.run(run_migration(job, log=lines.append, history=history))
+    assert success
+    (run,) = history.recent()
+    assert run["success"] and not run["cached"]
+    assert (run["exit_code"], run["mode"]) == (0, "full")
+    assert "Build successful" in history.phases(run["id"])
+
+    success, _ = asyncio.run(run_migration(job, log=lines.append, history=history))
+    assert any("Previous builds of this plugin on UE 5.4" in line for line in lines)
+
+    (job.plugin_dir / "Source" / "Bench" / "Bench.Build.cs").unlink()
+    success, message = asyncio.run(
+        run_migration(job, log=lines.append, history=history)
+    )
+    assert not success and message.startswith("Pre-flight check failed")
+    latest = history.recent(limit=1)[0]
+    assert not latest["success"] and not latest["cached"]
@@ -0,0 +1,52 @@
+import tarfile
+
+import pytest
+
+from plugin_migration import packaging
+from plugin_migration.packaging import archive_package
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def test_archive_stores_duplicates_once(tmp_path):
+    root = tmp_path / "Bench"
+    write(root / "Bench.uplugin", b"{}")
+    write(root / "Resources" / "A.png", b"same" * 1000)
+    write(root / "Resources" / "B.png", b"same" * 1000)
+
+    report = archive_package(root, tmp_path / "Bench.tar.gz", workers=2)
+    assert (report.files, report.duplicates) == (3, 1)
+    with tarfile.open(report.archive_path) as tar:
+        names = sorted(tar.getnames())
+    assert names == [
+        "Bench/Bench.uplugin",
+        "Bench/Resources/A.png",
+        "Bench/Resources/B.png",
+        f"Bench/{packaging.MANIFEST_NAME}",
+    ]
+    assert [path.name for path in tmp_path.glob("*.tmp")] == []
+
+
+def test_failed_archive_leaves_no_partial_file(tmp_path, monkeypatch):
+    root = tmp_path / "Bench"
+    write(root / "Bench.uplugin", b"{}")
+    write(root / "Binaries" / "Bench.dll", b"dll")
+    pools = []
+
+    class FailingWriter(packaging.ParallelGzipWriter):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self.pool)
+
+        def write(self, data):
+            raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(packaging, "ParallelGzipWriter", FailingWriter)
+    with pytest.raises(OSError):
+        archive_package(root, tmp_path / "Bench.tar.gz")
+    assert not (tmp_path / "Bench.tar.gz").exists()
+    assert list(tmp_path.glob("*.tmp")) == []
+    assert pools and pools[0]._shutdown
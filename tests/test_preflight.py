@@ -0,0 +1,134 @@
+import json
+import os
+from pathlib import Path
+
+from plugin_migration import preflight
+from plugin_migration.preflight import check_plugin, engine_catalog
+
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def add_engine_plugin(plugins_dir, name, modules=()):
+    write_json(
+        plugins_dir / name / f"{name}.uplugin",
+        {"Modules": [{"Name": module, "Type": "Runtime"} for module in modules]},
+    )
+
+
+def update_descriptor(job, **changes):
+    path = job.plugin_dir / f"{job.plugin_name}.uplugin"
+    descriptor = json.loads(path.read_text(encoding="utf-8"))
+    descriptor.update(changes)
+    write_json(path, descriptor)
+
+
+def test_valid_plugin_passes(job):
+    report = check_plugin(job)
+    assert report.ok
+    assert report.errors == report.warnings == []
+
+
+def test_build_files_are_found_anywhere_under_source(job):
+    source = job.plugin_dir / "Source"
+    (source / "Bench").rename(source / "Runtime")
+    (source / "Editor" / "BenchEditor").mkdir(parents=True)
+    (source / "Editor" / "BenchEditor" / "BenchEditor.Build.cs").write_text(
+        "", encoding="utf-8"
+    )
+    update_descriptor(
+        job,
+        Modules=[
+            {"Name": "Bench", "Type": "Runtime"},
+            {"Name": "BenchEditor", "Type": "Editor"},
+        ],
+    )
+    assert check_plugin(job).ok
+
+
+def test_module_problems(job):
+    update_descriptor(
+        job,
+        Modules=[
+            {"Name": "Bench", "Type": "Runtime", "LoadingPhase": "Later"},
+            {"Name": "Missing", "Type": "Gameplay"},
+            {"Type": "Runtime"},
+        ],
+    )
+    assert check_plugin(job).errors == [
+        "Module 'Bench' has unknown LoadingPhase 'Later'",
+        "Module 'Missing' has unknown Type 'Gameplay'",
+        "Module 'Missing' has no Missing.Build.cs under Source",
+        'A module entry has no "Name"',
+    ]
+
+
+def test_deprecated_developer_type_is_a_warning(job):
+    update_descriptor(job, Modules=[{"Name": "Bench", "Type": "Developer"}])
+    report = check_plugin(job)
+    assert report.ok
+    assert "deprecated Type 'Developer'" in report.warnings[0]
+
+
+def test_module_clash_with_the_engine(job, engine):
+    add_engine_plugin(engine / "Engine" / "Plugins", "Benchmarks", ["Bench"])
+    report = check_plugin(job)
+    assert report.errors == [
+        "Module 'Bench' clashes with a module of the engine plugin 'Benchmarks'"
+    ]
+
+
+def test_plugin_dependencies(job, engine):
+    add_engine_plugin(engine / "Engine" / "Plugins" / "Runtime", "EnhancedInput")
+    add_engine_plugin(engine / "Engine" / "Platforms" / "Android" / "Plugins", "OBB")
+    update_descriptor(
+        job,
+        Plugins=[
+            {"Name": "EnhancedInput", "Enabled": True},
+            {"Name": "OBB", "Enabled": True},
+            {"Name": "Steam", "Enabled": True, "Optional": True},
+            {"Name": "Disabled", "Enabled": False},
+            {"Name": "Nowhere", "Enabled": True},
+        ],
+    )
+    report = check_plugin(job)
+    assert report.errors == [
+        "Depends on plugin 'Nowhere', which is not bundled with this engine"
+    ]
+    assert report.warnings == [
+        "Depends on plugin 'Steam', which is not bundled with this engine (optional)"
+    ]
+
+
+def test_unreadable_descriptor(job):
+    (job.plugin_dir / "Bench.uplugin").write_text("{", encoding="utf-8")
+    assert "is not valid JSON" in check_plugin(job).errors[0]
+
+
+def test_catalog_is_cached_and_follows_engine_changes(tmp_path, engine):
+    catalogs = tmp_path / "catalogs"
+    plugins_dir = engine / "Engine" / "Plugins"
+    add_engine_plugin(plugins_dir, "Paper2D", ["Paper2D"])
+    catalog = engine_catalog(engine, catalogs)
+    assert catalog.module_owners == {"Paper2D": "Paper2D"}
+    assert len(list(catalogs.glob("*.json"))) == 1
+    assert engine_catalog(engine, catalogs) is catalog
+
+    add_engine_plugin(plugins_dir, "Niagara", ["Niagara"])
+    assert set(engine_catalog(engine, catalogs).plugins) == {"Paper2D", "Niagara"}
+
+
+def test_catalog_signature_skips_folders_that_vanish(engine, monkeypatch):
+    plugins_dir = engine / "Engine" / "Plugins"
+    add_engine_plugin(plugins_dir, "Paper2D", ["Paper2D"])
+    stat = os.stat
+
+    def stat_while_deleting(path, *args, **kwargs):
+        if Path(path).name == "Paper2D":
+            raise FileNotFoundError(path)
+        return stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(preflight.os, "stat", stat_while_deleting)
+    assert preflight.catalog_signature(engine)
@@ -0,0 +1,49 @@
+import asyncio
+
+from plugin_migration.core import merge_packages, parse_platforms, run_migration
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def test_merge_packages_keeps_the_first_copy(tmp_path):
+    first, second, target = tmp_path / "a", tmp_path / "b", tmp_path / "merged"
+    write(first / "Bench.uplugin", b"{}")
+    write(first / "Binaries" / "Win64" / "Bench.dll", b"win")
+    write(second / "Bench.uplugin", b"{}")
+    write(second / "Binaries" / "Android" / "libBench.so", b"android")
+    write(second / "Resources" / "Icon128.png", b"icon")
+    write(second / "Config" / "Filter.ini", b"different")
+    write(first / "Config" / "Filter.ini", b"first")
+    write(target / "stale.txt", b"old")
+
+    assert merge_packages([first, second], target) == (5, 1)
+    merged = sorted(
+        path.relative_to(target).as_posix()
+        for path in target.rglob("*")
+        if path.is_file()
+    )
+    assert merged == [
+        "Bench.uplugin",
+        "Binaries/Android/libBench.so",
+        "Binaries/Win64/Bench.dll",
+        "Config/Filter.ini",
+        "Resources/Icon128.png",
+    ]
+    assert (target / "Config" / "Filter.ini").read_bytes() == b"first"
+
+
+def test_parse_platforms():
+    assert parse_platforms(" Win64, Android ,,Linux") == ["Win64", "Android", "Linux"]
+
+
+def test_split_build_merges_the_platform_packages(job):
+    job.split_platforms = ["Win64", "Android"]
+    lines = []
+    success, message = asyncio.run(run_migration(job, log=lines.append))
+    assert success, message
+    binaries = sorted(path.name for path in (job.package_dir / "Binaries").iterdir())
+    assert binaries == ["Android", "Win64"]
+    assert not job.staging_dir.exists()
@@ -0,0 +1,36 @@
+import asyncio
+
+from plugin_migration.core import run_migration
+from plugin_migration.staging import stage_plugin_source
+
+
+def test_staged_build(tmp_path, job):
+    job.stage_source = True
+    job.stage_root = str(tmp_path / "stage")
+    (job.plugin_dir / "Intermediate" / "Build").mkdir(parents=True)
+    lines = []
+    success, message = asyncio.run(run_migration(job, log=lines.append))
+    assert success, message
+    (stage_dir,) = (tmp_path / "stage").iterdir()
+    assert (stage_dir / "Bench" / "Source" / "Bench" / "Bench.cpp").is_file()
+    assert not (stage_dir / "Bench" / "Intermediate").exists()
+
+
+def test_staged_copy_is_held_until_the_block_exits(tmp_path, job):
+    job.stage_root = str(tmp_path / "stage")
+    events = []
+
+    async def use_stage(name, hold):
+        async with stage_plugin_source(job, log=lambda line: None) as staged:
+            events.append(f"{name} staged")
+            assert (staged.plugin_dir / "Bench.uplugin").is_file()
+            await asyncio.sleep(hold)
+            events.append(f"{name} built")
+
+    async def main():
+        first = asyncio.ensure_future(use_stage("first", 0.1))
+        await asyncio.sleep(0.01)
+        await asyncio.gather(first, use_stage("second", 0))
+
+    asyncio.run(main())
+    assert events == ["first staged", "first built", "second staged", "second built"]
@@ -0,0 +1,72 @@
+from plugin_migration.uat_output import (
+    ACTION,
+    ERROR,
+    PHASE,
+    WARNING,
+    UatOutputParser,
+)
+
+
+def test_actions_track_progress_and_modules():
+    parser = UatOutputParser()
+    event = parser.feed("[1/4] Compile [x64] Module.Bench.cpp")
+    assert event.kind == ACTION
+    assert (event.current, event.total, event.module) == (1, 4, "Bench")
+    assert parser.progress == 0.25
+
+    # Same module again: no module boundary
+    assert parser.feed("[2/4] Compile [x64] Module.Bench.2.cpp").module == ""
+    event = parser.feed("[3/4] Link [x64] UnrealEditor-BenchEditor.so")
+    assert event.module == "BenchEditor"
+    assert parser.modules == ["Bench", "BenchEditor"]
+    assert parser.batches == 1
+
+
+def test_new_action_batch_per_ubt_run():
+    parser = UatOutputParser()
+    parser.feed("[1/2] Compile a.cpp")
+    parser.feed("[2/2] Compile b.cpp")
+    parser.feed("[1/3] Compile c.cpp")
+    assert parser.batches == 2
+    assert (parser.current, parser.total) == (1, 3)
+
+
+def test_errors_and_warnings_are_counted():
+    events = []
+    parser = UatOutputParser(on_event=events.append)
+    parser.feed("Bench.cpp(12): error C2065: 'Foo': undeclared identifier")
+    parser.feed("ERROR: BuildPlugin failed")
+    parser.feed("Bench.cpp(3): warning C4996: deprecated")
+    parser.feed("Compiling ErrorHandling.cpp")
+    assert [event.kind for event in events] == [ERROR, ERROR, WARNING]
+    assert (parser.errors, parser.warnings) == (2, 1)
+    assert parser.summary() == "1 warning, 2 errors"
+
+
+def test_phases_and_exit_code():
+    parser = UatOutputParser()
+    assert parser.feed("BUILD COMMAND STARTED BuildPlugin").kind == PHASE
+    assert parser.feed("Building plugin for host platforms").text == (
+        "Building for host platforms"
+    )
+    assert parser.feed("Running UnrealBuildTool: ...").text == "Compiling"
+    # Repeated markers of the current phase are not new events
+    assert parser.feed("Building 12 actions with 8 processes...") is None
+    parser.feed("BUILD FAILED")
+    parser.feed("AutomationTool exiting with ExitCode=25 (Error_Unknown)")
+    assert parser.exit_code == 25
+    assert parser.phase == "Finished"
+    assert set(parser.phase_durations()) == {
+        "Starting",
+        "Building for host platforms",
+        "Compiling",
+        "Build failed",
+        "Finished",
+    }
+
+
+def test_unrelated_lines_are_ignored():
+    parser = UatOutputParser()
+    assert parser.feed("Parsing headers for BenchEditor") is None
+    assert parser.feed("[Upgrade] Using backward-compatible include order") is None
+    assert (parser.errors, parser.warnings, parser.total) == (0, 0, 0)
@@ -0,0 +1,139 @@
+import asyncio
+import os
+
+import pytest
+
+from plugin_migration.watch import (
+    INOTIFY,
+    POLLING,
+    PluginWatcher,
+    describe_changes,
+    inotify_available,
+    watch_plugin,
+)
+
+METHODS = [
+    pytest.param(True, id="inotify"),
+    pytest.param(False, id="polling"),
+]
+
+
+def touch(path, text="x"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+async def next_burst(watcher, timeout=5):
+    changes = watcher.changes()
+    try:
+        return await asyncio.wait_for(changes.__anext__(), timeout)
+    finally:
+        await changes.aclose()
+
+
+async def settle(watcher):
+    """Let the poller take its first snapshot before anything changes"""
+    await asyncio.sleep(watcher.poll_interval * 1.5 if watcher.poller else 0.05)
+
+
+@pytest.mark.parametrize("use_inotify", METHODS)
+def test_a_burst_of_changes_is_reported_once(tmp_path, uplugin, use_inotify):
+    if use_inotify and not inotify_available():
+        pytest.skip("inotify is Linux only")
+    plugin_dir = uplugin.parent
+
+    async def main():
+        watcher = PluginWatcher(
+            plugin_dir, debounce=0.3, poll_interval=0.1, use_inotify=use_inotify
+        )
+        assert watcher.start() == (INOTIFY if use_inotify else POLLING)
+        try:
+            await settle(watcher)
+            for index in range(5):
+                touch(plugin_dir / "Source" / "Bench" / f"File{index}.cpp")
+                await asyncio.sleep(0.05)
+            # Generated folders and swap files are not sources
+            touch(plugin_dir / "Intermediate" / "Build" / "x.obj")
+            touch(plugin_dir / "Source" / "Bench" / ".Bench.cpp.swp")
+            first = await next_burst(watcher)
+
+            touch(plugin_dir / "Source" / "Bench" / "Bench.cpp", "// edited")
+            second = await next_burst(watcher)
+            return first, second
+        finally:
+            watcher.close()
+
+    first, second = asyncio.run(main())
+    assert first == [f"Source/Bench/File{index}.cpp" for index in range(5)]
+    assert second == ["Source/Bench/Bench.cpp"]
+
+
+@pytest.mark.skipif(not inotify_available(), reason="inotify is Linux only")
+def test_writes_to_an_open_file_and_touch_are_changes(tmp_path, uplugin):
+    source = uplugin.parent / "Source" / "Bench" / "Bench.cpp"
+
+    async def main():
+        watcher = PluginWatcher(uplugin.parent, debounce=0.2)
+        watcher.start()
+        try:
+            fd = os.open(source, os.O_WRONLY | os.O_APPEND)
+            try:
+                os.write(fd, b"// more\n")
+                written = await next_burst(watcher)
+            finally:
+                os.close(fd)
+            await next_burst(watcher)
+            os.utime(source)
+            touched = await next_burst(watcher)
+            return written, touched
+        finally:
+            watcher.close()
+
+    assert asyncio.run(main()) == (
+        ["Source/Bench/Bench.cpp"],
+        ["Source/Bench/Bench.cpp"],
+    )
+
+
+def test_watch_plugin_restarts_and_reports_builds(job):
+    source = job.plugin_dir / "Source" / "Bench" / "Bench.cpp"
+    lines = []
+    builds = []
+    started = asyncio.Event()
+
+    async def build():
+        builds.append("started")
+        started.set()
+        if len(builds) == 1:
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                builds.append("cancelled")
+                raise
+        raise RuntimeError("compiler crashed")
+
+    async def main():
+        task = asyncio.ensure_future(
+            watch_plugin(job, build, log=lines.append, debounce=0.2)
+        )
+        await asyncio.wait_for(started.wait(), 5)
+        await asyncio.sleep(0.2)
+        touch(source, "// edited")
+        for _ in range(100):
+            if any(line.startswith("✗ Build failed") for line in lines):
+                break
+            await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(main())
+    assert builds == ["started", "cancelled", "started"]
+    assert "Cancelling the build of the previous sources..." in lines
+    assert "✗ Build failed: RuntimeError('compiler crashed')" in lines
+
+
+def test_describe_changes():
+    assert describe_changes(["a.cpp"]) == "1 change(s): a.cpp"
+    assert describe_changes(["a", "b", "c", "d", "e"]) == (
+        "5 change(s): a, b, c and 2 more"
+    )